@@ -0,0 +1,667 @@
+"""Benchmarks for the HWFilter ingest/export pipeline.
+
+Usage:
+    python bench.py parallel --rows 200000 --workers 8
+    python bench.py memory --rows 200000
+    python bench.py filter --rows 100000
+    python bench.py reload --rows 200000 --edits 5
+    python bench.py db --rows 200000
+    python bench.py parsers --values 200000
+    python bench.py readers --rows 1000000
+    python bench.py readers --file big_hw.txt --no-load
+    python bench.py search --rows 1000000
+    python bench.py generate hw.txt --rows 100000 --users 2000 --malformed 0.01
+    python bench.py suite --sizes 10000 100000 1000000 10000000 --out before.json
+    python bench.py compare before.json after.json
+"""
+import argparse
+import datetime
+import gc
+import hashlib
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import main
+
+
+#region Synthetic Data
+
+def generate(file_path, rows, seed=0, users=500, pcs=800, start=datetime.date(2023, 1, 1), days=730,
+             malformed=0.0, brands=5, models=17, cpu_codes=97, oses=2, notes=100):
+    """Write a seeded synthetic hw.txt with the 15-field semicolon format.
+
+    users/pcs are the distinct user and PC names; logins fall on `days` days from
+    `start`. malformed is the share of lines that are blank, have an invalid or
+    unparseable date, or have too few fields. brands, models (per brand),
+    cpu_codes, oses and notes set the cardinality of those columns.
+    The same arguments always write the same file.
+    """
+    rnd = random.Random(seed)
+    brand_names = (['Dell', 'HP', 'Lenovo', 'Asus', 'Acer'] + [f"Brand{i}" for i in range(5, brands)])[:brands]
+    os_names = (['Windows 10 Pro', 'Windows 11 Pro'] + [f"Windows {i} Pro" for i in range(2, oses)])[:oses]
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for _ in range(rows):
+            pc = rnd.randrange(pcs)
+            # most users log in on "their" machine, a few roam
+            user = pc % users if rnd.random() < 0.9 else rnd.randrange(users)
+            brand = brand_names[pc % len(brand_names)]
+            tier = [3, 5, 7, 9][pc % 4]
+            login = start + datetime.timedelta(days=rnd.randrange(days))
+            fields = [
+                login.strftime('%Y.%m.%d'),
+                f"{rnd.randrange(24):02d}:{rnd.randrange(60):02d}:{rnd.randrange(60):02d}",
+                ['Laptop', 'Desktop'][pc % 2],
+                f"PC-{pc:05d}",
+                f"user{user}",
+                brand,
+                f"{brand} Model {pc % models}",
+                f"{[8, 16, 32][pc % 3]}GB",
+                f"Intel Core i{tier}",
+                f"i{tier}-{10000 + pc % cpu_codes}",
+                os_names[pc % len(os_names)],
+                f"2022.{pc % 12 + 1:02d}.{pc % 28 + 1:02d}",
+                'C:',
+                f"{rnd.randrange(500)}.{rnd.randrange(10)}/476.9 GB",
+                '' if rnd.random() < 0.8 else f"note {rnd.randrange(notes)}",
+            ]
+            if malformed and rnd.random() < malformed:
+                kind = rnd.randrange(4)
+                if kind == 0:
+                    fields = ['']  # blank line: skipped
+                elif kind == 1:
+                    fields[0] = f"{login.year}.02.30"  # invalid date: skipped
+                elif kind == 2:
+                    fields[0] = login.strftime('%d/%m/%Y')  # not YYYY.MM.DD: skipped
+                else:
+                    fields = fields[:rnd.randrange(2, 15)]  # short line: padded with ''
+            f.write(';'.join(fields) + '\n')
+
+
+def _add_generator_args(p):
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--users', type=int, default=500, help='distinct user names')
+    p.add_argument('--pcs', type=int, default=800, help='distinct PC names')
+    p.add_argument('--start', type=datetime.date.fromisoformat, default=datetime.date(2023, 1, 1),
+                   help='first login date (YYYY-MM-DD)')
+    p.add_argument('--days', type=int, default=730, help='login date span in days')
+    p.add_argument('--malformed', type=float, default=0.0, help='share of malformed lines (0-1)')
+    p.add_argument('--brands', type=int, default=5)
+    p.add_argument('--models', type=int, default=17, help='models per brand')
+    p.add_argument('--cpu-codes', type=int, default=97)
+    p.add_argument('--oses', type=int, default=2)
+    p.add_argument('--notes', type=int, default=100, help='distinct note texts')
+
+
+def _generator_knobs(args):
+    return {k: getattr(args, k) for k in ('seed', 'users', 'pcs', 'start', 'days', 'malformed',
+                                          'brands', 'models', 'cpu_codes', 'oses', 'notes')}
+
+#endregion
+
+
+#region Scenarios
+
+def _timed_load(file_path, workers):
+    main.ResetData()
+    t0 = time.perf_counter()
+    stats = main.LoadData(file_path, workers=workers)
+    return time.perf_counter() - t0, stats
+
+
+def _parallel_costs(path, workers):
+    """Worker and parent seconds of a `workers`-process load, measured in this process.
+
+    Each chunk is ingested and pickled as a worker would (worker seconds), then
+    unpickled and merged in file order as the parent does (parent seconds), so the
+    split does not depend on how many CPUs this machine has.
+    """
+    ranges = main._split_ranges(path, workers * 4)
+    worker = 0.0
+    blobs = []
+    for start, end in ranges:
+        t0 = time.perf_counter()
+        blobs.append(pickle.dumps(main._ingest_chunk(path, start, end), pickle.HIGHEST_PROTOCOL))
+        worker += time.perf_counter() - t0
+    main.ResetData()
+    t0 = time.perf_counter()
+    for blob in blobs:
+        main._merge_chunk(pickle.loads(blob))
+    return worker, time.perf_counter() - t0, len(ranges)
+
+
+def bench_parallel(rows, workers):
+    """Sequential vs process-pool ingest per worker count, and the count that breaks even.
+
+    Measured: LoadData with 1..workers processes on this machine (ids checked against
+    the sequential load). Estimated: from the worker and parent (merge) seconds of
+    each split, T = first chunk + max(rest of the chunks / workers, merges), which
+    holds on a machine with at least that many free CPUs.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hw.txt')
+        generate(path, rows)
+        seq, stats = _timed_load(path, 1)
+        seq_keys = {name: lookup.keys() for name, lookup in main.LOOKUP_TABLES.items()}
+        print(f"rows={stats['lines']} cpus={os.cpu_count()} sequential={seq:.2f}s "
+              f"PARALLEL_MIN_WORKERS={main.PARALLEL_MIN_WORKERS}")
+        measured = estimated = None
+        for n in range(2, workers + 1) if workers > 1 else ():
+            par, _ = _timed_load(path, n)
+            same = seq_keys == {name: lookup.keys() for name, lookup in main.LOOKUP_TABLES.items()}
+            worker, parent, chunks = _parallel_costs(path, n)
+            est = worker / chunks + max(worker * (chunks - 1) / chunks / n, parent)
+            print(f"workers={n:<3} measured={par:7.2f}s {seq / par:5.2f}x  "
+                  f"estimated={est:7.2f}s {seq / est:5.2f}x  "
+                  f"(worker {worker:.2f}s, merge {parent:.2f}s)  ids_match={same}")
+            if measured is None and par < seq:
+                measured = n
+            if estimated is None and est < seq:
+                estimated = n
+    print(f"breaks even at: measured {measured or f'> {workers}'}, estimated {estimated or f'> {workers}'}")
+
+
+def bench_memory(rows):
+    """Bytes retained per login after a full load, by LOGIN_TABLE alone and by each lookup table."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hw.txt')
+        generate(path, rows)
+        main.ResetData()
+        gc.collect()
+        tracemalloc.start()
+        main.LoadData(path)
+        gc.collect()
+        total = tracemalloc.get_traced_memory()[0]
+        lookups = main.LookupMemory()
+        saved = [row[1:] for row in main.LOGIN_TABLE.rows()]
+        main.LOGIN_TABLE.clear()
+        gc.collect()
+        base = tracemalloc.get_traced_memory()[0]
+        for lid, row in enumerate(saved, start=1):
+            main.LOGIN_TABLE.append(lid, *row)
+        table = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+    n = len(main.LOGIN_TABLE)
+    print(f"rows={n} retained={total / n:.0f} B/login LOGIN_TABLE={table / n:.0f} B/row (columns, excluding pooled free-space strings)")
+    print('\n'.join(main.FormatLookupMemory(lookups)))
+
+
+def bench_filter(rows):
+    """Filter construction, attribute reads (GUI/export loops) and bytes per instance."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hw.txt')
+        generate(path, rows)
+        records = list(main.RecordReader(path))
+    main.ResetData()
+    t0 = time.perf_counter()
+    for record in records:
+        main.Filter(*record)
+    build = time.perf_counter() - t0
+    objs = list(main.Filter.objectsArray)
+    t0 = time.perf_counter()
+    for _ in range(10):
+        for o in objs:
+            o.login_date, o.user, o.pc_name, o.user_id, o.pc_name_id, o.installed_ram
+    reads = (time.perf_counter() - t0) / (10 * len(objs) * 6)
+    obj = objs[0]
+    size = sys.getsizeof(obj) + (sys.getsizeof(obj.__dict__) if hasattr(obj, '__dict__') else 0)
+    print(f"records={len(records)} construct={build / len(records) * 1e6:.2f} us/record "
+          f"read={reads * 1e9:.1f} ns/attr instance={size} B")
+
+def bench_reload(rows, edits):
+    """Full LoadData vs BlockReload after editing, removing and inserting a few lines."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hw.txt')
+        generate(path, rows)
+        reloader = main.BlockReload()
+        reloader.load(path)
+        with open(path, 'rb') as f:
+            lines = f.readlines()
+        rnd = random.Random(1)
+        for i in range(edits):
+            pos = rnd.randrange(len(lines))
+            if i % 3 == 0:
+                del lines[pos]
+            elif i % 3 == 1:
+                lines.insert(pos, lines[rnd.randrange(len(lines))])
+            else:
+                lines[pos] = lines[pos].replace(b';user', b';usr', 1)
+        with open(path, 'wb') as f:
+            f.writelines(lines)
+        t0 = time.perf_counter()
+        stats = reloader.load(path)
+        block = time.perf_counter() - t0
+        reloaded = list(main.LOGIN_TABLE.rows())
+        full, _ = _timed_load(path, 1)
+        same = reloaded == list(main.LOGIN_TABLE.rows())
+    print(f"rows={stats['lines']} edits={edits} full={full:.2f}s block_reload={block:.2f}s "
+          f"reparsed={stats['reparsed']}/{stats['blocks']} blocks logins_match={same}")
+
+def bench_db(rows):
+    """SQLite store: cold ingest, restart on an unchanged input, one-month export vs in-memory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hw.txt')
+        db_path = os.path.join(tmp, 'hw.db')
+        generate(path, rows)
+        t0 = time.perf_counter()
+        main.LoadDatabase(path, db_path)
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        main.LoadDatabase(path, db_path)
+        warm = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        main.ExportDatabase(db_path, '2023-06', tmp)
+        db_export = time.perf_counter() - t0
+        mem_load, _ = _timed_load(path, 1)
+        t0 = time.perf_counter()
+        main.ExportData('2023-06', tmp)
+        mem_export = time.perf_counter() - t0
+    print(f"rows={rows} ingest={cold:.2f}s restart={warm:.2f}s (LoadData {mem_load:.2f}s) "
+          f"month_export sql={db_export:.2f}s memory={mem_export:.2f}s")
+
+# Inputs whose parse results must not change: odd widths, invalid days, padding,
+# non-ASCII digits, strptime leniency ('2023-5-6', '2023-05- 6'), non-strings
+DATE_EDGE_CASES = [
+    '2023-05-06', '2023.05.06', '2023/05/06', '06/05/2023', '06-05-2023', '06.05.2023',
+    ' 2023-05-06 ', '2023-5-6', '2023-05- 6', '2023-02-29', '2024-02-29', '2023-02-30',
+    '2023-13-01', '2023-00-10', '2023-04-31', '0000-01-01', '9999-12-31', '31/04/2023',
+    '29-02-2024', '31-02-2023', '2023.02.30', '2023/02/30', '20230506', '2023-W01-1',
+    '\uff12\uff10\uff12\uff13-05-06', '2023-05-06T10:00', '2023-05-0x', '', '   ', 'garbage',
+    None, 42, datetime.date(2023, 5, 6), datetime.datetime(2023, 5, 6, 7, 8),
+]
+TIME_EDGE_CASES = [
+    '12:34:56', '00:00:00', '23:59:59', '24:00:00', '12:60:00', '12:00:60', '1:2:3',
+    ' 12:34:56 ', '12:34', '12', '12:34:56:78', '+1:02:03', '\u0661\u0662:34:56', '12:34:5x',
+    '1_2:34:56', '-1:00:00', '', 'noon', None, datetime.time(1, 2, 3),
+]
+RAM_EDGE_CASES = [
+    '8GB', '8gb', '8 GB', ' 16GB ', '016GB', '16384MB', '8g', '8', '8.5GB', '512kb', '2k',
+    'lotsGB', 'GB', '', None, 8, 8.7, '12345678901234567890GB', '123456789012345GB',
+    '\uff18GB', '-8GB', '1_6GB',
+]
+
+
+def bench_parsers(values):
+    """Fast-path/LRU parsers vs the Filter._parse_* methods: edge-case equality and speed per format."""
+    cases = [
+        ('date', DATE_EDGE_CASES, main.Filter._parse_date, lambda: main.DateColumn().parse),
+        ('time', TIME_EDGE_CASES, main.Filter._parse_time, lambda: main.parse_time),
+        ('ram', RAM_EDGE_CASES, main.Filter._parse_ram, lambda: main.parse_ram),
+    ]
+    for name, corpus, old, new in cases:
+        # a fresh DateColumn per value, and per ordering, so each case also sets the layout
+        for order in (corpus, corpus[::-1]):
+            for value in order:
+                fast = new()
+                if fast(value) != old(value) or type(fast(value)) is not type(old(value)):
+                    print(f"MISMATCH {name} {value!r}: {old(value)!r} != {fast(value)!r}")
+        shared = new()
+        for value in corpus + corpus[::-1]:
+            if shared(value) != old(value):
+                print(f"MISMATCH {name} (shared) {value!r}")
+    print(f"edge cases checked: {len(DATE_EDGE_CASES)} dates, {len(TIME_EDGE_CASES)} times, {len(RAM_EDGE_CASES)} RAM values")
+
+    rnd = random.Random(0)
+    start = datetime.date(2023, 1, 1)
+    days = [start + datetime.timedelta(days=rnd.randrange(730)) for _ in range(values)]
+    # (label, values, current method, fast path without the cache, cached parser)
+    streams = []
+    for fmt in ('%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%d/%m/%Y', '%d-%m-%Y'):
+        column = main.DateColumn()
+        streams.append((f"date {fmt}", [d.strftime(fmt) for d in days], main.Filter._parse_date,
+                        column._parse, column.parse))
+    # parse_time has no cache: it only has a fast path
+    streams.append(("time HH:MM:SS",
+                    [f"{rnd.randrange(24):02d}:{rnd.randrange(60):02d}:{rnd.randrange(60):02d}" for _ in range(values)],
+                    main.Filter._parse_time, main.parse_time, None))
+    main.parse_ram.cache_clear()
+    streams.append(("ram NGB", [f"{rnd.choice([4, 8, 16, 32, 64])}GB" for _ in range(values)],
+                    main.Filter._parse_ram, main.parse_ram.__wrapped__, main.parse_ram))
+
+    def timed(parse, data):
+        t0 = time.perf_counter()
+        result = [parse(v) for v in data]
+        return result, (time.perf_counter() - t0) / len(data) * 1e9
+
+    for label, data, old, fast, cached in streams:
+        expected, old_ns = timed(old, data)
+        got_fast, fast_ns = timed(fast, data)
+        if cached is None:
+            got, new_ns, cached_text = got_fast, fast_ns, "    -"
+        else:
+            got, new_ns = timed(cached, data)
+            cached_text = f"{new_ns:5.0f}"
+        print(f"{label:<16} current={old_ns:6.0f} ns fast_path={fast_ns:5.0f} ns cached={cached_text} ns "
+              f"speedup={old_ns / new_ns:5.1f}x identical={got == expected == got_fast}")
+
+
+def _tables_digest():
+    """Hash of everything LoadData built, in order: equal digests mean identical loads."""
+    h = hashlib.blake2b(digest_size=16)
+    for name, lookup in main.LOOKUP_TABLES.items():
+        h.update(repr((name, lookup.keys(), lookup.values())).encode())
+    for table in (main.PC_TABLE, main.MODEL_TABLE, main.PROCESSOR_TABLE):
+        h.update(repr(list(table.items())).encode())
+    for row in main.LOGIN_TABLE.rows():
+        h.update(repr(row).encode())
+    for key, obj in main.Filter.objectsArray._items.items():
+        h.update(repr((key, obj.__getstate__())).encode())
+    return h.hexdigest()
+
+
+def bench_readers(rows, file_path=None, load=True):
+    """Reader engines: read speed per engine, then LoadData per engine (lines,
+    columnar) with identical tables and its speed.
+
+    file_path benchmarks an existing file (e.g. a 1 GB+ hw.txt) instead of a generated
+    one; load=False skips the LoadData runs, which need memory for every login.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if file_path is None:
+            file_path = os.path.join(tmp, 'hw.txt')
+            generate(file_path, rows)
+        size = os.path.getsize(file_path)
+        readers = (('lines', main.RecordReader), ('columnar', main.ColumnReader))
+        print(f"file={size / 2**20:.1f} MiB")
+
+        # columnar: reading includes splitting the blocks into columns
+        for name, reader_class in readers:
+            reader = reader_class(file_path)
+            t0 = time.perf_counter()
+            for _item in reader:
+                pass
+            seconds = time.perf_counter() - t0
+            print(f"read  {name:<8} {seconds:8.2f}s {reader.lines / seconds:10.0f} lines/s {size / 2**20 / seconds:7.1f} MiB/s")
+        if not load:
+            return
+        digests = {}
+        for name in main.READER_ENGINES:
+            main.ResetData()
+            gc.collect()
+            t0, cpu0 = time.perf_counter(), time.process_time()
+            main.LoadData(file_path, engine=name)
+            seconds, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+            digests[name] = _tables_digest()
+            print(f"load  {name:<8} {seconds:8.2f}s {len(main.LOGIN_TABLE) / seconds:10.0f} lines/s"
+                  f" cpu={cpu:.2f}s identical={digests[name] == digests['lines']}")
+        if os.path.dirname(file_path) == tmp:
+            # parse + snapshot: columnar hashes the file while parsing it
+            for name in main.READER_ENGINES:
+                main.ResetData()
+                gc.collect()
+                if os.path.exists(main.SnapshotPath(file_path)):
+                    os.remove(main.SnapshotPath(file_path))
+                t0 = time.perf_counter()
+                main.LoadData(file_path, cache=True, engine=name)
+                print(f"load+snapshot {name:<8} {time.perf_counter() - t0:8.2f}s")
+    main.ResetData()
+
+
+def bench_search(rows):
+    """GUI search: linear startswith scan vs SearchIndex, per keystroke of a typed query."""
+    rnd = random.Random(0)
+    data = [(f"{rnd.randint(2020, 2024)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+             f"user{rnd.randrange(5000):04d}", f"PC-{rnd.randrange(8000):05d}") for _ in range(rows)]
+    t0 = time.perf_counter()
+    index = main.SearchIndex(data)
+    build = time.perf_counter() - t0
+    print(f"rows={rows} index build={build:.2f}s (worker thread in the GUI)")
+    for field, col, typed in (('date', 0, '2023-05-1'), ('user', 1, 'user12'), ('pc', 2, 'pc-0001')):
+        for i in range(1, len(typed) + 1):
+            q = typed[:i]
+            t0 = time.perf_counter()
+            expected = [row for row in data if row[col].lower().startswith(q)]
+            scan = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            got = index.search(field, q)
+            indexed = time.perf_counter() - t0
+            print(f"{field:<4} {q!r:<12} matches={len(got):>8} scan={scan * 1e3:7.1f} ms "
+                  f"index={indexed * 1e3:6.3f} ms same={sorted(got[:]) == sorted(expected)}")
+
+#endregion
+
+
+#region Suite
+
+SUITE_VERSION = 1
+EXCEL_MAX_ROWS = 1048576  # per sheet, header included
+
+
+def _reset_peak():
+    """Start a new peak-RSS window; False where the OS can't (only Linux can, via clear_refs)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss():
+    """Peak resident set size in bytes (since _reset_peak on Linux), or None if unknown."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _suite_size(rows, knobs, workers):
+    """Run every suite scenario on one generated file of `rows` lines; returns result dicts.
+
+    Called in a fresh process per size, so the peak memory of one size doesn't hide
+    the next one's and no state is shared between sizes.
+    """
+    results = []
+
+    def record(scenario, fn, describe=None):
+        # describe(value, seconds) -> extra fields for the result
+        gc.collect()
+        scoped = _reset_peak()
+        t0 = time.perf_counter()
+        value = fn()
+        seconds = time.perf_counter() - t0
+        entry = {'rows': rows, 'scenario': scenario, 'seconds': round(seconds, 6),
+                 'peak_rss': _peak_rss(), 'peak_scope': 'scenario' if scoped else 'process'}
+        if describe is not None:
+            entry.update(describe(value, seconds))
+        results.append(entry)
+        peak = entry['peak_rss']
+        print(f"  {rows:>9} {scenario:<14} {seconds:9.3f}s  peak={peak / 2**20 if peak else 0:8.1f} MiB  "
+              + ' '.join(f"{k}={v}" for k, v in entry.items() if k not in ('rows', 'scenario', 'seconds', 'peak_rss', 'peak_scope')),
+              flush=True)
+        return value
+
+    middle = knobs['start'] + datetime.timedelta(days=knobs['days'] // 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hw.txt')
+        record('generate', lambda: generate(path, rows, **knobs),
+               lambda _, __: {'bytes': os.path.getsize(path)})
+
+        main.ResetData()
+        record('ingest', lambda: main.LoadData(path, workers=workers),
+               lambda stats, seconds: dict(stats, lines_per_s=round(stats['lines'] / seconds),
+                                           lookup_kib=round(sum(e['bytes'] for e in main.LookupMemory().values()) / 1024)))
+
+        def export(d):
+            return lambda: main.ExportData(d, tmp)[1]
+
+        def written(counts, _seconds):
+            return {'logins': counts['Login'], 'rows_written': sum(counts.values())}
+
+        record('export_month', export(middle.strftime('%Y-%m')), written)
+        record('export_day', export(middle), written)
+        if len(main.LOGIN_TABLE) < EXCEL_MAX_ROWS:
+            record('export_all', export(None), written)
+        else:
+            results.append({'rows': rows, 'scenario': 'export_all',
+                            'skipped': f"more logins than an Excel sheet holds ({EXCEL_MAX_ROWS - 1})"})
+
+        display = main.DisplayRows()
+        index = record('search_index', lambda: main.SearchIndex(display), lambda _, __: {'latest': len(display)})
+
+        def typed():
+            # every keystroke of a date, a user and a PC query; each narrows the previous one
+            times = []
+            for field, text in (('date', middle.isoformat()), ('user', 'user12'), ('pc', 'pc-0001')):
+                for i in range(1, len(text) + 1):
+                    t0 = time.perf_counter()
+                    len(index.search(field, text[:i]))
+                    times.append(time.perf_counter() - t0)
+            return times
+
+        record('search', typed, lambda times, _: {'queries': len(times),
+                                                  'max_ms': round(max(times) * 1e3, 4)})
+
+        def dedup():
+            main.ResetData()
+            for rec in main.RecordReader(path):
+                main.Filter(*rec)
+            return len(main.Filter.objectsArray)
+
+        record('filter_dedup', dedup, lambda latest, _: {'latest': latest})
+    main.ResetData()
+    return results
+
+
+def _git_revision():
+    import subprocess
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_suite(sizes, knobs, workers, out):
+    """Every scenario at every size, each size in a fresh process; results saved as JSON."""
+    import json
+    import multiprocessing
+    import platform
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    for rows in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results += pool.submit(_suite_size, rows, knobs, workers).result()
+    report = {
+        'suite': SUITE_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'workers': workers,
+        'knobs': dict(knobs, start=knobs['start'].isoformat()),
+        'results': results,
+    }
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {len(results)} results to {out}")
+
+
+def bench_compare(base, new, threshold, min_seconds=0.05):
+    """Time and peak-memory ratios between two suite JSON files; returns 1 on a regression.
+
+    Timings below min_seconds in both runs are too noisy to count as a regression.
+    """
+    import json
+
+    with open(base, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new, encoding='utf-8') as f:
+        cur = json.load(f)
+    if old['knobs'] != cur['knobs']:
+        print("warning: the runs used different generator knobs")
+    before = {(r['rows'], r['scenario']): r for r in old['results'] if 'seconds' in r}
+    regressions = 0
+    print(f"{old.get('revision')} -> {cur.get('revision')}")
+    for r in cur['results']:
+        b = before.get((r['rows'], r['scenario']))
+        if b is None or 'seconds' not in r:
+            continue
+        time_ratio = r['seconds'] / max(b['seconds'], 1e-9)
+        mem_ratio = (r['peak_rss'] / b['peak_rss']) if r.get('peak_rss') and b.get('peak_rss') else None
+        slower = time_ratio > threshold and max(r['seconds'], b['seconds']) >= min_seconds
+        worse = slower or (mem_ratio is not None and mem_ratio > threshold)
+        regressions += worse
+        mem = f"{mem_ratio:5.2f}x" if mem_ratio is not None else "    -"
+        print(f"{r['rows']:>9} {r['scenario']:<14} time {b['seconds']:9.3f}s -> {r['seconds']:9.3f}s "
+              f"{time_ratio:5.2f}x  peak {mem}{'  REGRESSION' if worse else ''}")
+    print(f"{regressions} regression(s) above {threshold:.2f}x")
+    return 1 if regressions else 0
+
+#endregion
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='scenario', required=True)
+    p = sub.add_parser('parallel', help='sequential vs parallel ingest')
+    p.add_argument('--rows', type=int, default=200000)
+    p.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    p = sub.add_parser('memory', help='memory per login row')
+    p.add_argument('--rows', type=int, default=200000)
+    p = sub.add_parser('filter', help='Filter construction, attribute reads and size')
+    p.add_argument('--rows', type=int, default=100000)
+    p = sub.add_parser('reload', help='full reload vs changed-block reload')
+    p.add_argument('--rows', type=int, default=200000)
+    p.add_argument('--edits', type=int, default=5)
+    p = sub.add_parser('db', help='SQLite store ingest, restart and export')
+    p.add_argument('--rows', type=int, default=200000)
+    p = sub.add_parser('parsers', help='date/time/RAM parsers: edge cases and speed per format')
+    p.add_argument('--values', type=int, default=200000)
+    p = sub.add_parser('readers', help='reader engines (lines, columnar): equality and speed')
+    p.add_argument('--rows', type=int, default=1000000)
+    p.add_argument('--file', help='benchmark this file instead of a generated one')
+    p.add_argument('--no-load', dest='load', action='store_false', help='only time reading, not LoadData')
+    p = sub.add_parser('search', help='GUI search: linear scan vs prefix index per keystroke')
+    p.add_argument('--rows', type=int, default=1000000)
+    p = sub.add_parser('generate', help='write a synthetic hw.txt')
+    p.add_argument('output')
+    p.add_argument('--rows', type=int, default=100000)
+    _add_generator_args(p)
+    p = sub.add_parser('suite', help='ingest, dedup, exports and search at several sizes, saved as JSON')
+    p.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    p.add_argument('--workers', type=int, default=1, help='LoadData workers for the ingest scenario')
+    p.add_argument('--out', default='bench_results.json')
+    _add_generator_args(p)
+    p = sub.add_parser('compare', help='compare two suite JSON files; exit status 1 on a regression')
+    p.add_argument('base')
+    p.add_argument('new')
+    p.add_argument('--threshold', type=float, default=1.15, help='ratio counted as a regression')
+    args = parser.parse_args()
+    if args.scenario == 'parallel':
+        bench_parallel(args.rows, args.workers)
+    elif args.scenario == 'memory':
+        bench_memory(args.rows)
+    elif args.scenario == 'filter':
+        bench_filter(args.rows)
+    elif args.scenario == 'reload':
+        bench_reload(args.rows, args.edits)
+    elif args.scenario == 'db':
+        bench_db(args.rows)
+    elif args.scenario == 'parsers':
+        bench_parsers(args.values)
+    elif args.scenario == 'readers':
+        bench_readers(args.rows, args.file, args.load)
+    elif args.scenario == 'search':
+        bench_search(args.rows)
+    elif args.scenario == 'generate':
+        generate(args.output, args.rows, **_generator_knobs(args))
+    elif args.scenario == 'suite':
+        bench_suite(args.sizes, _generator_knobs(args), args.workers, args.out)
+    elif args.scenario == 'compare':
+        sys.exit(bench_compare(args.base, args.new, args.threshold))
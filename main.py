@@ -1,20 +1,88 @@
+import argparse
+from array import array
+import bisect
+import bz2
+import calendar
 import datetime
+import functools
+import glob
+import gzip
+import hashlib
+import itertools
+import json
+import lzma
+import mmap
+import operator
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 import os
-import tkinter as tk
-from tkinter import messagebox, ttk
+import pickle
+import queue
+import re
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+
+class _Memo(dict):
+    """dict that fills itself: a missing key gets function(key). Mapping its
+    __getitem__ over a column computes once per distinct value, in first-seen order."""
+    __slots__ = ('function',)
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, key):
+        value = self[key] = self.function(key)
+        return value
+
+
+# Value types cached by LookupTable._raw: they only compare equal to their own type,
+# so a cached value can't stand in for a different one (as 1 would for 1.0 or True)
+_RAW_KEY_TYPES = frozenset((str, datetime.date, datetime.time))
+
+# Entries LookupTable._raw holds before it is emptied: enough for the values that
+# repeat (users, machines, models), without a second copy of a high-cardinality
+# column such as the notes or the free disk space
+_RAW_CACHE_SIZE = 1 << 16
 
 
 # Simple in-memory lookup table to assign stable integer IDs for values
 class LookupTable:
-    def __init__(self):
+    """Stable integer ids for values, 1, 2, ... in first-seen order of their normalized key.
+
+    _map maps each normalized (interned) key to its id; _values is the reverse index,
+    _values[id] being the first value seen for that id, as given. _raw remembers the
+    id (or None) of str/date/time values already looked up, so a repeated value
+    costs one dict probe instead of being converted and normalized again; it is
+    emptied when it reaches _RAW_CACHE_SIZE entries.
+    """
+    def __init__(self, policy='eager'):
+        self.policy = policy  # when Filter assigns ids (see SetLookupPolicy)
         self._map = {}  # normalized value -> id
-        self._next = 1
+        self._values = [None]  # id -> first value given for it; slot 0 unused
+        self._raw = {}  # value as given -> id
+
+    @property
+    def _next(self):
+        """The id the next new value will get."""
+        return len(self._values)
+
+    def __len__(self):
+        return len(self._values) - 1
 
     def normalize(self, v: str) -> str:
         return v.strip().lower()
 
     def get_or_create(self, v):
+        try:
+            return self._raw[v]
+        except (KeyError, TypeError):
+            pass
         if v is None:
             return None
         # represent dates/times consistently
@@ -24,16 +92,546 @@ class LookupTable:
             key = v.isoformat()
         else:
             key = str(v).strip()
-        if key == "":
-            return None
-        nkey = self.normalize(key)
-        if nkey in self._map:
-            return self._map[nkey]
-        nid = self._next
-        self._next += 1
-        self._map[nkey] = nid
+        nid = None if key == "" else self.get_or_create_key(self.normalize(key), v)
+        if type(v) in _RAW_KEY_TYPES:
+            raw = self._raw
+            if len(raw) >= _RAW_CACHE_SIZE:
+                raw.clear()
+            raw[v] = nid
+        return nid
+
+    def get_or_create_many(self, values):
+        """[get_or_create(v) for v in values], for a whole column of values at once."""
+        raw = self._raw
+        create = self.get_or_create
+        ids = []
+        append = ids.append
+        for v in values:
+            try:
+                append(raw[v])
+            except (KeyError, TypeError):
+                append(create(v))
+        return ids
+
+    def get_or_create_column(self, values):
+        """get_or_create_many(values) for a long column of few distinct (hashable) values:
+        each distinct value is looked up once, in first-seen order, so ids are the same."""
+        return list(map(_Memo(self.get_or_create).__getitem__, values))
+
+    def get_or_create_key(self, nkey: str, value=None):
+        """Id for an already-normalized key, assigning the next id if it is new.
+
+        value is what value(id) returns for a new id (default: the key itself).
+        """
+        nid = self._map.get(nkey)
+        if nid is None:
+            nid = len(self._values)
+            self._map[sys.intern(nkey)] = nid
+            self._values.append(nkey if value is None else value)
         return nid
 
+    def value(self, nid):
+        """The first value given for id nid."""
+        if not 0 < nid < len(self._values):
+            raise KeyError(nid)
+        return self._values[nid]
+
+    def values(self) -> list:
+        """First-seen values in id order; get_or_create_many(values()) gives ids 1..n back."""
+        return self._values[1:]
+
+    def keys(self) -> list:
+        """Normalized keys in id order (ids are assigned 1, 2, ... in first-seen order)."""
+        return list(self._map)
+
+    def nbytes(self):
+        """Approximate bytes held: the three containers plus the keys and values in them
+        (values shared with the Filter objects are counted too)."""
+        total = sys.getsizeof(self._map) + sys.getsizeof(self._values) + sys.getsizeof(self._raw)
+        seen = set()
+        for objs in (self._map, self._values, self._raw):
+            for obj in objs:
+                if obj is not None and id(obj) not in seen:
+                    seen.add(id(obj))
+                    total += sys.getsizeof(obj)
+        return total
+
+    def clear(self):
+        self._map = {}
+        self._values = [None]
+        self._raw = {}
+
+
+class LookupView:
+    """Read-only id -> {'id': id, field: value} table over a LookupTable's reverse index.
+
+    The dimension tables that only hold a name (USER_TABLE, BRAND_TABLE, ...) are
+    exactly their lookup's first-seen values, so they are views rather than dicts
+    filled in parallel. Rows are made on access, like LoginTable's.
+    """
+    __slots__ = ('lookup', 'field')
+
+    def __init__(self, lookup, field='name'):
+        self.lookup = lookup
+        self.field = field
+
+    def __len__(self):
+        return len(self.lookup)
+
+    def __contains__(self, nid):
+        return type(nid) is int and 0 < nid < self.lookup._next
+
+    def __iter__(self):
+        return iter(range(1, self.lookup._next))
+
+    def __getitem__(self, nid):
+        return {'id': nid, self.field: self.lookup.value(nid)}
+
+    def get(self, nid, default=None):
+        return self[nid] if nid in self else default
+
+    def keys(self):
+        return range(1, self.lookup._next)
+
+    def values(self):
+        field = self.field
+        for nid, value in enumerate(self.lookup.values(), start=1):
+            yield {'id': nid, field: value}
+
+    def items(self):
+        for row in self.values():
+            yield row['id'], row
+
+
+# Keyed store holding the latest Filter per (user, pc_name) pair
+class LatestStore:
+    """Insertion-ordered map of dedup key -> latest Filter.
+
+    Insert/replace is O(1). A replaced key moves to the end, so iteration
+    order matches the old list-based register (remove + append).
+    """
+    def __init__(self):
+        self._items = {}  # key -> Filter
+        self._list = None  # cached list snapshot for index access
+
+    @staticmethod
+    def key_for(instance):
+        # Prefer numeric ids if available (created during __init__)
+        user_id = getattr(instance, 'user_id', None)
+        pc_id = getattr(instance, 'pc_name_id', None)
+        if user_id is not None and pc_id is not None:
+            return ('id', user_id, pc_id)
+        # Fallback to case-insensitive string match
+        return ('name', (getattr(instance, 'user', '') or '').strip().lower(),
+                (getattr(instance, 'pc_name', '') or '').strip().lower())
+
+    def put(self, instance):
+        """Store instance unless an existing entry for its key has a newer login_date.
+
+        Returns the Filter that was dropped (or None if the key was new).
+        """
+        key = LatestStore.key_for(instance)
+        current = self._items.pop(key, None)
+        self._list = None
+        if current is None:
+            self._items[key] = instance
+            return None
+        try:
+            # max() keeps the first of equal candidates, i.e. the existing one
+            latest = instance if instance.login_date > current.login_date else current
+        except Exception:
+            # If login_date isn't comparable, fall back to keeping the new instance
+            latest = instance
+        self._items[key] = latest
+        return instance if latest is current else current
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def clear(self):
+        self._items.clear()
+        self._list = None
+
+    # list-like read view (Filter.objectsArray used to be a plain list)
+    def append(self, instance):
+        self.put(instance)
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if self._list is None:
+            self._list = list(self._items.values())
+        return self._list[index]
+
+    def __contains__(self, instance):
+        return self._items.get(LatestStore.key_for(instance)) is instance
+
+
+def _month_end(year, month):
+    """Last day of a month; unlike the day before the next month's first, this also
+    works for December 9999."""
+    return datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+
+# Columnar storage for login rows
+class LoginTable:
+    """Array-backed login table: one typed column per field instead of a dict per row.
+
+    Dates are stored as proleptic ordinals, times as seconds since midnight,
+    ids as ints (0 = None) and free-space strings as indexes into an interned
+    pool. Values that don't fit a column (unparsed strings etc.) are kept per
+    row in a small overflow dict. Mapping-style access (table[lid], values(),
+    items()) returns plain row dicts, so existing readers keep working.
+    """
+    FIELDS = ('id', 'date', 'time', 'pc_id', 'user_id', 'free_disk_space')
+    _NONE = -1
+    _OTHER = -2
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._ids = array('q')
+        self._date = array('i')
+        self._time = array('i')
+        self._pc = array('i')
+        self._user = array('i')
+        self._free = array('i')
+        self._free_pool = []  # index -> string
+        self._free_index = {}  # string -> index
+        self._extra = {}  # lid -> {field: value} for values stored outside the columns
+        self._invalidate_index()
+
+    # Pickled without the date index, which is rebuilt on the first query
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in ('_order', '_order_dates', '_months', '_indexed'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._invalidate_index()
+
+    # --- date index ---
+    def _invalidate_index(self):
+        self._order = array('q')  # positions sorted by date ordinal (stable: id order within a day)
+        self._order_dates = array('i')  # date ordinals in the same order, for bisect
+        self._months = {}  # (year, month) -> (start, end) slice of _order
+        self._indexed = 0  # positions below this are in the index
+
+    def _update_index(self):
+        """Fold rows appended since the last query into the sorted date index."""
+        n = len(self._ids)
+        if self._indexed == n:
+            return
+        dates = self._date
+        key = dates.__getitem__
+        new = sorted((pos for pos in range(self._indexed, n) if dates[pos] > 0), key=key)
+        if self._order:
+            # two sorted runs: timsort merges them in linear time
+            order = self._order.tolist() + new
+            order.sort(key=key)
+        else:
+            order = new
+        self._order = array('q', order)
+        self._order_dates = ords = array('i', [dates[pos] for pos in order])
+        self._indexed = n
+        months = {}
+        i = 0
+        while i < len(ords):
+            day = datetime.date.fromordinal(ords[i])
+            nxt = _month_end(day.year, day.month).toordinal() + 1
+            j = bisect.bisect_left(ords, nxt, i)
+            months[(day.year, day.month)] = (i, j)
+            i = j
+        self._months = months
+
+    def select_range(self, date_from=None, date_to=None):
+        """Positions (in id order) of rows dated date_from..date_to inclusive; None = open end."""
+        self._update_index()
+        ords = self._order_dates
+        i = 0 if date_from is None else bisect.bisect_left(ords, date_from.toordinal())
+        j = len(ords) if date_to is None else bisect.bisect_right(ords, date_to.toordinal())
+        return sorted(self._order[i:j])
+
+    def select_day(self, day):
+        return self.select_range(day, day)
+
+    def select_month(self, year, month):
+        self._update_index()
+        i, j = self._months.get((year, month), (0, 0))
+        return sorted(self._order[i:j])
+
+    def other_dates(self):
+        """(position, value) for rows whose date is not a datetime.date (kept in the overflow)."""
+        return [(self._position(lid), extra['date']) for lid, extra in self._extra.items() if 'date' in extra]
+
+    # --- encoding helpers ---
+    def _encode_date(self, lid, value):
+        if value is None:
+            return self._NONE
+        if type(value) is datetime.date:
+            return value.toordinal()
+        self._extra.setdefault(lid, {})['date'] = value
+        return self._OTHER
+
+    def _encode_time(self, lid, value):
+        if value is None:
+            return self._NONE
+        if type(value) is datetime.time and not value.microsecond and value.tzinfo is None:
+            return value.hour * 3600 + value.minute * 60 + value.second
+        self._extra.setdefault(lid, {})['time'] = value
+        return self._OTHER
+
+    def _encode_id(self, lid, field, value):
+        if value is None:
+            return 0
+        if type(value) is int and 0 < value < 2**31:
+            return value
+        self._extra.setdefault(lid, {})[field] = value
+        return self._OTHER
+
+    def _encode_free(self, lid, value):
+        if value is None:
+            return self._NONE
+        if type(value) is not str:
+            self._extra.setdefault(lid, {})['free_disk_space'] = value
+            return self._OTHER
+        idx = self._free_index.get(value)
+        if idx is None:
+            idx = self._free_index[value] = len(self._free_pool)
+            self._free_pool.append(value)
+        return idx
+
+    def _decode(self, pos):
+        lid = self._ids[pos]
+        extra = self._extra.get(lid) if self._extra else None
+        d = self._date[pos]
+        t = self._time[pos]
+        pc = self._pc[pos]
+        user = self._user[pos]
+        free = self._free[pos]
+        return (
+            lid,
+            datetime.date.fromordinal(d) if d > 0 else (extra['date'] if d == self._OTHER else None),
+            datetime.time(t // 3600, t // 60 % 60, t % 60) if t >= 0 else (extra['time'] if t == self._OTHER else None),
+            pc if pc > 0 else (extra['pc_id'] if pc == self._OTHER else None),
+            user if user > 0 else (extra['user_id'] if user == self._OTHER else None),
+            self._free_pool[free] if free >= 0 else (extra['free_disk_space'] if free == self._OTHER else None),
+        )
+
+    def _position(self, lid):
+        pos = bisect.bisect_left(self._ids, lid)
+        if pos < len(self._ids) and self._ids[pos] == lid:
+            return pos
+        return None
+
+    # --- writing ---
+    def append(self, lid, date, time, pc_id, user_id, free_disk_space):
+        """Add a row. Ids must be increasing; use table[lid] = row for anything else."""
+        if self._ids and lid <= self._ids[-1]:
+            self[lid] = dict(zip(self.FIELDS, (lid, date, time, pc_id, user_id, free_disk_space)))
+            return
+        self._ids.append(lid)
+        self._date.append(self._encode_date(lid, date))
+        self._time.append(self._encode_time(lid, time))
+        self._pc.append(self._encode_id(lid, 'pc_id', pc_id))
+        self._user.append(self._encode_id(lid, 'user_id', user_id))
+        self._free.append(self._encode_free(lid, free_disk_space))
+
+    def extend(self, first_lid, rows):
+        """Append (date, time, pc_id, user_id, free_disk_space) rows with ids first_lid, first_lid + 1, ...
+
+        Same result as calling append per row, with the common value types encoded inline.
+        """
+        if self._ids and first_lid <= self._ids[-1]:
+            for lid, row in enumerate(rows, first_lid):
+                self.append(lid, *row)
+            return
+        date_t, time_t, int_t, str_t = datetime.date, datetime.time, int, str
+        free_index = self._free_index
+        ids, dates, times, pcs, users, frees = (self._ids, self._date, self._time,
+                                                self._pc, self._user, self._free)
+        lid = first_lid
+        for date, tm, pc_id, user_id, free in rows:
+            if (type(date) is date_t and type(tm) is time_t and not tm.microsecond
+                    and tm.tzinfo is None and type(pc_id) is int_t and 0 < pc_id < 2**31
+                    and type(user_id) is int_t and 0 < user_id < 2**31 and type(free) is str_t):
+                ids.append(lid)
+                dates.append(date.toordinal())
+                times.append(tm.hour * 3600 + tm.minute * 60 + tm.second)
+                pcs.append(pc_id)
+                users.append(user_id)
+                idx = free_index.get(free)
+                frees.append(idx if idx is not None else self._encode_free(lid, free))
+            else:
+                self.append(lid, date, tm, pc_id, user_id, free)
+            lid += 1
+
+    def extend_columns(self, first_lid, dates, times, pc_ids, user_ids, frees):
+        """extend() for rows given as columns: the same table, with each column encoded
+        once per distinct value and appended in one go."""
+        if self._ids and first_lid <= self._ids[-1]:
+            self.extend(first_lid, zip(dates, times, pc_ids, user_ids, frees))
+            return
+        lids = range(first_lid, first_lid + len(dates))
+        self._ids.extend(lids)
+        for column, field, values, encode in (
+                (self._date, 'date', dates, self._encode_date),
+                (self._time, 'time', times, self._encode_time),
+                (self._pc, 'pc_id', pc_ids, lambda lid, v: self._encode_id(lid, 'pc_id', v)),
+                (self._user, 'user_id', user_ids, lambda lid, v: self._encode_id(lid, 'user_id', v)),
+                (self._free, 'free_disk_space', frees, self._encode_free)):
+            # encoded under lid None, then overflow values are moved to their rows' lids
+            codes = _Memo(functools.partial(encode, None))
+            column.extend(map(codes.__getitem__, values))
+            if self._extra.pop(None, None) is not None:
+                for lid, v in zip(lids, values):
+                    if codes[v] == self._OTHER:
+                        self._extra.setdefault(lid, {})[field] = v
+
+    def __setitem__(self, lid, row):
+        values = (row.get('date'), row.get('time'), row.get('pc_id'), row.get('user_id'), row.get('free_disk_space'))
+        if not self._ids or lid > self._ids[-1]:
+            self.append(lid, *values)
+            return
+        # overwrite or insert in id order (rare; O(n))
+        self._invalidate_index()
+        pos = self._position(lid)
+        self._extra.pop(lid, None)
+        encoded = (self._encode_date(lid, values[0]), self._encode_time(lid, values[1]),
+                   self._encode_id(lid, 'pc_id', values[2]), self._encode_id(lid, 'user_id', values[3]),
+                   self._encode_free(lid, values[4]))
+        columns = (self._date, self._time, self._pc, self._user, self._free)
+        if pos is not None:
+            for col, v in zip(columns, encoded):
+                col[pos] = v
+            return
+        pos = bisect.bisect_left(self._ids, lid)
+        self._ids.insert(pos, lid)
+        for col, v in zip(columns, encoded):
+            col.insert(pos, v)
+
+    def __delitem__(self, lid):
+        pos = self._position(lid)
+        if pos is None:
+            raise KeyError(lid)
+        for col in (self._ids, self._date, self._time, self._pc, self._user, self._free):
+            del col[pos]
+        self._extra.pop(lid, None)
+        self._invalidate_index()
+
+    def discard_many(self, lids):
+        """Remove several rows in one O(n) pass; unknown ids are ignored."""
+        lids = set(lids)
+        if not lids:
+            return
+        keep = [pos for pos, lid in enumerate(self._ids) if lid not in lids]
+        for name in ('_ids', '_date', '_time', '_pc', '_user', '_free'):
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, [col[pos] for pos in keep]))
+        for lid in lids:
+            self._extra.pop(lid, None)
+        self._invalidate_index()
+
+    # --- reading ---
+    def rows(self, positions=None):
+        """Yield (id, date, time, pc_id, user_id, free_disk_space) tuples in id order.
+
+        positions, if given, restricts the rows to those physical positions.
+        """
+        decode = self._decode
+        for pos in (range(len(self._ids)) if positions is None else positions):
+            yield decode(pos)
+
+    def id_set(self, field, positions=None):
+        """Distinct non-None values of 'pc_id' or 'user_id', optionally over some positions."""
+        col = self._pc if field == 'pc_id' else self._user
+        return self._id_values(field, set(col) if positions is None else {col[pos] for pos in positions})
+
+    def _id_values(self, field, values):
+        """id_set() from a set of field codes, which it modifies."""
+        values.discard(0)
+        if self._OTHER in values:
+            values.discard(self._OTHER)
+            values.update(extra[field] for extra in self._extra.values() if extra.get(field) is not None)
+        return values
+
+    def partition(self, ranges):
+        """Rows of several date ranges at once, in one pass over the table.
+
+        ranges are (first ordinal, last ordinal, match) triples; match(value) tells
+        whether a date kept in the overflow belongs to the range (None: never). Returns
+        [(positions, user ids, pc ids)] per range: positions ascending, ids as id_set.
+        """
+        overflow = object()
+
+        def targets_of(code):
+            if code == self._OTHER:
+                return overflow
+            return tuple(k for k, (lo, hi, _match) in enumerate(ranges) if lo <= code <= hi)
+        targets = {}
+        positions = [array('q') for _ in ranges]
+        users = [set() for _ in ranges]
+        pcs = [set() for _ in ranges]
+        user_col, pc_col = self._user, self._pc
+        for pos, code in enumerate(self._date):
+            found = targets.get(code)
+            if found is None:
+                found = targets[code] = targets_of(code)
+            if not found:
+                continue
+            if found is overflow:
+                value = self._extra[self._ids[pos]]['date']
+                found = [k for k, (_lo, _hi, match) in enumerate(ranges)
+                         if match is not None and value is not None and match(value)]
+            for k in found:
+                positions[k].append(pos)
+                users[k].add(user_col[pos])
+                pcs[k].add(pc_col[pos])
+        return [(positions[k], self._id_values('user_id', users[k]), self._id_values('pc_id', pcs[k]))
+                for k in range(len(ranges))]
+
+    def row_at(self, pos):
+        """Row tuple at a physical position (0-based, id order)."""
+        return self._decode(pos)
+
+    def __getitem__(self, lid):
+        pos = self._position(lid)
+        if pos is None:
+            raise KeyError(lid)
+        return dict(zip(self.FIELDS, self._decode(pos)))
+
+    def get(self, lid, default=None):
+        pos = self._position(lid)
+        return default if pos is None else dict(zip(self.FIELDS, self._decode(pos)))
+
+    def __contains__(self, lid):
+        return self._position(lid) is not None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def keys(self):
+        return iter(self._ids)
+
+    def values(self):
+        fields = self.FIELDS
+        for row in self.rows():
+            yield dict(zip(fields, row))
+
+    def items(self):
+        for row in self.values():
+            yield row['id'], row
+
 
 # Global lookup tables for reuse across Filter instances
 BRAND_LOOKUP = LookupTable()
@@ -45,64 +643,309 @@ CPU_MODEL_LOOKUP = LookupTable()
 CPU_CODE_LOOKUP = LookupTable()
 CPU_CODE_FOR_MODEL_LOOKUP = LookupTable()  # Separate lookup for ProcessorModel table
 DEVICE_LOOKUP = LookupTable()
-FREE_TOTAL_LOOKUP = LookupTable()
-DATE_LOOKUP = LookupTable()
-TIME_LOOKUP = LookupTable()
-NOTES_LOOKUP = LookupTable()
+# Nearly one value per login and not part of the exported schema: ids on demand only
+FREE_TOTAL_LOOKUP = LookupTable('lazy')
+DATE_LOOKUP = LookupTable('lazy')
+TIME_LOOKUP = LookupTable('lazy')
+NOTES_LOOKUP = LookupTable('lazy')
 
 
-# Relational-style tables (in-memory) mapping id -> record dict
-USER_TABLE = {}
+# Relational-style tables (in-memory) mapping id -> record dict; the name-only
+# ones are views of their lookup table's first-seen values
+USER_TABLE = LookupView(USER_LOOKUP)
 PC_TABLE = {}
-BRAND_TABLE = {}
+BRAND_TABLE = LookupView(BRAND_LOOKUP)
 MODEL_TABLE = {}
-OS_TABLE = {}
-DEVICE_TABLE = {}
-PROCESSOR_MODEL_TABLE = {}
+OS_TABLE = LookupView(OS_LOOKUP)
+DEVICE_TABLE = LookupView(DEVICE_LOOKUP, 'type')
+PROCESSOR_MODEL_TABLE = LookupView(CPU_CODE_FOR_MODEL_LOOKUP)
 PROCESSOR_TABLE = {}
-LOGIN_TABLE = {}
+LOGIN_TABLE = LoginTable()
 _LOGIN_NEXT = 1
 
+LOOKUP_TABLES = {
+    'BRAND_LOOKUP': BRAND_LOOKUP,
+    'MODEL_LOOKUP': MODEL_LOOKUP,
+    'OS_LOOKUP': OS_LOOKUP,
+    'USER_LOOKUP': USER_LOOKUP,
+    'PCNAME_LOOKUP': PCNAME_LOOKUP,
+    'CPU_MODEL_LOOKUP': CPU_MODEL_LOOKUP,
+    'CPU_CODE_LOOKUP': CPU_CODE_LOOKUP,
+    'CPU_CODE_FOR_MODEL_LOOKUP': CPU_CODE_FOR_MODEL_LOOKUP,
+    'DEVICE_LOOKUP': DEVICE_LOOKUP,
+    'FREE_TOTAL_LOOKUP': FREE_TOTAL_LOOKUP,
+    'DATE_LOOKUP': DATE_LOOKUP,
+    'TIME_LOOKUP': TIME_LOOKUP,
+    'NOTES_LOOKUP': NOTES_LOOKUP,
+}
+
+
+def ResetData():
+    """Empty every lookup table, relational table and the Filter store."""
+    global _LOGIN_NEXT
+    for lookup in LOOKUP_TABLES.values():
+        lookup.clear()
+    for table in (PC_TABLE, MODEL_TABLE, PROCESSOR_TABLE, LOGIN_TABLE):
+        table.clear()
+    _LOGIN_NEXT = 1
+    Filter.objectsArray.clear()
+    _LOGIN_DATE.clear()
+    _INSTALL_DATE.clear()
+
+
+#region Lookup Policies
+
+# Filter id attributes that may be assigned lazily: attribute -> (value attribute, lookup)
+_LAZY_IDS = {
+    'login_date_id': ('login_date', 'DATE_LOOKUP'),
+    'login_time_id': ('login_time', 'TIME_LOOKUP'),
+    'free_total_id': ('free_total_disk_space', 'FREE_TOTAL_LOOKUP'),
+    'notes_id': ('notes', 'NOTES_LOOKUP'),
+}
+LOOKUP_POLICIES = ('eager', 'lazy')
+
+# (value attribute, lookup) pairs of _LAZY_IDS whose lookup is eager; Filter.__init__
+# assigns their ids (kept in step with the policies by SetLookupPolicy)
+_EAGER_IDS = ()
+
+# A lookup is reported as high-cardinality when it holds at least this many ids
+# and at least this many ids per record
+HIGH_CARDINALITY_MIN_IDS = 1000
+HIGH_CARDINALITY_RATIO = 0.2
+
+
+def _refresh_eager_ids():
+    global _EAGER_IDS
+    _EAGER_IDS = tuple((attr, LOOKUP_TABLES[name]) for attr, name in _LAZY_IDS.values()
+                       if LOOKUP_TABLES[name].policy == 'eager')
+
+
+def SetLookupPolicy(name, policy):
+    """Choose when DATE, TIME, FREE_TOTAL or NOTES_LOOKUP assigns ids.
+
+    'eager' assigns them while ingesting, in first-seen order like every other
+    lookup. 'lazy' (the default) only assigns an id when a Filter's id attribute is
+    read, so a lookup nobody reads stays empty instead of holding a copy of nearly
+    every value. The other lookups feed the exported tables and are always eager.
+    Set policies before loading: ids already assigned are kept.
+    """
+    name = _policy_lookup_name(name)
+    if policy not in LOOKUP_POLICIES:
+        raise ValueError(f"unknown lookup policy {policy!r} (expected one of {', '.join(LOOKUP_POLICIES)})")
+    LOOKUP_TABLES[name].policy = policy
+    _refresh_eager_ids()
+
+
+def _policy_lookup_name(name):
+    """'time', 'TIME' or 'TIME_LOOKUP' -> 'TIME_LOOKUP', for the lookups that take a policy."""
+    name = name.strip().upper()
+    if not name.endswith('_LOOKUP'):
+        name += '_LOOKUP'
+    names = [lookup for _attr, lookup in _LAZY_IDS.values()]
+    if name not in names:
+        raise ValueError(f"no policy for {name}; only {', '.join(names)} can be lazy")
+    return name
+
+
+def LookupPolicies():
+    """{lookup name: policy} for the lookups SetLookupPolicy accepts."""
+    return {name: LOOKUP_TABLES[name].policy for _attr, name in _LAZY_IDS.values()}
+
+
+def _set_lookup_policies(policies):
+    """Worker process initializer: the parent's policies (spawned workers start from the defaults)."""
+    for name, policy in policies.items():
+        SetLookupPolicy(name, policy)
+
+
+def LookupMemory(records=None):
+    """Footprint of every lookup table: {name: {'policy', 'ids', 'bytes', 'high_cardinality'}}.
+
+    records (default: rows in LOGIN_TABLE) is what the id count is compared with to
+    flag high-cardinality lookups, which grow with the input rather than with the
+    number of users and machines.
+    """
+    if records is None:
+        records = len(LOGIN_TABLE)
+    report = {}
+    for name, lookup in LOOKUP_TABLES.items():
+        ids = len(lookup)
+        report[name] = {
+            'policy': lookup.policy,
+            'ids': ids,
+            'bytes': lookup.nbytes(),
+            'high_cardinality': ids >= HIGH_CARDINALITY_MIN_IDS and ids >= HIGH_CARDINALITY_RATIO * records,
+        }
+    return report
+
+
+def FormatLookupMemory(report):
+    """LookupMemory() as text lines, high-cardinality lookups marked with '!'."""
+    lines = [f"  {'lookup':<28}{'policy':>8}{'ids':>10}{'KiB':>10}"]
+    for name, entry in report.items():
+        flag = ' !' if entry['high_cardinality'] else ''
+        lines.append(f"  {name:<28}{entry['policy']:>8}{entry['ids']:>10}{entry['bytes'] / 1024:>10.1f}{flag}")
+    total = sum(entry['bytes'] for entry in report.values())
+    lines.append(f"  {'total':<28}{'':>8}{sum(e['ids'] for e in report.values()):>10}{total / 1024:>10.1f}")
+    if any(entry['high_cardinality'] for entry in report.values()):
+        lines.append("  ! high-cardinality: grows with the input, not with the number of users and machines")
+    return lines
+
+#endregion
+
+
+#region Field Parsers
+
+# Fixed-width date layouts: separator, separator positions, year/month/day slices.
+# For these shapes (10 ASCII characters) the first Filter._parse_date format that
+# matches is known, so slicing gives the same date, or None for an invalid one.
+_DATE_LAYOUTS = (
+    ('-', 4, 7, slice(0, 4), slice(5, 7), slice(8, 10)),  # YYYY-MM-DD
+    ('.', 4, 7, slice(0, 4), slice(5, 7), slice(8, 10)),  # YYYY.MM.DD
+    ('/', 4, 7, slice(0, 4), slice(5, 7), slice(8, 10)),  # YYYY/MM/DD
+    ('/', 2, 5, slice(6, 10), slice(3, 5), slice(0, 2)),  # DD/MM/YYYY
+    ('-', 2, 5, slice(6, 10), slice(3, 5), slice(0, 2)),  # DD-MM-YYYY
+)
+
+
+def _fits_layout(s, layout):
+    sep, a, b, ys, ms, ds = layout
+    return (len(s) == 10 and s[a] == sep and s[b] == sep and s.isascii()
+            and (s[ys] + s[ms] + s[ds]).isdigit())
+
+
+class DateColumn:
+    """Date parser for one input column (login date, OS installation date).
+
+    The first value in one of the _DATE_LAYOUTS fixes the column's layout; values in
+    that layout are then read by slicing instead of trying strptime formats. Anything
+    else goes through Filter._parse_date, so results are the same. Parsed values are
+    kept in an LRU cache of cache_size raw strings.
+    """
+    def __init__(self, cache_size=4096):
+        self.layout = None
+        self.parse = functools.lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, value):
+        if type(value) is str:
+            s = value.strip()
+            layout = self.layout
+            if layout is None:
+                layout = self.layout = next((l for l in _DATE_LAYOUTS if _fits_layout(s, l)), None)
+            if layout is not None and _fits_layout(s, layout):
+                _sep, _a, _b, ys, ms, ds = layout
+                try:
+                    return datetime.date(int(s[ys]), int(s[ms]), int(s[ds]))
+                except ValueError:
+                    return None
+        return Filter._parse_date(value)
+
+    def clear(self):
+        """Forget the detected layout (a new file may use another one)."""
+        self.layout = None
+
+
+_LOGIN_DATE = DateColumn()
+_INSTALL_DATE = DateColumn()
+
+
+# No cache here: login times barely repeat (up to 86400 per day), so a cache lookup
+# costs more than it saves. The fast path skips _parse_time's checks and list.
+def parse_time(value):
+    """Filter._parse_time with a fast path for 'H:M:S' strings."""
+    try:
+        h, m, sec = value.split(":")
+        return datetime.time(int(h), int(m), int(sec))
+    except (AttributeError, TypeError, ValueError):
+        # not a str, not three fields, or out of range: same result as the full parser
+        return Filter._parse_time(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_ram(value):
+    """Filter._parse_ram with a fast path for '<digits>GB' and an LRU cache."""
+    if type(value) is str:
+        s = value.strip()
+        digits = s[:-2]
+        # up to 15 digits, float() (used by _parse_ram) is still exact
+        if s[-2:].lower() == 'gb' and 0 < len(digits) <= 15 and digits.isascii() and digits.isdigit():
+            return int(digits)
+    return Filter._parse_ram(value)
+
+#endregion
+
 
 #region Filter Class
 
+class _LazyId:
+    """Filter id attribute of a _LAZY_IDS field: looked up from the field's value on
+    read instead of stored, so it is only assigned when used under the lazy policy."""
+    __slots__ = ('source', 'lookup')
+
+    def __init__(self, source, lookup):
+        self.source = source
+        self.lookup = lookup
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return self.lookup.get_or_create(getattr(obj, self.source))
+        except Exception:
+            return None
+
+
 class Filter:
 
-    # Class-level storage for filtered data
-    objectsArray: list['Filter'] = []
+    # Class-level storage for filtered data (latest entry per (user, pc_name))
+    objectsArray: LatestStore = LatestStore()
 
-  
+    # Plain slots instead of properties: no per-instance __dict__, direct attribute reads
+    __slots__ = (
+        'login_date', 'login_time', 'device_type', 'pc_name', 'user', 'brand',
+        'model', 'installed_ram', 'cpu_model', 'cpu_code', 'operating_system',
+        'installation_date', 'disk', 'free_total_disk_space', 'notes',
+        'user_id', 'pc_name_id', 'brand_id', 'model_id', 'os_id', 'cpu_model_id',
+        'cpu_code_id', 'cpu_code_for_model_id', 'device_type_id',
+    )
 
+    # ids of the high-cardinality fields (see SetLookupPolicy)
+    login_date_id = _LazyId('login_date', DATE_LOOKUP)
+    login_time_id = _LazyId('login_time', TIME_LOOKUP)
+    free_total_id = _LazyId('free_total_disk_space', FREE_TOTAL_LOOKUP)
+    notes_id = _LazyId('notes', NOTES_LOOKUP)
 
     def __init__(self, login_date, login_time, device_type, pc_name, user, brand,
                  model, installed_ram, cpu_model, cpu_code,
                  operating_system, installation_date, disk,
                  free_total_disk_space, notes):
-        self.login_date = login_date
-        self.login_time = login_time
+        # Dates, time and RAM are parsed once here; unparseable values are kept as given
+        parsed = _LOGIN_DATE.parse(login_date)
+        self.login_date = parsed if parsed is not None else login_date
+        parsed = parse_time(login_time)
+        self.login_time = parsed if parsed is not None else login_time
         self.device_type = device_type
         self.pc_name = pc_name
         self.user = user
         self.brand = brand
         self.model = model
-        self.installed_ram = installed_ram
+        parsed = parse_ram(installed_ram)
+        self.installed_ram = parsed if parsed is not None else installed_ram
         self.cpu_code = cpu_code
         self.cpu_model = cpu_model
         self.operating_system = operating_system
-        self.installation_date = installation_date
+        parsed = _INSTALL_DATE.parse(installation_date)
+        self.installation_date = parsed if parsed is not None else installation_date
         self.disk = disk
         self.free_total_disk_space = free_total_disk_space
         self.notes = notes
-        
-        # Create or reuse ids for several fields (the setters already normalize types)
-        try:
-            self.login_date_id = DATE_LOOKUP.get_or_create(self.login_date)
-        except Exception:
-            self.login_date_id = None
-        try:
-            self.login_time_id = TIME_LOOKUP.get_or_create(self.login_time)
-        except Exception:
-            self.login_time_id = None
+
+        # Create or reuse ids for several fields (values are already normalized above)
+        for attr, lookup in _EAGER_IDS:
+            try:
+                lookup.get_or_create(getattr(self, attr))
+            except Exception:
+                pass
         self.user_id = USER_LOOKUP.get_or_create(self.user)
         self.pc_name_id = PCNAME_LOOKUP.get_or_create(self.pc_name)
         self.brand_id = BRAND_LOOKUP.get_or_create(self.brand)
@@ -112,185 +955,30 @@ class Filter:
         self.cpu_code_id = CPU_CODE_LOOKUP.get_or_create(self.cpu_code)
         self.cpu_code_for_model_id = CPU_CODE_FOR_MODEL_LOOKUP.get_or_create(self.cpu_code)  # Separate ID for ProcessorModel
         self.device_type_id = DEVICE_LOOKUP.get_or_create(self.device_type)
-        self.free_total_id = FREE_TOTAL_LOOKUP.get_or_create(self.free_total_disk_space)
-        self.notes_id = NOTES_LOOKUP.get_or_create(self.notes)
 
         # Register this object, keeping only the latest per (user_id, pc_name_id)
         Filter.register(self)
 
+    # Compact pickling (parallel ingest, snapshots): a flat tuple in slot order
+    def __getstate__(self):
+        return tuple(getattr(self, name, None) for name in Filter.__slots__)
 
-    #region Properties
-
-    @property
-    def login_date(self):
-        return self._login_date
-    
-    @login_date.setter
-    def login_date(self, value):
-        parsed = Filter._parse_date(value)
-        self._login_date = parsed if parsed is not None else value
-
-    @property
-    def login_time(self):
-        return self._login_time
-    
-    @login_time.setter
-    def login_time(self, value):
-        parsed = Filter._parse_time(value)
-        self._login_time = parsed if parsed is not None else value
-
-    @property
-    def device_type(self):
-        return self._device_type
-    
-    @device_type.setter
-    def device_type(self, value):
-        self._device_type = value
-
-    @property
-    def pc_name(self):
-        return self._pc_name
-    
-    @pc_name.setter
-    def pc_name(self, value):
-        self._pc_name = value
-    
-    @property
-    def user(self):
-        return self._user
-    
-    @user.setter
-    def user(self, value):
-        self._user = value
-    
-    @property
-    def brand(self):
-        return self._brand
-
-    @brand.setter
-    def brand(self, value):
-        self._brand = value
-
-    @property
-    def model(self):
-        return self._model
-    
-    @model.setter
-    def model(self, value):
-        self._model = value
-
-    @property
-    def installed_ram(self):
-        return self._installed_ram
-    
-    @installed_ram.setter
-    def installed_ram(self, value):
-        parsed = Filter._parse_ram(value)
-        self._installed_ram = parsed if parsed is not None else value
-
-    @property
-    def cpu_model(self):
-        return self._cpu_model
-    
-    @cpu_model.setter
-    def cpu_model(self, value):
-        self._cpu_model = value
-
-    @property
-    def cpu_code(self):
-        return self._cpu_code
-    
-    @cpu_code.setter
-    def cpu_code(self, value):
-        self._cpu_code = value
-
-    @property
-    def operating_system(self):
-        return self._operating_system
-    
-    @operating_system.setter
-    def operating_system(self, value):
-        self._operating_system = value
-
-    @property
-    def installation_date(self):
-        return self._installation_date
-    
-    @installation_date.setter
-    def installation_date(self, value):
-        parsed = Filter._parse_date(value)
-        self._installation_date = parsed if parsed is not None else value
-    
-    @property
-    def disk(self):
-        return self._disk
-    
-    @disk.setter
-    def disk(self, value):
-        self._disk = value
-
-    @property
-    def free_total_disk_space(self):
-        return self._free_total_disk_space
-
-    @free_total_disk_space.setter
-    def free_total_disk_space(self, value):
-        self._free_total_disk_space = value
-
-    @property
-    def notes(self):
-        return self._notes
-    
-    @notes.setter
-    def notes(self, value):
-        self._notes = value
-
-
-    #endregion
+    def __setstate__(self, state):
+        for name, value in zip(Filter.__slots__, state):
+            setattr(self, name, value)
 
     #region Methods
 
     # Filter and keep only the latest entry per (user, pc_name) by login_date
     @classmethod
     def register(cls, instance: 'Filter'):
-        """Register a Filter instance. If there are existing entries with the same
+        """Register a Filter instance. If there is an existing entry with the same
         (user, pc_name) pair, keep only the one with the latest login_date.
 
-        Matching is case-insensitive on user and pc_name.
+        Matching is on user/pc ids, or case-insensitive on user and pc_name
+        when ids are missing.
         """
-        # Prefer numeric ids if available (created during __init__)
-        user_id = getattr(instance, 'user_id', None)
-        pc_id = getattr(instance, 'pc_name_id', None)
-        if user_id is not None and pc_id is not None:
-            same = [o for o in cls.objectsArray if getattr(o, 'user_id', None) == user_id and getattr(o, 'pc_name_id', None) == pc_id]
-        else:
-            # Fallback to case-insensitive string match
-            key = (getattr(instance, 'user', '').strip().lower(), getattr(instance, 'pc_name', '').strip().lower())
-            same = [o for o in cls.objectsArray if (getattr(o, 'user', '').strip().lower(), getattr(o, 'pc_name', '').strip().lower()) == key]
-        if not same:
-            cls.objectsArray.append(instance)
-            return
-
-        # There are existing objects: include the new instance and choose the latest
-        candidates = same + [instance]
-        try:
-            latest = max(candidates, key=lambda x: x.login_date)
-        except Exception:
-            # If login_date isn't comparable, fall back to keeping the new instance
-            latest = instance
-
-        # Remove all existing same-key objects
-        for o in same:
-            try:
-                cls.objectsArray.remove(o)
-            except ValueError:
-                pass
-
-        # Ensure latest is in the array
-        if latest is instance:
-            cls.objectsArray.append(instance)
-        else:
-            cls.objectsArray.append(latest)
+        cls.objectsArray.put(instance)
 
     @classmethod
     def add_object(cls, obj: 'Filter'):
@@ -389,355 +1077,2378 @@ class Filter:
 
 
 #region Data Handling Functions
-def DataReader():
-    file_path = "hw.txt"
 
+def _parse_line(line):
+    """Split one hw.txt line into the 15 Filter constructor values.
+
+    Returns None for blank lines and lines without a valid YYYY.MM.DD login date.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    fields = line.split(";")
     try:
-        # A simple progress window
-        # First count lines to set the maximum
-        try:
-            with open(file_path, 'r', encoding='utf-8') as _f:
-                total_lines = sum(1 for _ in _f)
-        except FileNotFoundError:
-            raise
+        # First field expected format YYYY.MM.DD
+        y, m, d = map(int, fields[0].split("."))
+        login_date = datetime.date(y, m, d)
+    except (ValueError, IndexError):
+        return None
+    # Guard against short lines: use empty string if missing
+    if len(fields) < 15:
+        fields += [""] * (15 - len(fields))
+    return (login_date,) + tuple(fields[1:15])
 
-        progress_root = tk.Tk()
-        progress_root.title('Loading data')
-        progress_root.geometry('400x90')
-        progress_root.resizable(False, False)
-        progress_root.attributes('-topmost', True)
-        tk.Label(progress_root, text=f'Reading data from {file_path}...').pack(pady=(8, 0))
-        pb = ttk.Progressbar(progress_root, orient='horizontal', length=360, mode='determinate')
-        pb.pack(pady=(8, 8))
-        pb['maximum'] = max(1, total_lines)
-        progress_root.update()
-
-        # Now process with progress updates
-        with open(file_path, "r", encoding="utf-8") as f:
-            for idx, line in enumerate(f, start=1):
-                line = line.strip()
-                if not line:
-                    pb['value'] = idx
-                    progress_root.update_idletasks()
-                    continue
-                fields = line.split(";")
-                try:
-                    # First field expected format YYYY.MM.DD
-                    login_date_str = fields[0]
-                    y, m, d = map(int, login_date_str.split("."))
-                    login_date = datetime.date(y, m, d)
-                except (ValueError, IndexError):
-                    pb['value'] = idx
-                    progress_root.update_idletasks()
-                    continue
 
-                # Variables for Filter constructor (guard against short lines)
-                # Use empty string if missing
-                def safe(i):
-                    return fields[i] if i < len(fields) else ""
-
-                login_time = safe(1)
-                device_type = safe(2)
-                pc_name = safe(3)
-                user = safe(4)
-                brand = safe(5)
-                model = safe(6)
-                installed_ram = safe(7)
-                cpu_model = safe(8)
-                cpu_code = safe(9)
-                operating_system = safe(10)
-                installation_date = safe(11)
-                disk = safe(12)
-                free_total_disk_space = safe(13)
-                notes = safe(14)
-
-                # Create Filter instance (which auto-registers itself)
-                obj = Filter(
-                    login_date, login_time, device_type, pc_name, user, brand,
-                    model, installed_ram, cpu_model, cpu_code,
-                    operating_system, installation_date, disk,
-                    free_total_disk_space, notes
-                )
-
-                # Populate relational-style tables using ids from the Filter instance
-                # Users
-                if getattr(obj, 'user_id', None) is not None and obj.user_id not in USER_TABLE:
-                    USER_TABLE[obj.user_id] = {'id': obj.user_id, 'name': obj.user}
-
-                # Brand
-                if getattr(obj, 'brand_id', None) is not None and obj.brand_id not in BRAND_TABLE:
-                    BRAND_TABLE[obj.brand_id] = {'id': obj.brand_id, 'name': obj.brand}
-
-                # Model (attach brand if available)
-                if getattr(obj, 'model_id', None) is not None and obj.model_id not in MODEL_TABLE:
-                    MODEL_TABLE[obj.model_id] = {'id': obj.model_id, 'brand_id': getattr(obj, 'brand_id', None), 'name': obj.model}
-
-                # OS
-                if getattr(obj, 'os_id', None) is not None and obj.os_id not in OS_TABLE:
-                    OS_TABLE[obj.os_id] = {'id': obj.os_id, 'name': obj.operating_system}
-
-                # Device type
-                if getattr(obj, 'device_type_id', None) is not None and obj.device_type_id not in DEVICE_TABLE:
-                    DEVICE_TABLE[obj.device_type_id] = {'id': obj.device_type_id, 'type': obj.device_type}
-
-                # Processor model
-                if getattr(obj, 'cpu_code_for_model_id', None) is not None and obj.cpu_code_for_model_id not in PROCESSOR_MODEL_TABLE:
-                    PROCESSOR_MODEL_TABLE[obj.cpu_code_for_model_id] = {'id': obj.cpu_code_for_model_id, 'name': obj.cpu_code}
-
-                # Processor - unique processor record for each machine
-                # Generate unique processor ID for each machine
-                proc_key = f"{obj.pc_name or ''}|{obj.cpu_model or ''}|{obj.cpu_code or ''}"
-                proc_id = CPU_CODE_LOOKUP.get_or_create(proc_key)
-                
-                # Every processor is unique, so always add it
-                PROCESSOR_TABLE[proc_id] = {
-                    'id': proc_id, 
-                    'code': obj.cpu_model,  # ProcessorCode field
-                    'model_id': getattr(obj, 'cpu_code_for_model_id', None)  # ProcessorModelID reference
-                }
-
-                # PC (reuse by pc_name id)
-                if getattr(obj, 'pc_name_id', None) is not None:
-                    if obj.pc_name_id not in PC_TABLE:
-                        PC_TABLE[obj.pc_name_id] = {
-                            'id': obj.pc_name_id,
-                            'name': obj.pc_name,
-                            'device_id': getattr(obj, 'device_type_id', None),
-                            'model_id': getattr(obj, 'model_id', None),
-                            'ram_gb': obj.installed_ram,
-                            'processor_id': proc_id,
-                            'os_id': getattr(obj, 'os_id', None),
-                            'os_installation_date': getattr(obj, 'installation_date', None),
-                            'disk': obj.disk,  # Disk name directly
-                            'note': obj.notes
-                        }
-
-                # Login table: create a login row linking user and pc
-                global _LOGIN_NEXT
-                lid = _LOGIN_NEXT
-                LOGIN_TABLE[lid] = {
-                    'id': lid,
-                    'date': obj.login_date,
-                    'time': obj.login_time,
-                    'pc_id': getattr(obj, 'pc_name_id', None),
-                    'user_id': getattr(obj, 'user_id', None),
-                    'free_disk_space': obj.free_total_disk_space  # FreeDiskSpace moved from PC table
-                }
-                _LOGIN_NEXT += 1
-
-                # update progress
-                pb['value'] = idx
-                progress_root.update_idletasks()
-
-        # finished
-        progress_root.destroy()
-    except FileNotFoundError:
-        messagebox.showerror("Error", f"Input file not found: {file_path}")
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while reading the file:\n{e}")
+def _login_date(text):
+    """The login date of a YYYY.MM.DD first field, or None, as _parse_line reads it."""
+    try:
+        y, m, d = map(int, text.split("."))
+        return datetime.date(y, m, d)
+    except (ValueError, IndexError):
+        return None
 
 
-def DataFilter(d) -> list[Filter]:
-    filtered = [f for f in Filter.objectsArray if f.login_date == d]
+# Entries kept by the per-reader date caches before they are emptied
+_DATE_CACHE_SIZE = 1 << 16
+
+
+def IngestRecord(record):
+    """Create the Filter for one parsed record and populate the relational tables."""
+    global _LOGIN_NEXT
+
+    # Create Filter instance (which auto-registers itself)
+    obj = Filter(*record)
+
+    # Populate relational-style tables using ids from the Filter instance
+    # (users, brands, OSes, device types and processor models are LookupViews,
+    # filled by the lookups themselves)
+    # Model (attach brand if available)
+    if getattr(obj, 'model_id', None) is not None and obj.model_id not in MODEL_TABLE:
+        MODEL_TABLE[obj.model_id] = {'id': obj.model_id, 'brand_id': getattr(obj, 'brand_id', None), 'name': obj.model}
+
+    # Processor - unique processor record for each machine
+    # Generate unique processor ID for each machine
+    proc_key = f"{obj.pc_name or ''}|{obj.cpu_model or ''}|{obj.cpu_code or ''}"
+    proc_id = CPU_CODE_LOOKUP.get_or_create(proc_key)
+
+    # Every processor is unique, so always add it
+    PROCESSOR_TABLE[proc_id] = {
+        'id': proc_id,
+        'code': obj.cpu_model,  # ProcessorCode field
+        'model_id': getattr(obj, 'cpu_code_for_model_id', None)  # ProcessorModelID reference
+    }
+
+    # PC (reuse by pc_name id)
+    if getattr(obj, 'pc_name_id', None) is not None:
+        if obj.pc_name_id not in PC_TABLE:
+            PC_TABLE[obj.pc_name_id] = {
+                'id': obj.pc_name_id,
+                'name': obj.pc_name,
+                'device_id': getattr(obj, 'device_type_id', None),
+                'model_id': getattr(obj, 'model_id', None),
+                'ram_gb': obj.installed_ram,
+                'processor_id': proc_id,
+                'os_id': getattr(obj, 'os_id', None),
+                'os_installation_date': getattr(obj, 'installation_date', None),
+                'disk': obj.disk,  # Disk name directly
+                'note': obj.notes
+            }
+
+    # Login table: create a login row linking user and pc
+    lid = _LOGIN_NEXT
+    LOGIN_TABLE.append(
+        lid,
+        obj.login_date,
+        obj.login_time,
+        getattr(obj, 'pc_name_id', None),
+        getattr(obj, 'user_id', None),
+        obj.free_total_disk_space  # FreeDiskSpace moved from PC table
+    )
+    _LOGIN_NEXT += 1
+    return obj
+
+
+# Leading bytes of the compressed inputs read transparently, and their openers
+_COMPRESSED_INPUTS = (
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+)
+
+
+def _input_opener(head):
+    """Opener for a file starting with head if it is gzip, bz2 or xz, else None."""
+    for magic, opener in _COMPRESSED_INPUTS:
+        if head.startswith(magic):
+            return opener
+    return None
+
+
+def _open_input(raw):
+    """raw (a binary file) itself, or a decompressing reader over it when it is compressed."""
+    opener = _input_opener(raw.read(6))
+    raw.seek(0)
+    return raw if opener is None else opener(raw, 'rb')
+
+
+def _is_compressed(file_path):
+    with open(file_path, 'rb') as f:
+        return _input_opener(f.read(6)) is not None
+
+
+def InputFiles(inputs):
+    """Expand input files, glob patterns and directories into a list of files.
+
+    A directory stands for the files directly in it whose name ends in .txt, .gz,
+    .bz2 or .xz, sorted by name; glob matches are sorted too. Files keep the order
+    they are given in, and a file named twice is only read once.
+    Raises FileNotFoundError for a pattern or directory that matches no file.
+    """
+    files = []
+    for entry in [inputs] if isinstance(inputs, str) else inputs:
+        if os.path.isdir(entry):
+            found = sorted(os.path.join(entry, name) for name in os.listdir(entry)
+                           if name.endswith(('.txt', '.gz', '.bz2', '.xz'))
+                           and os.path.isfile(os.path.join(entry, name)))
+        elif any(c in entry for c in '*?['):
+            found = sorted(p for p in glob.glob(entry) if os.path.isfile(p))
+        else:
+            found = [entry]
+        if not found:
+            raise FileNotFoundError(f"no input files match {entry}")
+        files += found
+    unique = {}
+    for p in files:
+        unique.setdefault(os.path.abspath(p), p)
+    return list(unique.values())
+
+
+class RecordReader:
+    """Single-pass reader that yields parsed hw.txt records.
+
+    The file is read once in binary mode; progress is measured in bytes consumed
+    against the file size, so no separate line-counting pass is needed. Lines end
+    at a newline byte: CRLF files read as before, but a bare carriage return (old
+    Mac line endings) no longer ends a line as it did in text mode. gzip, bz2 and xz
+    files are decompressed as they are read; their progress is the position in the
+    compressed file, while the 'bytes' stat counts decompressed bytes.
+    progress(bytes_read, total_bytes) is called at most once per min_interval
+    seconds (checked every check_every lines) and once more at the end.
+    complete_lines=True stops before a final line that has no newline yet (a
+    writer is still appending it); bytes_read then ends on a line boundary.
+    cancel, a threading.Event, stops reading at the next check once it is set;
+    cancelled is then True.
+    """
+    def __init__(self, file_path="hw.txt", progress=None, min_interval=0.1, check_every=1000,
+                 complete_lines=False, cancel=None):
+        self.file_path = file_path
+        self.complete_lines = complete_lines
+        self.progress = progress
+        self.cancel = cancel
+        self.cancelled = False
+        self.min_interval = min_interval
+        self.check_every = max(1, check_every)
+        self.total_bytes = 0
+        self.bytes_read = 0
+        self.lines = 0
+        self.records = 0
+
+    @property
+    def skipped(self):
+        return self.lines - self.records
+
+    def stats(self):
+        return {'lines': self.lines, 'records': self.records, 'skipped': self.skipped,
+                'bytes': self.bytes_read}
+
+    def __iter__(self):
+        self.total_bytes = os.path.getsize(self.file_path)
+        progress = self.progress
+        cancel = self.cancel
+        checking = progress is not None or cancel is not None
+        check_every = self.check_every
+        next_report = time.monotonic() + self.min_interval
+        bytes_read = lines = records = 0
+        try:
+            with open(self.file_path, "rb") as raw_file, _open_input(raw_file) as f:
+                position = None if f is raw_file else raw_file.tell
+                for raw in f:
+                    if self.complete_lines and not raw.endswith(b"\n"):
+                        break
+                    bytes_read += len(raw)
+                    lines += 1
+                    record = _parse_line(raw.decode("utf-8"))
+                    if record is not None:
+                        records += 1
+                        yield record
+                    if checking and lines % check_every == 0:
+                        if cancel is not None and cancel.is_set():
+                            self.cancelled = True
+                            break
+                        if progress is None:
+                            continue
+                        now = time.monotonic()
+                        if now >= next_report:
+                            next_report = now + self.min_interval
+                            self.bytes_read, self.lines, self.records = bytes_read, lines, records
+                            progress(bytes_read if position is None else position(), self.total_bytes)
+                done = bytes_read if position is None else position()
+        finally:
+            self.bytes_read, self.lines, self.records = bytes_read, lines, records
+        if progress is not None:
+            progress(done, self.total_bytes)
+
+
+class MmapBlockReader(RecordReader):
+    """Base of ColumnReader: memory-maps the file and cuts it into blocks of whole lines.
+
+    Lines are cut out of the mapping a block (about block_size bytes) at a time;
+    subclasses parse each block of _line_blocks(). Stats, progress, cancel and
+    complete_lines are as for RecordReader, except that cancel and progress are
+    checked once per block. gzip, bz2 and xz inputs can't be mapped and are read
+    block by block from the decompressing stream instead.
+    With fingerprint=True the mapped bytes are hashed as they are parsed, and once a
+    plain file has been read to the end self.fingerprint is its _fingerprint(), so a
+    snapshot can be saved without reading the file a second time.
+    """
+    def __init__(self, file_path="hw.txt", progress=None, min_interval=0.1, block_size=1 << 20,
+                 complete_lines=False, cancel=None, fingerprint=False):
+        super().__init__(file_path, progress=progress, min_interval=min_interval,
+                         complete_lines=complete_lines, cancel=cancel)
+        self.block_size = block_size
+        self.hash_input = fingerprint
+        self.fingerprint = None
+        self._stat = None  # os.stat_result of the mapped file
+
+    def _blocks(self, raw_file):
+        """Yield (block, position in the compressed file or None): blocks of whole lines,
+        except maybe the last."""
+        f = _open_input(raw_file)
+        block_size = self.block_size
+        if f is not raw_file:
+            with f:
+                rest = b""
+                while True:
+                    data = f.read(block_size)
+                    if not data:
+                        break
+                    data = rest + data
+                    cut = data.rfind(b"\n") + 1
+                    rest = data[cut:]
+                    if cut:
+                        yield data[:cut], raw_file.tell()
+                if rest:
+                    yield rest, raw_file.tell()
+            return
+        self._stat = os.fstat(raw_file.fileno())
+        size = self._stat.st_size
+        if size == 0:
+            return  # an empty file can't be mapped
+        with mmap.mmap(raw_file.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < size:
+                end = pos + block_size
+                if end >= size:
+                    end = size
+                else:
+                    # end after the block's last newline (or the first one after a long line)
+                    end = mm.rfind(b"\n", pos, end) + 1 or mm.find(b"\n", end) + 1 or size
+                yield mm[pos:end], None
+                pos = end
+
+    def _line_blocks(self):
+        """Yield the blocks of lines to parse: bytes, newlines included except after an
+        unterminated last line. Counts each block into lines and bytes_read as it is
+        yielded, checks cancel and reports progress after it, and sets fingerprint at the end."""
+        self.total_bytes = os.path.getsize(self.file_path)
+        progress = self.progress
+        cancel = self.cancel
+        complete_lines = self.complete_lines
+        digest = hashlib.blake2b(digest_size=16) if self.hash_input else None
+        next_report = time.monotonic() + self.min_interval
+        self.bytes_read = self.lines = done = 0
+        with open(self.file_path, "rb") as raw_file:
+            for block, position in self._blocks(raw_file):
+                if digest is not None:
+                    digest.update(block)
+                lines = block.count(b"\n")
+                if not block.endswith(b"\n"):
+                    # the file's last line, not terminated (yet)
+                    if complete_lines:
+                        block = block[:block.rfind(b"\n") + 1]
+                    else:
+                        lines += 1
+                # counted first, so a consumer that stops within the block still sees it
+                self.lines += lines
+                self.bytes_read += len(block)
+                if block:
+                    yield block
+                done = self.bytes_read if position is None else position
+                if cancel is not None and cancel.is_set():
+                    self.cancelled = True
+                    break
+                if progress is not None:
+                    now = time.monotonic()
+                    if now >= next_report:
+                        next_report = now + self.min_interval
+                        progress(done, self.total_bytes)
+            else:
+                st = self._stat
+                if digest is not None and st is not None:
+                    self.fingerprint = {'path': os.path.abspath(self.file_path), 'size': st.st_size,
+                                        'mtime_ns': st.st_mtime_ns, 'hash': digest.hexdigest()}
+        if progress is not None:
+            progress(done, self.total_bytes)
+
+
+def _fifteen_fields(line, separators):
+    """line (stripped, with that many ';') cut or padded to exactly 15 fields."""
+    if separators < 14:
+        return line + ";" * (14 - separators)
+    return ";".join(line.split(";", 15)[:15])
+
+
+def _record_columns(lines, dates):
+    """The records _parse_line makes of lines (str), as columns instead of rows.
+
+    Returns [login dates, login times, machines, free disk spaces, notes], lists in
+    line order, or None when no line is a record. A machine is fields 3-13 of a line
+    (device type to disk) still joined by ';': they describe a PC and its user and
+    repeat from login to login, so IngestColumns splits each distinct one only once.
+    dates, a _Memo(_login_date), keeps the login dates (or None) of first fields
+    across calls. Lines are brought to 15 fields each and cut with two str.split
+    calls apiece, whose results are flattened right away.
+    """
+    if not lines:
+        return None
+    lines = list(map(str.strip, lines))
+    separators = list(map(str.count, lines, itertools.repeat(";")))
+    if separators.count(14) != len(lines):
+        lines = [line if n == 14 else _fifteen_fields(line, n) for line, n in zip(lines, separators)]
+    chain = itertools.chain.from_iterable
+    # date, time, rest ...
+    heads = list(chain(map(str.split, lines, itertools.repeat(";"), itertools.repeat(2))))
+    # ... and rest = machine, free disk space, notes
+    tails = list(chain(map(str.rsplit, heads[2::3], itertools.repeat(";"), itertools.repeat(2))))
+    if len(dates) >= _DATE_CACHE_SIZE:
+        dates.clear()
+    columns = [list(map(dates.__getitem__, heads[0::3])), heads[1::3], tails[0::3], tails[1::3], tails[2::3]]
+    if None in columns[0]:
+        # blank lines and lines without a valid login date (dates are never false)
+        keep = columns[0]
+        columns = [list(itertools.compress(column, keep)) for column in columns]
+        if not columns[0]:
+            return None
+    return columns
+
+
+class ColumnReader(MmapBlockReader):
+    """MmapBlockReader that yields each block's records as columns, for IngestColumns.
+
+    Each item is _record_columns() of a block: the records RecordReader would yield
+    for its lines. Blocks are decoded whole and default to a few MiB, so a block
+    holds many logins per distinct machine. Stats, progress, cancel, complete_lines
+    and fingerprint are as for MmapBlockReader.
+    """
+    def __init__(self, file_path="hw.txt", progress=None, min_interval=0.1, block_size=1 << 23,
+                 complete_lines=False, cancel=None, fingerprint=False):
+        super().__init__(file_path, progress=progress, min_interval=min_interval, block_size=block_size,
+                         complete_lines=complete_lines, cancel=cancel, fingerprint=fingerprint)
+
+    def __iter__(self):
+        dates = _Memo(_login_date)
+        self.records = records = 0
+        try:
+            for block in self._line_blocks():
+                lines = block.decode("utf-8").split("\n")
+                if not lines[-1]:
+                    lines.pop()  # "" after the final newline
+                columns = _record_columns(lines, dates)
+                if columns is not None:
+                    records += len(columns[0])
+                    yield columns
+                self.records = records
+        finally:
+            self.records = records
+
+
+def _ingest_machine(machine):
+    """Filter values and ids for one distinct machine string (see _record_columns):
+    Filter.__slots__ device_type to disk, then user_id to device_type_id, then the
+    processor id. Ids are looked up in IngestRecord's order."""
+    (device_type, pc_name, user, brand, model, installed_ram, cpu_model, cpu_code,
+     operating_system, installation_date, disk) = machine.split(";")
+    parsed = parse_ram(installed_ram)
+    if parsed is not None:
+        installed_ram = parsed
+    parsed = _INSTALL_DATE.parse(installation_date)
+    if parsed is not None:
+        installation_date = parsed
+    return (device_type, pc_name, user, brand, model, installed_ram, cpu_model, cpu_code,
+            operating_system, installation_date, disk,
+            USER_LOOKUP.get_or_create(user),
+            PCNAME_LOOKUP.get_or_create(pc_name),
+            BRAND_LOOKUP.get_or_create(brand),
+            MODEL_LOOKUP.get_or_create(model),
+            OS_LOOKUP.get_or_create(operating_system),
+            CPU_MODEL_LOOKUP.get_or_create(cpu_model),
+            CPU_CODE_LOOKUP.get_or_create(cpu_code),
+            CPU_CODE_FOR_MODEL_LOOKUP.get_or_create(cpu_code),
+            DEVICE_LOOKUP.get_or_create(device_type),
+            CPU_CODE_LOOKUP.get_or_create(f"{pc_name or ''}|{cpu_model or ''}|{cpu_code or ''}"))
+
+
+# Positions in an _ingest_machine tuple
+_MACHINE_USER_ID, _MACHINE_PC_ID, _MACHINE_PROCESSOR_ID = 11, 12, 20
+
+
+def IngestColumns(columns):
+    """IngestRecord for a batch of records given as columns (see ColumnReader).
+
+    Assigns the same ids and fills the same tables as IngestRecord on each record in
+    turn, a column at a time: a login date, time or machine is parsed, and its ids
+    looked up, once per distinct value (a machine's fields first appear with the
+    machine, so first-seen order and ids stay the same). Only each (user, PC)'s
+    latest login of the batch becomes a Filter, registered where the last of that
+    pair's records would have left it. Returns the number of records.
+    """
+    global _LOGIN_NEXT
+    login_dates, times, machine_texts, frees, notes = columns
+    n = len(login_dates)
+
+    def parsed_time(value):
+        parsed = parse_time(value)
+        return value if parsed is None else parsed
+    times = list(map(_Memo(parsed_time).__getitem__, times))
+    sources = {'login_date': login_dates, 'login_time': times, 'free_total_disk_space': frees,
+               'notes': notes}
+    for attr, lookup in _EAGER_IDS:
+        lookup.get_or_create_column(sources[attr])
+    machine_of = _Memo(_ingest_machine)
+    machines = list(map(machine_of.__getitem__, machine_texts))
+    user_ids = list(map(operator.itemgetter(_MACHINE_USER_ID), machines))
+    pc_ids = list(map(operator.itemgetter(_MACHINE_PC_ID), machines))
+
+    # distinct machines are in first-seen order, so each model's and PC's first machine
+    # is its first record
+    first_rows = None
+    for text, machine in machine_of.items():
+        model_id = machine[14]
+        if model_id is not None and model_id not in MODEL_TABLE:
+            MODEL_TABLE[model_id] = {'id': model_id, 'brand_id': machine[13], 'name': machine[4]}
+        pc_id = machine[_MACHINE_PC_ID]
+        if pc_id is not None and pc_id not in PC_TABLE:
+            if first_rows is None:
+                first_rows = dict(zip(reversed(machine_texts), range(n - 1, -1, -1)))
+            PC_TABLE[pc_id] = {
+                'id': pc_id,
+                'name': machine[1],
+                'device_id': machine[19],
+                'model_id': model_id,
+                'ram_gb': machine[5],
+                'processor_id': machine[_MACHINE_PROCESSOR_ID],
+                'os_id': machine[15],
+                'os_installation_date': machine[9],
+                'disk': machine[10],
+                'note': notes[first_rows[text]]
+            }
+    # every record rewrites its processor row: the last record's wins, in first-seen order
+    processors = {}
+    for text, i in dict(zip(machine_texts, range(n))).items():
+        machine = machine_of[text]
+        proc_id = machine[_MACHINE_PROCESSOR_ID]
+        if proc_id not in processors or i > processors[proc_id][0]:
+            processors[proc_id] = (i, machine)
+    for proc_id, (_i, machine) in processors.items():
+        PROCESSOR_TABLE[proc_id] = {'id': proc_id, 'code': machine[6], 'model_id': machine[18]}
+
+    LOGIN_TABLE.extend_columns(_LOGIN_NEXT, login_dates, times, pc_ids, user_ids, frees)
+    _LOGIN_NEXT += n
+
+    # Latest login per (user_id, pc_name_id), which stands for LatestStore's key: the
+    # first of the latest date. Sorting positions last to first by date (stable), the
+    # last position seen per pair is that one. Pairs are numbered, so no tuple is kept per record.
+    pair_numbers = _Memo(lambda _pair: len(pair_numbers))
+    pairs = list(map(pair_numbers.__getitem__, zip(user_ids, pc_ids)))
+    by_date = sorted(range(n - 1, -1, -1), key=login_dates.__getitem__)
+    latest = dict(zip(map(pairs.__getitem__, by_date), by_date))
+    # register() moves a pair to the end on every record: order by each pair's last record
+    last = dict(zip(pairs, range(n)))
+    for pair in sorted(last, key=last.__getitem__):
+        i = latest[pair]
+        machine = machines[i]
+        obj = Filter.__new__(Filter)
+        obj.__setstate__((login_dates[i], times[i], *machine[:11], frees[i], notes[i], *machine[11:20]))
+        Filter.register(obj)
+    return n
+
+
+# Reader engines of LoadData: 'lines' (RecordReader) and 'columnar' (ColumnReader + IngestColumns)
+READER_ENGINES = ('lines', 'columnar')
+
+
+def _engine_reader(engine, file_path, fingerprint=False, **options):
+    """(reader, ingest) for a reader engine: ingest each item the reader yields."""
+    if engine == 'columnar':
+        return ColumnReader(file_path, fingerprint=fingerprint, **options), IngestColumns
+    return RecordReader(file_path, **options), IngestRecord
+
+
+def LoadData(file_path="hw.txt", progress=None, workers=1, cache=False, complete_lines=False,
+             cancel=None, engine='lines'):
+    """Read hw.txt into the lookup and relational tables without any GUI.
+
+    progress, if given, is called as progress(bytes_read, total_bytes); see RecordReader.
+    workers > 1 parses in a process pool; see ParallelLoadData. workers=0 is one per
+    CPU, or a single process with fewer than PARALLEL_MIN_WORKERS CPUs.
+    A gzip, bz2 or xz file is decompressed while it is read, in this process.
+    cache=True restores the tables from a matching snapshot instead of parsing, and
+    writes a new snapshot after parsing (only when starting from empty tables).
+    Returns a dict with 'lines', 'records', 'skipped' and 'bytes' counts, plus
+    'cached': True when the snapshot was used.
+    complete_lines=True leaves an unterminated last line unread (see RecordReader),
+    so a TailIngest attached at stats['bytes'] picks it up once it is finished.
+    cancel, a threading.Event, stops ingest between records once it is set; the tables
+    then hold the records read so far and stats has 'cancelled': True.
+    engine picks the single-process reader: 'lines' (RecordReader) or 'columnar'
+    (ColumnReader, ingesting a block of records at a time with IngestColumns, and
+    fingerprinting the file for the snapshot as it reads). Both build the same tables.
+    Raises FileNotFoundError / OSError if the file cannot be read.
+    """
+    if STATS is not None and progress is not None:
+        progress = STATS.timed('progress', progress)
+    fresh = len(LOGIN_TABLE) == 0 and len(Filter.objectsArray) == 0
+    if cache and fresh:
+        stats = LoadSnapshot(file_path)
+        if stats is not None:
+            if progress is not None:
+                progress(stats['bytes'], stats['bytes'])
+            return stats
+    fingerprint = None
+    workers = _load_workers(workers)
+    if workers != 1 and not _is_compressed(file_path):
+        stats = ParallelLoadData(file_path, workers=workers or None, progress=progress,
+                                 complete_lines=complete_lines, cancel=cancel)
+    else:
+        reader, ingest = _engine_reader(engine, file_path, fingerprint=cache and fresh, progress=progress,
+                                        complete_lines=complete_lines, cancel=cancel)
+        for item in reader:
+            ingest(item)
+        stats = reader.stats()
+        if reader.cancelled:
+            stats['cancelled'] = True
+        fingerprint = getattr(reader, 'fingerprint', None)
+    # a held-back partial line means the file is mid-write; don't cache that state
+    if (cache and fresh and not stats.get('cancelled')
+            and stats['bytes'] == os.path.getsize(file_path)):
+        try:
+            SaveSnapshot(file_path, stats, fingerprint=fingerprint)
+        except OSError:
+            pass  # a read-only input directory just means no cache
+    return stats
+
+
+#region Parallel Ingest
+
+# Filter id attribute -> lookup table that assigned it (_LAZY_IDS ids aren't stored)
+_FILTER_ID_LOOKUPS = (
+    ('user_id', 'USER_LOOKUP'),
+    ('pc_name_id', 'PCNAME_LOOKUP'),
+    ('brand_id', 'BRAND_LOOKUP'),
+    ('model_id', 'MODEL_LOOKUP'),
+    ('os_id', 'OS_LOOKUP'),
+    ('cpu_model_id', 'CPU_MODEL_LOOKUP'),
+    ('cpu_code_id', 'CPU_CODE_LOOKUP'),
+    ('cpu_code_for_model_id', 'CPU_CODE_FOR_MODEL_LOOKUP'),
+    ('device_type_id', 'DEVICE_LOOKUP'),
+)
+
+
+def _split_ranges(file_path, parts, size=None):
+    """Split the first `size` bytes of a file into up to `parts` line-aligned (start, end) ranges."""
+    if size is None:
+        size = os.path.getsize(file_path)
+    parts = max(1, min(parts, size // 65536 or 1))
+    bounds = [0]
+    with open(file_path, "rb") as f:
+        for i in range(1, parts):
+            pos = max(size * i // parts, bounds[-1])
+            if pos > 0:
+                f.seek(pos - 1)
+                f.readline()  # move to the start of the next line
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def _ingest_lines(raw_lines):
+    """Ingest raw (bytes) lines into fresh globals and return them with local ids.
+
+    The result is what _merge_chunk folds into the global tables; it is not
+    modified by the merge, so it can be merged again later (see BlockReload).
+    """
+    ResetData()
+    lines = records = size = 0
+    for raw in raw_lines:
+        size += len(raw)
+        lines += 1
+        record = _parse_line(raw.decode("utf-8"))
+        if record is not None:
+            IngestRecord(record)
+            records += 1
+    return {
+        'lines': lines,
+        'records': records,
+        'bytes': size,
+        'lookups': {name: lookup.values() for name, lookup in LOOKUP_TABLES.items()},
+        'tables': {
+            'MODEL_TABLE': list(MODEL_TABLE.values()),
+            'PROCESSOR_TABLE': list(PROCESSOR_TABLE.values()),
+            'PC_TABLE': list(PC_TABLE.values()),
+        },
+        'logins': [row[1:] for row in LOGIN_TABLE.rows()],
+        'latest': [obj.__getstate__() for obj in Filter.objectsArray],
+    }
+
+
+def _read_range(file_path, start, end):
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            raw = f.readline()
+            if not raw:
+                break
+            pos += len(raw)
+            yield raw
+
+
+def _ingest_chunk(file_path, start, end):
+    """Worker: ingest one byte range into fresh globals and return them with local ids."""
+    return _ingest_lines(_read_range(file_path, start, end))
+
+
+def _merge_chunk(result):
+    """Fold one chunk result into the global tables, translating local ids to global ids.
+
+    Chunks must be merged in file order: assigning each chunk's first-seen values
+    in order reproduces the ids (and the LookupView rows) a sequential run would
+    have given.
+    """
+    global _LOGIN_NEXT
+    remap = {}
+    for name, values in result['lookups'].items():
+        remap[name] = [None] + LOOKUP_TABLES[name].get_or_create_many(values)
+
+    def g(name, local_id):
+        return None if local_id is None else remap[name][local_id]
+
+    tables = result['tables']
+    # rows are copied rather than renumbered in place, so `result` stays reusable
+    for row in tables['MODEL_TABLE']:
+        gid = g('MODEL_LOOKUP', row['id'])
+        if gid not in MODEL_TABLE:
+            MODEL_TABLE[gid] = dict(row, id=gid, brand_id=g('BRAND_LOOKUP', row['brand_id']))
+    for row in tables['PROCESSOR_TABLE']:
+        # later rows overwrite earlier ones, as in IngestRecord
+        gid = g('CPU_CODE_LOOKUP', row['id'])
+        PROCESSOR_TABLE[gid] = dict(row, id=gid,
+                                    model_id=g('CPU_CODE_FOR_MODEL_LOOKUP', row['model_id']))
+    for row in tables['PC_TABLE']:
+        gid = g('PCNAME_LOOKUP', row['id'])
+        if gid not in PC_TABLE:
+            PC_TABLE[gid] = dict(row, id=gid,
+                                 device_id=g('DEVICE_LOOKUP', row['device_id']),
+                                 model_id=g('MODEL_LOOKUP', row['model_id']),
+                                 processor_id=g('CPU_CODE_LOOKUP', row['processor_id']),
+                                 os_id=g('OS_LOOKUP', row['os_id']))
+
+    pcs, users = remap['PCNAME_LOOKUP'], remap['USER_LOOKUP']
+    logins = result['logins']
+    LOGIN_TABLE.extend(_LOGIN_NEXT, [
+        (date, tm, None if pc_id is None else pcs[pc_id],
+         None if user_id is None else users[user_id], free)
+        for date, tm, pc_id, user_id, free in logins])
+    _LOGIN_NEXT += len(logins)
+
+    # latest entries travel as Filter state tuples; remap their id slots in place
+    id_slots = [(Filter.__slots__.index(attr), remap[lookup_name])
+                for attr, lookup_name in _FILTER_ID_LOOKUPS]
+    for state in result['latest']:
+        state = list(state)
+        for i, ids in id_slots:
+            if state[i] is not None:
+                state[i] = ids[state[i]]
+        obj = Filter.__new__(Filter)
+        obj.__setstate__(state)
+        Filter.register(obj)
+
+
+def _complete_size(file_path):
+    """Byte length of a file up to and including its last newline."""
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - 65536)
+            f.seek(start)
+            cut = f.read(pos - start).rfind(b"\n")
+            if cut >= 0:
+                return start + cut + 1
+            pos = start
+    return 0
+
+
+# Fewest CPUs at which a process pool clearly beats one process: the workers spend
+# about 1.5x the sequential time (parsing plus pickling) and the parent still merges
+# every chunk, so 2 CPUs only about break even (`python bench.py parallel`)
+PARALLEL_MIN_WORKERS = 3
+
+
+def _load_workers(workers):
+    """Processes for LoadData/LoadFiles: workers=0 is one per CPU, or 1 on fewer than PARALLEL_MIN_WORKERS."""
+    if workers == 0:
+        workers = os.cpu_count() or 1
+        if workers < PARALLEL_MIN_WORKERS:
+            return 1
+    return workers
+
+
+def ParallelLoadData(file_path="hw.txt", workers=None, progress=None, complete_lines=False,
+                     cancel=None):
+    """Parse hw.txt in a process pool and merge the chunks in file order.
+
+    Produces exactly the ids and tables of LoadData. workers defaults to
+    os.cpu_count(). progress(bytes_done, total_bytes) is called per merged chunk.
+    A set cancel event stops before the next merge and drops the pending chunks.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    total = _complete_size(file_path) if complete_lines else os.path.getsize(file_path)
+    # a few chunks per worker keeps the pool busy while the parent merges
+    ranges = _split_ranges(file_path, workers * 4, total)
+    stats = {'lines': 0, 'records': 0, 'skipped': 0, 'bytes': 0}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_lookup_policies,
+                             initargs=(LookupPolicies(),)) as pool:
+        futures = [pool.submit(_ingest_chunk, file_path, start, end) for start, end in ranges]
+        for fut in futures:
+            if cancel is not None and cancel.is_set():
+                stats['cancelled'] = True
+                for pending in futures:
+                    pending.cancel()
+                break
+            result = fut.result()
+            _merge_chunk(result)
+            for k in ('lines', 'records', 'bytes'):
+                stats[k] += result[k]
+            if progress is not None:
+                progress(stats['bytes'], total)
+    stats['skipped'] = stats['lines'] - stats['records']
+    return stats
+
+#endregion
+
+
+#region Multi-file Ingest
+
+def _read_input(file_path):
+    with open(file_path, "rb") as raw_file, _open_input(raw_file) as f:
+        yield from f
+
+
+def _ingest_file(file_path):
+    """Worker: ingest one whole (possibly compressed) file into fresh globals, as _ingest_chunk."""
+    t0 = time.perf_counter()
+    result = _ingest_lines(_read_input(file_path))
+    result['seconds'] = time.perf_counter() - t0
+    return result
+
+
+def LoadFiles(inputs, progress=None, workers=1, cancel=None, engine='lines'):
+    """Read several hw.txt dumps into the lookup and relational tables.
+
+    inputs are files, glob patterns or directories (see InputFiles); gzip, bz2 and xz
+    files are decompressed as they are read. Files are merged in that order, so ids
+    are assigned as for the files concatenated, and Filter.objectsArray keeps the
+    latest login per (user, PC) across all of them. workers > 1 ingests that many
+    files at once in a process pool, one file per task; 0 is as in LoadData.
+    progress(bytes_done, total_bytes) counts the files' sizes on disk. cancel, a
+    threading.Event, stops between files (between records with workers=1). engine
+    is the reader of the workers=1 path, as in LoadData.
+    Returns LoadData's totals plus 'files': [{'path', 'lines', 'records', 'skipped',
+    'bytes', 'seconds'}] in input order (only the files read before a cancel).
+    Raises FileNotFoundError / OSError if an input cannot be read.
+    """
+    files = InputFiles(inputs)
+    workers = _load_workers(workers)
+    sizes = [os.path.getsize(p) for p in files]
+    total = sum(sizes)
+    stats = {'lines': 0, 'records': 0, 'skipped': 0, 'bytes': 0, 'files': []}
+
+    def add(file_path, file_stats, seconds):
+        entry = {'path': file_path}
+        for k in ('lines', 'records', 'skipped', 'bytes'):
+            stats[k] += file_stats[k]
+            entry[k] = file_stats[k]
+        entry['seconds'] = round(seconds, 6)
+        stats['files'].append(entry)
+
+    done = 0
+    if workers == 1 or len(files) == 1:
+        for file_path, size in zip(files, sizes):
+            file_progress = None
+            if progress is not None:
+                file_progress = lambda n, _total, done=done: progress(done + n, total)
+            t0 = time.perf_counter()
+            reader, ingest = _engine_reader(engine, file_path, progress=file_progress, cancel=cancel)
+            for item in reader:
+                ingest(item)
+            add(file_path, reader.stats(), time.perf_counter() - t0)
+            if reader.cancelled:
+                stats['cancelled'] = True
+                break
+            done += size
+        return stats
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(files)),
+                             initializer=_set_lookup_policies, initargs=(LookupPolicies(),)) as pool:
+        futures = [pool.submit(_ingest_file, p) for p in files]
+        for file_path, size, fut in zip(files, sizes, futures):
+            if cancel is not None and cancel.is_set():
+                stats['cancelled'] = True
+                for pending in futures:
+                    pending.cancel()
+                break
+            result = fut.result()
+            _merge_chunk(result)
+            add(file_path, dict(result, skipped=result['lines'] - result['records']), result['seconds'])
+            done += size
+            if progress is not None:
+                progress(done, total)
+    return stats
+
+#endregion
+
+
+#region Snapshot Cache
+
+# Bump whenever the layout of the pickled tables changes; older snapshots are then ignored
+SNAPSHOT_VERSION = 3
+
+
+def SnapshotPath(file_path):
+    return file_path + '.snapshot'
+
+
+def _fingerprint(file_path):
+    """Identity of an input file: absolute path, size, mtime and a content hash."""
+    st = os.stat(file_path)
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return {'path': os.path.abspath(file_path), 'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns, 'hash': h.hexdigest()}
+
+
+def _state():
+    """Everything LoadData builds, as one picklable dict."""
+    return {
+        'lookups': {name: (lookup._map, lookup._values) for name, lookup in LOOKUP_TABLES.items()},
+        'tables': {'PC_TABLE': PC_TABLE, 'MODEL_TABLE': MODEL_TABLE, 'PROCESSOR_TABLE': PROCESSOR_TABLE},
+        'login': LOGIN_TABLE.__getstate__(),
+        'login_next': _LOGIN_NEXT,
+        # plain tuples, so the snapshot doesn't depend on the module name (__main__ vs main)
+        'latest': [(key, obj.__getstate__()) for key, obj in Filter.objectsArray._items.items()],
+    }
+
+
+def _restore_state(state):
+    """Replace the module state with a _state() dict, in place (other modules keep their references)."""
+    global _LOGIN_NEXT
+    ResetData()
+    for name, (mapping, values) in state['lookups'].items():
+        lookup = LOOKUP_TABLES[name]
+        lookup._map, lookup._values = mapping, values
+    for name, rows in state['tables'].items():
+        globals()[name].update(rows)
+    LOGIN_TABLE.__setstate__(state['login'])
+    _LOGIN_NEXT = state['login_next']
+    items = Filter.objectsArray._items
+    for key, obj_state in state['latest']:
+        obj = Filter.__new__(Filter)
+        obj.__setstate__(obj_state)
+        items[key] = obj
+
+
+# Classes a snapshot may contain: everything else in it is a builtin container or value
+_SNAPSHOT_CLASSES = {
+    'builtins': frozenset(('set', 'frozenset', 'bytearray', 'complex', 'range', 'slice')),
+    'datetime': frozenset(('date', 'time', 'datetime', 'timedelta', 'timezone')),
+    'array': frozenset(('array', '_array_reconstructor')),
+}
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that only loads _SNAPSHOT_CLASSES. The snapshot sits next to the input,
+    possibly on a shared drive, so it must not be able to import or call anything else."""
+    def find_class(self, module, name):
+        if name in _SNAPSHOT_CLASSES.get(module, ()):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a snapshot")
+
+
+def SaveSnapshot(file_path, stats, cache_path=None, fingerprint=None):
+    """Write the current tables to a binary snapshot keyed on file_path's fingerprint
+    (fingerprint, when the caller already has it, saves hashing the file again)."""
+    cache_path = cache_path or SnapshotPath(file_path)
+    header = {'version': SNAPSHOT_VERSION, 'fingerprint': fingerprint or _fingerprint(file_path), 'stats': stats,
+              'policies': LookupPolicies()}
+    tmp = cache_path + '.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_path)  # never leave a half-written snapshot behind
+
+
+def LoadSnapshot(file_path, cache_path=None):
+    """Restore the tables from a snapshot if it matches file_path exactly.
+
+    Returns the stats of the original load (with 'cached': True), or None when there
+    is no usable snapshot (missing, other version, file changed, unreadable).
+    """
+    cache_path = cache_path or SnapshotPath(file_path)
+    try:
+        with open(cache_path, 'rb') as f:
+            header = _SnapshotUnpickler(f).load()
+            if header.get('version') != SNAPSHOT_VERSION or header.get('policies') != LookupPolicies():
+                return None
+            st = os.stat(file_path)
+            fp = header['fingerprint']
+            # cheap checks first; only hash the file when size and mtime already match
+            if (fp['path'] != os.path.abspath(file_path) or fp['size'] != st.st_size
+                    or fp['mtime_ns'] != st.st_mtime_ns or fp != _fingerprint(file_path)):
+                return None
+            state = _SnapshotUnpickler(f).load()
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # corrupt, incompatible or disallowed snapshot: fall back to parsing
+        return None
+    try:
+        _restore_state(state)
+    except Exception:
+        ResetData()  # not a state _state() wrote: don't keep half of it
+        return None
+    return dict(header['stats'], cached=True)
+
+#endregion
+
+
+#region Incremental Ingest
+
+def _ingest_aside(raw_lines):
+    """_ingest_lines without losing the loaded tables: they are set aside while it
+    runs in the emptied globals and put back afterwards."""
+    global _LOGIN_NEXT
+    lookups = [(lookup, lookup._map, lookup._values, lookup._raw) for lookup in LOOKUP_TABLES.values()]
+    tables = [(table, dict(table)) for table in (PC_TABLE, MODEL_TABLE, PROCESSOR_TABLE)]
+    login, login_next = dict(LOGIN_TABLE.__dict__), _LOGIN_NEXT
+    store = Filter.objectsArray
+    latest, store._items = store._items, {}
+    layouts = (_LOGIN_DATE.layout, _INSTALL_DATE.layout)
+    try:
+        return _ingest_lines(raw_lines)
+    finally:
+        for lookup, mapping, values, raw in lookups:
+            lookup._map, lookup._values, lookup._raw = mapping, values, raw
+        for table, rows in tables:
+            table.clear()
+            table.update(rows)
+        LOGIN_TABLE.__dict__.update(login)
+        _LOGIN_NEXT = login_next
+        store._items, store._list = latest, None
+        _LOGIN_DATE.layout, _INSTALL_DATE.layout = layouts
+
+
+class BlockReload:
+    """Reload a regenerated hw.txt, re-parsing only the blocks whose content changed.
+
+    The file is cut into blocks of lines at content-defined boundaries (after a line
+    whose crc32 has its low bits zero, about avg_lines lines per block), so an edited,
+    inserted or removed line changes only the block around it instead of shifting
+    every later block. Each block is keyed by its blake2b digest and ingested on its
+    own, as in ParallelLoadData. A reload re-parses the blocks with new digests and
+    merges all block results in file order with _merge_chunk, which assigns ids in
+    first-seen order: the tables, ids and Filter.objectsArray match a full LoadData.
+
+    The first load parses every block. Block results are kept in memory between
+    reloads (about as much again as the loaded tables). extend() adds the blocks of
+    lines appended after a load, so the next load only re-parses what changed since.
+    """
+    def __init__(self, avg_lines=1024):
+        self.mask = max(1, avg_lines) - 1
+        self.min_lines = max(1, avg_lines // 4)
+        self.max_lines = max(1, avg_lines * 4)
+        self._blocks = {}  # digest -> _ingest_lines result
+        self._policies = None  # LookupPolicies() the block results were made with
+        self._tail = None  # (start offset, digest) of the file's last block
+
+    def _split(self, f, limit):
+        """Yield lists of raw lines, cut at content-defined boundaries."""
+        mask, min_lines, max_lines = self.mask, self.min_lines, self.max_lines
+        block = []
+        pos = 0
+        for raw in f:
+            if pos + len(raw) > limit:
+                break
+            pos += len(raw)
+            block.append(raw)
+            n = len(block)
+            if n >= max_lines or (n >= min_lines and zlib.crc32(raw) & mask == 0):
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def load(self, file_path="hw.txt", progress=None, complete_lines=False):
+        """Replace the tables with the contents of file_path.
+
+        Returns LoadData's stats plus 'blocks' (total) and 'reparsed' (blocks whose
+        content was not seen in the previous load). complete_lines as in LoadData.
+        """
+        total = _complete_size(file_path) if complete_lines else os.path.getsize(file_path)
+        if self._policies != LookupPolicies():
+            self._blocks = {}  # eager lookups' values are part of each result
+            self._policies = LookupPolicies()
+        results = []
+        blocks = {}
+        reparsed = 0
+        tail = None
+        try:
+            with open(file_path, "rb") as f:
+                pos = 0
+                for block in self._split(f, total):
+                    digest = hashlib.blake2b(b"".join(block), digest_size=16).digest()
+                    result = blocks.get(digest) or self._blocks.get(digest)
+                    if result is None:
+                        result = _ingest_lines(block)
+                        reparsed += 1
+                    blocks[digest] = result
+                    results.append(result)
+                    tail = (pos, digest)
+                    pos += result['bytes']
+        except BaseException:
+            ResetData()  # don't leave a single block's local tables behind
+            raise
+        # blocks no longer in the file are dropped
+        self._blocks = blocks
+        self._tail = tail
+
+        ResetData()
+        stats = {'lines': 0, 'records': 0, 'skipped': 0, 'bytes': 0}
+        for result in results:
+            _merge_chunk(result)
+            for k in ('lines', 'records', 'bytes'):
+                stats[k] += result[k]
+            if progress is not None:
+                progress(stats['bytes'], total)
+        stats['skipped'] = stats['lines'] - stats['records']
+        stats['blocks'] = len(results)
+        stats['reparsed'] = reparsed
+        return stats
+
+    def extend(self, file_path, end):
+        """Add the blocks of lines appended since the last load, up to byte end.
+
+        The file's last block is split again together with the new lines, exactly as
+        a load would split them, and the blocks not cached yet are parsed aside (the
+        loaded tables are not changed). Does nothing before the first load.
+        """
+        if self._tail is None or self._policies != LookupPolicies():
+            return
+        start, digest = self._tail
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            blocks = list(self._split(f, end - start))
+        self._blocks.pop(digest, None)  # the old last block, unless the split gives it back
+        pos = start
+        for block in blocks:
+            digest = hashlib.blake2b(b"".join(block), digest_size=16).digest()
+            if digest not in self._blocks:
+                self._blocks[digest] = _ingest_aside(block)
+            self._tail = (pos, digest)
+            pos += sum(map(len, block))
+
+    def clear(self):
+        self._blocks = {}
+        self._tail = None
+
+
+class TailIngest:
+    """Follow an append-only hw.txt: ingest only the lines added since the last poll.
+
+    Remembers the byte offset after the last complete line, a digest of samples of
+    everything before it and the file identity. A poll that finds the file replaced
+    (new inode), shorter than the offset, or with different sampled bytes before the
+    offset reloads it through a BlockReload, so a regenerated file only re-parses the
+    blocks that changed. Appended lines go into the BlockReload's cached blocks too,
+    so its next reload compares against the file as it is now. The samples (see
+    _sample_digest) are only read back when the file's size, mtime or ctime moved
+    since they were last checked, so an idle poll reads nothing and an append reads
+    at most SAMPLES + 2 windows of SAMPLE_BYTES besides the new lines, however large
+    the file. An in-place edit outside the samples is not noticed by a poll; reload()
+    compares every block. An unterminated trailing line is left for the next poll,
+    so a half-written line is never ingested. Ids of existing rows never change on
+    an append.
+    """
+    # A stat signature is only trusted once its mtime is this much older than the check
+    # (coarse mtimes, as on FAT or SMB, can't show a second write within the same tick)
+    RACY_NS = 2 * 10**9
+    # The prefix check reads the first and last SAMPLE_BYTES before the offset (so the
+    # last ingested line) and SAMPLES windows spread evenly in between
+    SAMPLE_BYTES = 1 << 16
+    SAMPLES = 8
+
+    def __init__(self, file_path="hw.txt"):
+        self.file_path = file_path
+        self.offset = 0
+        self._digest = None  # _sample_digest() of the bytes before offset
+        self._identity = None
+        self._checked = None  # (size, mtime_ns, ctime_ns) when the samples last matched
+        self.blocks = BlockReload()
+
+    @staticmethod
+    def _identity_of(st):
+        return (st.st_dev, st.st_ino)
+
+    def _sample_windows(self):
+        """(start, length) of the windows _sample_digest reads: all of a short prefix."""
+        size, end = self.SAMPLE_BYTES, self.offset
+        if end <= size * (self.SAMPLES + 2):
+            return [(0, end)]
+        step = (end - 2 * size) // (self.SAMPLES + 1)
+        return ([(0, size)] + [(size + step * (i + 1) - size // 2, size) for i in range(self.SAMPLES)]
+                + [(end - size, size)])
+
+    def _sample_digest(self):
+        """Digest of the sampled windows of the file's first offset bytes, as read now."""
+        h = hashlib.blake2b(digest_size=16)
+        with open(self.file_path, 'rb') as f:
+            for start, length in self._sample_windows():
+                f.seek(start)
+                h.update(f.read(length))
+        return h.digest()
+
+    def _checked_now(self, st):
+        """Remember st as matching the prefix, unless its mtime is too recent to trust."""
+        if time.time_ns() - st.st_mtime_ns >= self.RACY_NS:
+            self._checked = (st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+        else:
+            self._checked = None
+
+    def attach(self, bytes_read):
+        """Start following after a load (LoadData / snapshot) that consumed bytes_read bytes."""
+        st = os.stat(self.file_path)
+        self._identity = self._identity_of(st)
+        self.offset = min(bytes_read, st.st_size)
+        self._digest = self._sample_digest()
+        self._checked_now(st)
+
+    def _unchanged(self, st):
+        """Whether the file still starts with the bytes ingested so far, as far as the samples show."""
+        if self._identity is not None and self._identity_of(st) != self._identity:
+            return False  # rotated: a different file now has this name
+        if st.st_size < self.offset:
+            return False  # truncated
+        if self._checked == (st.st_size, st.st_mtime_ns, st.st_ctime_ns):
+            return True  # untouched since the samples last matched
+        if self._sample_digest() != self._digest:
+            return False  # rewritten in place
+        self._checked_now(st)
+        return True
+
+    def reload(self):
+        """Reload the file through the BlockReload, whatever changed or the samples show.
+        Returns its stats."""
+        stats = self.blocks.load(self.file_path, complete_lines=True)
+        self.attach(stats['bytes'])
+        return stats
+
+    def poll(self):
+        """Ingest whatever was appended. Returns a stats dict; 'reloaded' is True after a full reload.
+
+        Raises FileNotFoundError if the file disappeared (e.g. mid-rotation); retry later.
+        """
+        st = os.stat(self.file_path)
+        lines = records = 0
+        reloaded = not self._unchanged(st)
+        if reloaded:
+            stats = self.reload()
+            lines, records = stats['lines'], stats['records']
+            st = os.stat(self.file_path)
+        self._identity = self._identity_of(st)
+        if st.st_size > self.offset:
+            with open(self.file_path, 'rb') as f:
+                f.seek(self.offset)
+                pos = self.offset
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break  # partial line: wait for the writer to finish it
+                    lines += 1
+                    record = _parse_line(raw.decode('utf-8'))
+                    if record is not None:
+                        IngestRecord(record)
+                        records += 1
+                    pos += len(raw)
+                if pos > self.offset:
+                    self.blocks.extend(self.file_path, pos)
+                    self.offset = pos
+                    self._digest = self._sample_digest()
+            if pos == st.st_size:
+                self._checked_now(st)
+            else:
+                self._checked = None  # more was written than st shows (or a partial line)
+        return {'lines': lines, 'records': records, 'skipped': lines - records,
+                'offset': self.offset, 'reloaded': reloaded}
+
+#endregion
+
+
+def DisplayRows():
+    """(login date, user, PC name) of every latest login, as the GUI lists them."""
+    return [(t.login_date.isoformat(), t.user, t.pc_name) for t in Filter.objectsArray]
+
+
+class BackgroundJob:
+    """Base for work done in a worker thread that reports to the GUI through self.queue.
+
+    Subclasses implement _run, which puts messages (tuples starting with a tag) on
+    self.queue and checks self._cancel. The GUI drains the queue with root.after;
+    Tk itself is only touched from its own thread.
+    """
+    def __init__(self):
+        self.queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class BackgroundLoad(BackgroundJob):
+    """LoadData (LoadFiles for several inputs) in a worker thread, reporting to the GUI through a queue.
+
+    Until it finishes, the worker is the only thread that touches the tables. It puts
+    ('progress', bytes_read, total_bytes) messages on self.queue, ('rows', DisplayRows())
+    at most every rows_interval seconds, and finally ('done', stats) or ('error', exception).
+    With db_path, a complete load is also written to that SQLite store (SaveDatabase).
+    cancel() stops ingest between records (see LoadData); stats then has 'cancelled': True.
+    file_path may also be a list of inputs (see InputFiles). tail_path is then set to
+    the input a TailIngest can follow: the file read, if it was a single plain file.
+    """
+    def __init__(self, file_path="hw.txt", db_path=None, rows_interval=0.5):
+        super().__init__()
+        self.file_path = file_path
+        self.db_path = db_path
+        self.rows_interval = rows_interval
+        self.tail_path = None
+
+    def _run(self):
+        next_rows = time.monotonic() + self.rows_interval
+
+        def on_progress(done, total):
+            nonlocal next_rows
+            self.queue.put(('progress', done, total))
+            now = time.monotonic()
+            if now >= next_rows:
+                next_rows = now + self.rows_interval
+                self.queue.put(('rows', DisplayRows()))
+
+        try:
+            files = InputFiles(self.file_path)
+            if len(files) > 1:
+                stats = LoadFiles(files, progress=on_progress, cancel=self._cancel)
+                if self.db_path and not stats.get('cancelled'):
+                    SaveDatabase(self.db_path)
+            else:
+                stats = LoadData(files[0], progress=on_progress, cache=True, complete_lines=True,
+                                 cancel=self._cancel)
+                if self.db_path and not stats.get('cancelled'):
+                    SaveDatabase(self.db_path, files[0], stats)
+                if not _is_compressed(files[0]):
+                    self.tail_path = files[0]
+            self.queue.put(('rows', DisplayRows()))
+            self.queue.put(('done', stats))
+        except Exception as e:
+            self.queue.put(('error', e))
+
+
+class BackgroundFollow(BackgroundJob):
+    """TailIngest.poll() (reload() with reload=True) in a worker thread, for the GUI.
+
+    While it runs the worker is the only thread that touches the tables. It puts
+    ('rows', DisplayRows()) when rows were added or reloaded, then ('done', result)
+    or ('error', exception). A poll or reload can't be stopped part way, so cancel()
+    only lets the GUI close once it is done.
+    """
+    def __init__(self, follower, reload=False):
+        super().__init__()
+        self.follower = follower
+        self.reload = reload
+
+    def _run(self):
+        try:
+            if self.reload:
+                result = self.follower.reload()
+            else:
+                result = self.follower.poll()
+            if self.reload or result['records'] or result['reloaded']:
+                self.queue.put(('rows', DisplayRows()))
+            self.queue.put(('done', result))
+        except Exception as e:
+            self.queue.put(('error', e))
+
+
+def DataFilter(d) -> list[Filter]:
+    filtered = [f for f in Filter.objectsArray if f.login_date == d]
     return filtered
 
-def Extractor(d):
-    filtered_by_date = DataFilter(d)
-    # TODO: Implement the extraction to Excel tables logic here
+def parse_date_range(s):
+    """Parse 'FROM..TO' into (date_from, date_to); each end is YYYY-MM, YYYY-MM-DD or empty.
+
+    A YYYY-MM start means the first day of the month, a YYYY-MM end the last day.
+    Raises ValueError on malformed input.
+    """
+    start, sep, end = s.strip().partition('..')
+    if not sep:
+        raise ValueError(f"invalid date range {s!r} (expected FROM..TO)")
+
+    def bound(x, is_end):
+        x = x.strip()
+        if not x:
+            return None
+        if re.match(r"^\d{4}-\d{2}$", x):
+            y, m = int(x[:4]), int(x[5:])
+            if not 1 <= m <= 12:
+                raise ValueError(f"invalid month {x!r} in range {s!r}")
+            if is_end:
+                return _month_end(y, m)
+            return datetime.date(y, m, 1)
+        if re.match(r"^\d{4}-\d{2}-\d{2}$", x):
+            try:
+                return datetime.date.fromisoformat(x)
+            except ValueError:
+                pass
+        raise ValueError(f"invalid date {x!r} in range {s!r}")
+
+    date_from, date_to = bound(start, False), bound(end, True)
+    if date_from and date_to and date_from > date_to:
+        raise ValueError(f"empty date range {s!r}")
+    return date_from, date_to
+
+
+def _parse_filter_date(x):
+    """A period d as a 'YYYY-MM' string, a date, or None when it is neither."""
+    if x is None:
+        return None
+    if isinstance(x, datetime.date):
+        return x
+    if isinstance(x, str):
+        x = x.strip()
+        # year-month
+        if re.match(r"^\d{4}-\d{2}$", x):
+            return x
+        try:
+            return Filter._parse_date(x)
+        except Exception:
+            return x
+    return None
+
+
+def SelectLoginPositions(d=None, date_from=None, date_to=None):
+    """LOGIN_TABLE positions (ascending, i.e. id order) for a period; None means every row.
+
+    d may be None (all), a 'YYYY-MM' string, a date or a date string; date_from/date_to
+    (dates, inclusive, either may be None) select a range instead. Uses the LOGIN_TABLE
+    date index, so a period costs a bisect plus the size of the result.
+    """
+    def other(match):
+        # rows whose date isn't a datetime.date are not in the index
+        return [pos for pos, value in LOGIN_TABLE.other_dates() if value is not None and match(value)]
+
+    if date_from is not None or date_to is not None:
+        positions = LOGIN_TABLE.select_range(date_from, date_to)
+    elif d is None or str(d).strip() == "":
+        return None
+    else:
+        dval = _parse_filter_date(d)
+        if isinstance(dval, str):
+            # year-month filter
+            positions = LOGIN_TABLE.select_month(int(dval[:4]), int(dval[5:7]))
+            positions += other(lambda v: getattr(v, 'isoformat', lambda: str(v))()[:7] == dval)
+        elif isinstance(dval, datetime.date):
+            positions = LOGIN_TABLE.select_day(dval)
+            positions += other(lambda v: v == dval)
+        else:
+            # fallback: match string prefix
+            sval = str(d)
+            return array('q', (pos for pos, r in enumerate(LOGIN_TABLE.rows()) if r[1] and str(r[1]).startswith(sval)))
+        positions.sort()
+    return array('q', positions)
+
+
+def SelectLogins(d=None, date_from=None, date_to=None):
+    """Login row tuples (id, date, time, pc_id, user_id, free_disk_space) for a period, in id order."""
+    return list(LOGIN_TABLE.rows(SelectLoginPositions(d, date_from, date_to)))
+
+
+def SplitLoginPositions(periods):
+    """SelectLoginPositions and the referenced user and PC ids of several periods at once.
+
+    periods are (d, date_from, date_to) triples as ExportData takes them. Day, month
+    and range periods are split out of LOGIN_TABLE in a single pass, so the cost grows
+    with the table rather than with the table times the number of periods.
+    Returns [(positions, user_ids, pc_ids)] in the order given; positions is None for 'all'.
+    """
+    results = [None] * len(periods)
+    ranges, slots = [], []
+    for i, (d, date_from, date_to) in enumerate(periods):
+        if date_from is not None or date_to is not None:
+            # the date index holds no overflow dates, so neither does a range
+            ranges.append((1 if date_from is None else date_from.toordinal(),
+                           datetime.date.max.toordinal() if date_to is None else date_to.toordinal(), None))
+        elif d is None or str(d).strip() == "":
+            results[i] = (None, LOGIN_TABLE.id_set('user_id'), LOGIN_TABLE.id_set('pc_id'))
+            continue
+        else:
+            dval = _parse_filter_date(d)
+            if isinstance(dval, str):
+                year, month = int(dval[:4]), int(dval[5:7])
+                first = datetime.date(year, month, 1)
+                ranges.append((first.toordinal(), _month_end(year, month).toordinal(),
+                               lambda v, dval=dval: getattr(v, 'isoformat', lambda: str(v))()[:7] == dval))
+            elif isinstance(dval, datetime.date):
+                ranges.append((dval.toordinal(), dval.toordinal(), lambda v, dval=dval: v == dval))
+            else:
+                positions = SelectLoginPositions(d)
+                results[i] = (positions, LOGIN_TABLE.id_set('user_id', positions),
+                              LOGIN_TABLE.id_set('pc_id', positions))
+                continue
+        slots.append(i)
+    if ranges:
+        for i, result in zip(slots, LOGIN_TABLE.partition(ranges)):
+            results[i] = result
+    return results
+
+
+def _referenced_ids(user_ids, pc_ids):
+    """Ids of every dimension row referenced by a set of logins' users and PCs."""
+    # Collect additional referenced ids from PCs
+    brand_ids = set()
+    model_ids = set()
+    os_ids = set()
+    device_ids = set()
+    processor_ids = set()
+    processor_model_ids = set()
+
+    for pid in pc_ids:
+        pc = PC_TABLE.get(pid)
+        if not pc:
+            continue
+        if pc.get('brand_id'):
+            brand_ids.add(pc.get('brand_id'))
+        if pc.get('model_id'):
+            model_ids.add(pc.get('model_id'))
+        if pc.get('os_id'):
+            os_ids.add(pc.get('os_id'))
+        if pc.get('device_id'):
+            device_ids.add(pc.get('device_id'))
+        if pc.get('processor_id'):
+            processor_ids.add(pc.get('processor_id'))
+        if pc.get('processor_id'):
+            # processor -> model
+            proc = PROCESSOR_TABLE.get(pc.get('processor_id'))
+            if proc and proc.get('model_id'):
+                processor_model_ids.add(proc.get('model_id'))
+
+    # Also include models' brands
+    for mid in list(model_ids):
+        m = MODEL_TABLE.get(mid)
+        if m and m.get('brand_id'):
+            brand_ids.add(m.get('brand_id'))
+
+    return {
+        'user': user_ids, 'pc': pc_ids, 'brand': brand_ids, 'model': model_ids, 'os': os_ids,
+        'device': device_ids, 'processor': processor_ids, 'processor_model': processor_model_ids,
+    }
+
+
+def _period_name(d, date_from=None, date_to=None):
+    """The <period> part of hw_relational_<period>.xlsx."""
+    dstr = ''
+    if date_from is not None or date_to is not None:
+        dstr = f"{date_from.isoformat() if date_from else 'start'}_{date_to.isoformat() if date_to else 'end'}"
+    elif d is None or str(d).strip() == '':
+        dstr = 'all'
+    else:
+        try:
+            if isinstance(d, str) and re.match(r"^\d{4}-\d{2}$", d):
+                dstr = d
+            else:
+                dp = Filter._parse_date(d)
+                dstr = dp.isoformat() if dp else str(d)
+        except Exception:
+            dstr = str(d)
+    return dstr
+
+
+# Number formats openpyxl assigns to date/time values by default
+_CELL_FORMATS = {
+    datetime.date: 'yyyy-mm-dd',
+    datetime.time: 'h:mm:ss',
+    datetime.datetime: 'yyyy-mm-dd h:mm:ss',
+}
+
+
+class ExportCancelled(Exception):
+    """An export stopped because its cancel event was set; no output file was written."""
+
+
+def _discard_workbook(wb):
+    """Remove the temp files of an unsaved write-only workbook (openpyxl only does so at exit)."""
+    for ws in wb.worksheets:
+        writer = getattr(ws, '_writer', None)
+        if writer is None:
+            continue
+        try:
+            ws.close()
+            writer.cleanup()
+        except Exception:
+            pass  # left to openpyxl's exit handler
+
+
+def _write_sheets(output_file, sheets, progress=None, cancel=None):
+    """Write [(name, headers, rows), ...] to xlsx with openpyxl's write-only mode.
+
+    rows may be any iterable of lists (generators are streamed). Date/time values go
+    through one reusable WriteOnlyCell per (column, type), so the number format is
+    resolved once per column instead of once per cell; reusing a cell is safe because
+    the write-only writer serializes each cell as the row is appended.
+    The workbook is saved as output_file + '.part' and renamed when complete, so a
+    failed or cancelled export leaves no partial file (and keeps an older export).
+    progress(sheet_index, sheet_count, name, rows_written) is called as each sheet
+    starts, every 1000 rows and as it ends; name is None while the file is saved.
+    A set cancel event raises ExportCancelled at the next 1000 rows.
+    Returns a dict of sheet name -> data rows written.
+    """
+    sheets = list(sheets)
+    checking = progress is not None or cancel is not None
+    wb = Workbook(write_only=True)
+    part_file = output_file + '.part'
+    try:
+        row_counts = {}
+        for index, (name, headers, rows) in enumerate(sheets):
+            if progress is not None:
+                progress(index, len(sheets), name, 0)
+            ws = wb.create_sheet(title=name[:31])
+            ws.append(headers)
+            cells = {}
+            count = 0
+            for row in rows:
+                for col, value in enumerate(row):
+                    fmt = _CELL_FORMATS.get(type(value))
+                    if fmt is not None:
+                        cell = cells.get((col, type(value)))
+                        if cell is None:
+                            cell = cells[(col, type(value))] = WriteOnlyCell(ws)
+                            cell.number_format = fmt
+                        cell.value = value
+                        row[col] = cell
+                ws.append(row)
+                count += 1
+                if checking and count % 1000 == 0:
+                    if cancel is not None and cancel.is_set():
+                        raise ExportCancelled(output_file)
+                    if progress is not None:
+                        progress(index, len(sheets), name, count)
+            row_counts[name] = count
+            if progress is not None:
+                progress(index, len(sheets), name, count)
+        if progress is not None:
+            progress(len(sheets), len(sheets), None, 0)
+        wb.save(part_file)
+        os.replace(part_file, output_file)
+    except BaseException:
+        _discard_workbook(wb)
+        try:
+            os.remove(part_file)
+        except OSError:
+            pass
+        raise
+    return row_counts
+
+
+# Sheet names and header rows of an export, in workbook order
+_SHEET_HEADERS = (
+    ('Login', ['ID', 'Date', 'Time', 'PC_ID', 'User_ID', 'FreeDiskSpace']),
+    ('User', ['ID', 'Name']),
+    ('Pc', ['ID', 'Name', 'DeviceID', 'ModelID', 'RAM', 'ProcessorID', 'OperationSystemID', 'OperationSystemInstallationDate', 'Disk', 'Note']),
+    ('Device', ['ID', 'Type']),
+    ('Model', ['ID', 'BrandID', 'Name']),
+    ('Brand', ['ID', 'Name']),
+    ('OperationSystem', ['ID', 'Name']),
+    ('ProcessorModel', ['ID', 'Name']),
+    ('Processor', ['ID', 'ProcessorCode', 'ProcessorModelID']),
+)
+
+
+def _sheet_rows(positions, ids):
+    """Sheets for one export: [(name, headers, rows)], Login rows as a generator over LOGIN_TABLE."""
+    # User sheet
+    user_rows = []
+    for uid in sorted(ids['user']):
+        u = USER_TABLE.get(uid)
+        if u:
+            user_rows.append([u.get('id'), u.get('name')])
+
+    # PC sheet
+    pc_rows = []
+    for pid in sorted(ids['pc']):
+        p = PC_TABLE.get(pid)
+        if not p:
+            continue
+        pc_rows.append([
+            p.get('id'), p.get('name'), p.get('device_id'), p.get('model_id'), p.get('ram_gb'),
+            p.get('processor_id'), p.get('os_id'), p.get('os_installation_date'),
+            p.get('disk'), p.get('note')
+        ])
+
+    # Model
+    model_rows = []
+    for mid in sorted(ids['model']):
+        m = MODEL_TABLE.get(mid)
+        if m:
+            model_rows.append([m.get('id'), m.get('brand_id'), m.get('name')])
+
+    rows = [
+        (list(r) for r in LOGIN_TABLE.rows(positions)),
+        user_rows,
+        pc_rows,
+        [[v.get('id'), v.get('type')] for k, v in DEVICE_TABLE.items() if k in ids['device']],
+        model_rows,
+        [[b.get('id'), b.get('name')] for k, b in BRAND_TABLE.items() if k in ids['brand']],
+        [[o.get('id'), o.get('name')] for k, o in OS_TABLE.items() if k in ids['os']],
+        [[m.get('id'), m.get('name')] for k, m in PROCESSOR_MODEL_TABLE.items() if k in ids['processor_model']],
+        [[p.get('id'), p.get('code'), p.get('model_id')] for k, p in PROCESSOR_TABLE.items() if k in ids['processor']],
+    ]
+    return [(name, headers, sheet) for (name, headers), sheet in zip(_SHEET_HEADERS, rows)]
+
+
+def WriteWorkbook(output_file, positions, ids, progress=None, cancel=None):
+    """Stream the Login rows at `positions` (None = all) and the referenced dimension rows to xlsx.
+
+    Login rows are generated from LOGIN_TABLE as they are written, so memory stays
+    flat however many logins are exported. Returns a dict of sheet name -> rows written.
+    progress and cancel are passed to _write_sheets.
+    """
+    return _write_sheets(output_file, _sheet_rows(positions, ids), progress, cancel)
+
+
+def ExportData(d, output_dir=None, date_from=None, date_to=None, progress=None, cancel=None):
+    """Write the relational tables for period d to hw_relational_<period>.xlsx.
+
+    d may be None (all), a 'YYYY-MM' string, a date or a date string; date_from/date_to
+    export an inclusive date range instead (hw_relational_<from>_<to>.xlsx).
+    Returns (output_file, rows) where rows maps sheet name -> data rows written.
+    progress and cancel are as in _write_sheets (ExportCancelled when cancelled).
+    Raises on failure; no GUI is involved.
+    """
+    positions = SelectLoginPositions(d, date_from, date_to)
+
+    # Collect referenced ids
+    ids = _referenced_ids(LOGIN_TABLE.id_set('user_id', positions), LOGIN_TABLE.id_set('pc_id', positions))
+
+    output_file = os.path.join(output_dir or os.getcwd(), f"hw_relational_{_period_name(d, date_from, date_to)}.xlsx")
+    row_counts = WriteWorkbook(output_file, positions, ids, progress, cancel)
+    return output_file, row_counts
+
+
+def _period_args(period):
+    """(d, date_from, date_to) for a period spec: None, 'YYYY-MM', a date or a (from, to) tuple."""
+    if isinstance(period, tuple):
+        return None, period[0], period[1]
+    return period, None, None
+
+
+# Tables an export reads besides LOGIN_TABLE: the name-only ones are lookup views
+_EXPORT_VIEWS = ('USER_TABLE', 'BRAND_TABLE', 'OS_TABLE', 'DEVICE_TABLE', 'PROCESSOR_MODEL_TABLE')
+_EXPORT_TABLES = ('PC_TABLE', 'MODEL_TABLE', 'PROCESSOR_TABLE')
+
+
+def _export_state():
+    """What WriteWorkbook reads, as one picklable dict: LOGIN_TABLE's columns and the dimension tables."""
+    return {
+        'views': {name: globals()[name].lookup._values for name in _EXPORT_VIEWS},
+        'tables': {name: globals()[name] for name in _EXPORT_TABLES},
+        'login': LOGIN_TABLE.__getstate__(),
+    }
+
+
+def _set_export_state(state):
+    """Export worker initializer: the parent's tables, received once per worker process."""
+    for name, values in state['views'].items():
+        globals()[name].lookup._values = values
+    for name, rows in state['tables'].items():
+        table = globals()[name]
+        if table is not rows:  # a forked worker already has them
+            table.clear()
+            table.update(rows)
+    LOGIN_TABLE.__setstate__(state['login'])
+
+
+def ExportPeriods(periods, output_dir=None, workers=1, progress=None, db_path=None):
+    """Export several periods (e.g. the last 24 months) in one batch.
+
+    All periods are split out of LOGIN_TABLE in a single pass that also collects their
+    referenced user and PC ids (SplitLoginPositions); the workbooks are then written in
+    `workers` processes (0 = one per CPU). Each worker receives the tables once, when it
+    starts, and each workbook job only its login positions and ids, so Login rows are
+    still streamed from the table as they are written.
+    progress(period, output_file, rows) is called as each workbook finishes.
+    With db_path each workbook is instead selected and written from the SQLite store
+    by its worker (see WriteDatabaseWorkbook); the in-memory tables are not used.
+    Returns [(period, output_file, rows)] in input order; a failed period has the
+    exception in place of rows.
+    """
+    args = [_period_args(period) for period in periods]
+    if db_path is not None:
+        selected = [(None, None)] * len(args)
+    else:
+        selected = [(positions, _referenced_ids(user_ids, pc_ids))
+                    for positions, user_ids, pc_ids in SplitLoginPositions(args)]
+    jobs = []
+    for period, (d, date_from, date_to), (positions, ids) in zip(periods, args, selected):
+        output_file = os.path.join(output_dir or os.getcwd(), f"hw_relational_{_period_name(d, date_from, date_to)}.xlsx")
+        jobs.append((period, output_file, positions, ids))
+
+    results = {}
+
+    def done(i, rows):
+        period, output_file = jobs[i][:2]
+        results[i] = (period, output_file, rows)
+        if progress is not None:
+            progress(period, output_file, rows)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        for i, (period, output_file, positions, ids) in enumerate(jobs):
+            try:
+                if db_path is not None:
+                    rows = WriteDatabaseWorkbook(db_path, output_file, *_period_args(period))
+                else:
+                    rows = WriteWorkbook(output_file, positions, ids)
+            except Exception as e:
+                rows = e
+            done(i, rows)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+        if db_path is not None:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_set_export_state,
+                                       initargs=(_export_state(),))
+        with pool:
+            pending = {}
+            for i, (period, output_file, positions, ids) in enumerate(jobs):
+                if db_path is not None:
+                    pending[pool.submit(WriteDatabaseWorkbook, db_path, output_file, *_period_args(period))] = i
+                else:
+                    pending[pool.submit(WriteWorkbook, output_file, positions, ids)] = i
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    done(pending.pop(fut), fut.exception() or fut.result())
+    return [results[i] for i in range(len(jobs))]
+
+
+class BackgroundExport(BackgroundJob):
+    """ExportData (or ExportDatabase with db_path) for one period in a worker thread.
+
+    Puts ('progress', sheet_index, sheet_count, sheet_name, rows_written) messages on
+    self.queue (see _write_sheets), then ('done', output_file, rows), ('cancelled',) or
+    ('error', exception). save_db=True first rewrites the SQLite store from memory.
+    The tables must not change while it runs. cancel() stops within 1000 rows and
+    leaves no output file.
+    """
+    def __init__(self, d, date_from=None, date_to=None, db_path=None, save_db=False, output_dir=None):
+        super().__init__()
+        self.period = (d, date_from, date_to)
+        self.db_path = db_path
+        self.save_db = save_db
+        self.output_dir = output_dir
+
+    def _run(self):
+        def on_progress(index, count, name, rows):
+            self.queue.put(('progress', index, count, name, rows))
+
+        d, date_from, date_to = self.period
+        try:
+            if self.db_path:
+                if self.save_db:
+                    SaveDatabase(self.db_path)
+                output_file, rows = ExportDatabase(self.db_path, d, self.output_dir, date_from, date_to,
+                                                   progress=on_progress, cancel=self._cancel)
+            else:
+                output_file, rows = ExportData(d, self.output_dir, date_from, date_to,
+                                               progress=on_progress, cancel=self._cancel)
+            self.queue.put(('done', output_file, rows))
+        except ExportCancelled:
+            self.queue.put(('cancelled',))
+        except Exception as e:
+            self.queue.put(('error', e))
+
+#endregion
+
+#region SQLite Store
+
+# Bump when the tables below change; an older database is then dropped and rebuilt
+DB_SCHEMA_VERSION = 1
+
+# Columns that can hold unparsed input (date, time, ram_gb, ...) are declared without a
+# type so SQLite keeps values as given: dates as day ordinals and times as seconds of the
+# day (integers, like the LOGIN_TABLE columns), anything the parser kept as text as text.
+_DB_TABLES = (
+    "CREATE TABLE IF NOT EXISTS Meta (key TEXT PRIMARY KEY, value)",
+    "CREATE TABLE IF NOT EXISTS User (id INTEGER PRIMARY KEY, name)",
+    "CREATE TABLE IF NOT EXISTS PC (id INTEGER PRIMARY KEY, name, device_id INTEGER, model_id INTEGER,"
+    " ram_gb, processor_id INTEGER, os_id INTEGER, os_installation_date, disk, note)",
+    "CREATE TABLE IF NOT EXISTS Device (id INTEGER PRIMARY KEY, type)",
+    "CREATE TABLE IF NOT EXISTS Brand (id INTEGER PRIMARY KEY, name)",
+    "CREATE TABLE IF NOT EXISTS Model (id INTEGER PRIMARY KEY, brand_id INTEGER, name)",
+    "CREATE TABLE IF NOT EXISTS OperatingSystem (id INTEGER PRIMARY KEY, name)",
+    "CREATE TABLE IF NOT EXISTS ProcessorModel (id INTEGER PRIMARY KEY, name)",
+    "CREATE TABLE IF NOT EXISTS Processor (id INTEGER PRIMARY KEY, code, model_id INTEGER)",
+    "CREATE TABLE IF NOT EXISTS Login (id INTEGER PRIMARY KEY, date, time, pc_id INTEGER,"
+    " user_id INTEGER, free_disk_space)",
+)
+_DB_INDEXES = (
+    ("login_date", "CREATE INDEX IF NOT EXISTS login_date ON Login(date)"),
+    ("login_pc", "CREATE INDEX IF NOT EXISTS login_pc ON Login(pc_id)"),
+    ("login_user", "CREATE INDEX IF NOT EXISTS login_user ON Login(user_id)"),
+)
+
+# SQLite table -> (in-memory table, columns)
+_DB_DIMENSIONS = (
+    ('User', USER_TABLE, ('id', 'name')),
+    ('PC', PC_TABLE, ('id', 'name', 'device_id', 'model_id', 'ram_gb', 'processor_id', 'os_id',
+                      'os_installation_date', 'disk', 'note')),
+    ('Device', DEVICE_TABLE, ('id', 'type')),
+    ('Brand', BRAND_TABLE, ('id', 'name')),
+    ('Model', MODEL_TABLE, ('id', 'brand_id', 'name')),
+    ('OperatingSystem', OS_TABLE, ('id', 'name')),
+    ('ProcessorModel', PROCESSOR_MODEL_TABLE, ('id', 'name')),
+    ('Processor', PROCESSOR_TABLE, ('id', 'code', 'model_id')),
+)
+
+_DB_STATS = ('lines', 'records', 'skipped', 'bytes')
+
+
+def _db_encode(value):
+    t = type(value)
+    if t is datetime.date:
+        return value.toordinal()
+    if t is datetime.time:
+        if not value.microsecond and value.tzinfo is None:
+            return value.hour * 3600 + value.minute * 60 + value.second
+        return value.isoformat()
+    return value
+
+
+def _db_date(value):
+    return datetime.date.fromordinal(value) if type(value) is int else value
+
+
+def _db_time(value):
+    return datetime.time(value // 3600, value // 60 % 60, value % 60) if type(value) is int else value
+
+
+def _db_date_text(value):
+    """SQL hw_date_text(date): the date as it reads in the GUI (ISO for parsed dates)."""
+    return _db_date(value).isoformat() if type(value) is int else value
+
+
+def OpenDatabase(db_path):
+    """Open (creating if needed) the SQLite store at db_path in WAL mode."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] not in (0, DB_SCHEMA_VERSION):
+        with conn:
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                conn.execute(f"DROP TABLE {name}")
+    with conn:
+        for sql in _DB_TABLES:
+            conn.execute(sql)
+        for _name, sql in _DB_INDEXES:
+            conn.execute(sql)
+    conn.execute(f"PRAGMA user_version = {DB_SCHEMA_VERSION}")
+    conn.create_function('hw_date_text', 1, _db_date_text, deterministic=True)
+    return conn
+
+
+def _db_is_current(conn, fingerprint):
+    meta = dict(conn.execute("SELECT key, value FROM Meta"))
+    return all(meta.get(k) == v for k, v in fingerprint.items())
+
+
+def _db_clear(conn):
+    """Empty every table; the Login indexes are dropped so bulk inserts don't maintain them."""
+    conn.execute("DELETE FROM Meta")
+    for name, _sql in _DB_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for table, _rows, _columns in _DB_DIMENSIONS:
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute("DELETE FROM Login")
+
+
+def _db_insert_logins(conn, rows):
+    """executemany the (id, date, time, pc_id, user_id, free_disk_space) rows into Login."""
+    enc = _db_encode
+    conn.executemany("INSERT INTO Login VALUES (?, ?, ?, ?, ?, ?)",
+                     ((lid, enc(date), enc(tm), pc_id, user_id, enc(free))
+                      for lid, date, tm, pc_id, user_id, free in rows))
+
+
+def _db_finish(conn, fingerprint=None, stats=None):
+    """Write the dimension tables, rebuild the Login indexes and record what was loaded."""
+    enc = _db_encode
+    for table, rows, columns in _DB_DIMENSIONS:
+        conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})",
+                         ([enc(row.get(c)) for c in columns] for row in rows.values()))
+    for _name, sql in _DB_INDEXES:
+        conn.execute(sql)
+    if fingerprint is not None:
+        conn.executemany("INSERT INTO Meta VALUES (?, ?)",
+                         list(fingerprint.items()) + [(k, stats[k]) for k in _DB_STATS])
+
+
+def SaveDatabase(db_path, file_path=None, stats=None):
+    """Write the in-memory tables to the SQLite store at db_path, replacing its contents.
+
+    Everything is written in one transaction, so readers see either the old or the
+    new tables. With file_path and the LoadData stats the database is marked as
+    holding that file (skipped if it already does, or if the load stopped short of the
+    end of the file). Returns True if the database was written.
+    """
+    fingerprint = None
+    if file_path is not None and stats is not None and stats['bytes'] == os.path.getsize(file_path):
+        fingerprint = _fingerprint(file_path)
+    conn = OpenDatabase(db_path)
     try:
-        # Build a set of login ids that match the filter
-        # d may be a string (YYYY-MM or YYYY-MM-DD) or a date
-        # We'll select LOGIN_TABLE rows that match
-        import re
+        if fingerprint is not None and _db_is_current(conn, fingerprint):
+            return False
+        with conn:
+            _db_clear(conn)
+            _db_insert_logins(conn, LOGIN_TABLE.rows())
+            _db_finish(conn, fingerprint, stats)
+        return True
+    finally:
+        conn.close()
 
-        def parse_filter_date(x):
-            if x is None:
-                return None
-            if isinstance(x, datetime.date):
-                return x
-            if isinstance(x, str):
-                x = x.strip()
-                # year-month
-                if re.match(r"^\d{4}-\d{2}$", x):
-                    return x
-                try:
-                    return Filter._parse_date(x)
-                except Exception:
-                    return x
-            return None
 
-        # Determine selection predicate
-        sel = []
-        if d is None or str(d).strip() == "":
-            sel = list(LOGIN_TABLE.values())
-        else:
-            dval = parse_filter_date(d)
-            if isinstance(dval, str):
-                # year-month filter
-                sel = [r for r in LOGIN_TABLE.values() if (r.get('date') is not None and getattr(r['date'], 'isoformat', lambda: str(r['date']))()[:7] == dval)]
-            elif isinstance(dval, datetime.date):
-                sel = [r for r in LOGIN_TABLE.values() if r.get('date') == dval]
-            else:
-                # fallback: match string prefix
-                sval = str(d)
-                sel = [r for r in LOGIN_TABLE.values() if r.get('date') and str(r['date']).startswith(sval)]
-
-        # Collect referenced ids
-        user_ids = set(r.get('user_id') for r in sel if r.get('user_id') is not None)
-        pc_ids = set(r.get('pc_id') for r in sel if r.get('pc_id') is not None)
-
-        # Collect additional referenced ids from PCs
-        brand_ids = set()
-        model_ids = set()
-        os_ids = set()
-        device_ids = set()
-        processor_ids = set()
-        processor_model_ids = set()
-
-        for pid in pc_ids:
-            pc = PC_TABLE.get(pid)
-            if not pc:
-                continue
-            if pc.get('brand_id'):
-                brand_ids.add(pc.get('brand_id'))
-            if pc.get('model_id'):
-                model_ids.add(pc.get('model_id'))
-            if pc.get('os_id'):
-                os_ids.add(pc.get('os_id'))
-            if pc.get('device_id'):
-                device_ids.add(pc.get('device_id'))
-            if pc.get('processor_id'):
-                processor_ids.add(pc.get('processor_id'))
-            if pc.get('processor_id'):
-                # processor -> model
-                proc = PROCESSOR_TABLE.get(pc.get('processor_id'))
-                if proc and proc.get('model_id'):
-                    processor_model_ids.add(proc.get('model_id'))
-
-        # Also include models' brands
-        for mid in list(model_ids):
-            m = MODEL_TABLE.get(mid)
-            if m and m.get('brand_id'):
-                brand_ids.add(m.get('brand_id'))
-
-        # Create workbook and sheets
-        wb = Workbook()
-        # remove default
-        default = wb.active
-        wb.remove(default)
-
-        def write_table(name, headers, rows):
-            ws = wb.create_sheet(title=name[:31])
-            ws.append(headers)
-            for row in rows:
-                ws.append(row)
+def LoadDatabase(file_path="hw.txt", db_path="hw.db", progress=None, flush_rows=100000):
+    """Ingest hw.txt into the SQLite store at db_path, unless it already holds this file.
 
-        # Login sheet
-        login_rows = []
-        for r in sel:
-            login_rows.append([r.get('id'), r.get('date'), r.get('time'), r.get('pc_id'), r.get('user_id'), r.get('free_disk_space')])
-        write_table('Login', ['ID', 'Date', 'Time', 'PC_ID', 'User_ID', 'FreeDiskSpace'], login_rows)
-
-        # User sheet
-        user_rows = []
-        for uid in sorted(user_ids):
-            u = USER_TABLE.get(uid)
-            if u:
-                user_rows.append([u.get('id'), u.get('name')])
-        write_table('User', ['ID', 'Name'], user_rows)
-
-        # PC sheet
-        pc_rows = []
-        for pid in sorted(pc_ids):
-            p = PC_TABLE.get(pid)
-            if not p:
-                continue
-            pc_rows.append([
-                p.get('id'), p.get('name'), p.get('device_id'), p.get('model_id'), p.get('ram_gb'),
-                p.get('processor_id'), p.get('os_id'), p.get('os_installation_date'), 
-                p.get('disk'), p.get('note')
-            ])
-        write_table('Pc', ['ID', 'Name', 'DeviceID', 'ModelID', 'RAM', 'ProcessorID', 'OperationSystemID', 'OperationSystemInstallationDate', 'Disk', 'Note'], pc_rows)
-
-        # Device
-        device_rows = [[v.get('id'), v.get('type')] for k, v in DEVICE_TABLE.items() if k in device_ids]
-        write_table('Device', ['ID', 'Type'], device_rows)
-
-        # Model
-        model_rows = []
-        for mid in sorted(model_ids):
-            m = MODEL_TABLE.get(mid)
-            if m:
-                model_rows.append([m.get('id'), m.get('brand_id'), m.get('name')])
-        write_table('Model', ['ID', 'BrandID', 'Name'], model_rows)
-
-        # Brand
-        brand_rows = [[b.get('id'), b.get('name')] for k, b in BRAND_TABLE.items() if k in brand_ids]
-        write_table('Brand', ['ID', 'Name'], brand_rows)
-
-        # OperationSystem
-        os_rows = [[o.get('id'), o.get('name')] for k, o in OS_TABLE.items() if k in os_ids]
-        write_table('OperationSystem', ['ID', 'Name'], os_rows)
-
-        # ProcessorModel
-        pm_rows = [[m.get('id'), m.get('name')] for k, m in PROCESSOR_MODEL_TABLE.items() if k in processor_model_ids]
-        write_table('ProcessorModel', ['ID', 'Name'], pm_rows)
-
-        # Processor
-        proc_rows = [[p.get('id'), p.get('code'), p.get('model_id')] for k, p in PROCESSOR_TABLE.items() if k in processor_ids]
-        write_table('Processor', ['ID', 'ProcessorCode', 'ProcessorModelID'], proc_rows)
-
-        # Save workbook
-        dstr = ''
-        if d is None or str(d).strip() == '':
-            dstr = 'all'
-        else:
-            try:
-                if isinstance(d, str) and re.match(r"^\d{4}-\d{2}$", d):
-                    dstr = d
-                else:
-                    dp = Filter._parse_date(d)
-                    dstr = dp.isoformat() if dp else str(d)
-            except Exception:
-                dstr = str(d)
+    Login rows are written to the database every flush_rows rows and then dropped from
+    LOGIN_TABLE, so the number of logins is not limited by memory; the lookups, the
+    dimension tables and Filter.objectsArray are built in memory as in LoadData.
+    Returns LoadData's stats; 'cached': True when the database was already current, in
+    which case nothing is parsed and the in-memory tables are left as they were.
+    Raises FileNotFoundError / OSError if the file cannot be read.
+    """
+    fingerprint = _fingerprint(file_path)
+    conn = OpenDatabase(db_path)
+    try:
+        if _db_is_current(conn, fingerprint):
+            meta = dict(conn.execute("SELECT key, value FROM Meta"))
+            stats = {k: meta[k] for k in _DB_STATS}
+            if progress is not None:
+                progress(stats['bytes'], stats['bytes'])
+            return dict(stats, cached=True)
+        ResetData()
+        with conn:
+            _db_clear(conn)
+        reader = RecordReader(file_path, progress=progress)
+        for record in reader:
+            IngestRecord(record)
+            if len(LOGIN_TABLE) >= flush_rows:
+                with conn:
+                    _db_insert_logins(conn, LOGIN_TABLE.rows())
+                LOGIN_TABLE.clear()
+        stats = reader.stats()
+        with conn:
+            _db_insert_logins(conn, LOGIN_TABLE.rows())
+            _db_finish(conn, fingerprint, stats)
+        LOGIN_TABLE.clear()
+        return stats
+    finally:
+        conn.close()
 
-        output_file = os.path.join(os.getcwd(), f"hw_relational_{dstr}.xlsx")
-        wb.save(output_file)
-        messagebox.showinfo('Success', f'Excel exported: {output_file}')
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred:\n{e}")
+
+def _db_period_filter(d=None, date_from=None, date_to=None):
+    """(condition on Login, parameters) selecting the rows SelectLoginPositions would."""
+    last = datetime.date.max.toordinal()
+    if date_from is not None or date_to is not None:
+        return "date BETWEEN ? AND ?", (date_from.toordinal() if date_from else 1,
+                                        date_to.toordinal() if date_to else last)
+    if d is None or str(d).strip() == "":
+        return "1", ()
+    dval = _parse_filter_date(d)
+    if isinstance(dval, str):
+        # Text dates sort after every integer, and 'YYYY-MM' <= text < 'YYYY-MN' (N = M + 1)
+        # is exactly the texts starting with YYYY-MM: both halves use the date index
+        text = ("date >= ? AND date < ?", (dval, dval[:-1] + chr(ord(dval[-1]) + 1)))
+        y, m = int(dval[:4]), int(dval[5:7])
+        if not 1 <= m <= 12:
+            return text
+        start = datetime.date(y, m, 1).toordinal()
+        end = _month_end(y, m).toordinal()
+        return f"(date BETWEEN ? AND ? OR {text[0]})", (start, end) + text[1]
+    if isinstance(dval, datetime.date):
+        return "date = ?", (dval.toordinal(),)
+    # fallback: match string prefix
+    sval = str(d)
+    return "substr(hw_date_text(date), 1, ?) = ?", (len(sval), sval)
+
+
+def _db_sheet_rows(conn, cond, params):
+    """The sheets of _sheet_rows, read from the database; every sheet is a lazy query."""
+    conn.execute("DROP TABLE IF EXISTS temp.sel_user")
+    conn.execute("DROP TABLE IF EXISTS temp.sel_pc")
+    conn.execute(f"CREATE TEMP TABLE sel_user AS SELECT DISTINCT user_id AS id FROM Login WHERE {cond}", params)
+    conn.execute(f"CREATE TEMP TABLE sel_pc AS SELECT DISTINCT pc_id AS id FROM Login WHERE {cond}", params)
+    pcs = "SELECT id FROM temp.sel_pc"
+    models = f"SELECT model_id FROM PC WHERE id IN ({pcs})"
+    processors = f"SELECT processor_id FROM PC WHERE id IN ({pcs})"
+
+    def query(sql, params=(), decode=None):
+        for row in conn.execute(sql, params):
+            row = list(row)
+            if decode is not None:
+                decode(row)
+            yield row
+
+    def login(row):
+        row[1], row[2] = _db_date(row[1]), _db_time(row[2])
+
+    def pc(row):
+        row[7] = _db_date(row[7])
+
+    queries = (
+        (f"SELECT id, date, time, pc_id, user_id, free_disk_space FROM Login WHERE {cond} ORDER BY id", params, login),
+        ("SELECT id, name FROM User WHERE id IN (SELECT id FROM temp.sel_user) ORDER BY id", (), None),
+        (f"SELECT id, name, device_id, model_id, ram_gb, processor_id, os_id, os_installation_date, disk, note"
+         f" FROM PC WHERE id IN ({pcs}) ORDER BY id", (), pc),
+        (f"SELECT id, type FROM Device WHERE id IN (SELECT device_id FROM PC WHERE id IN ({pcs})) ORDER BY id", (), None),
+        (f"SELECT id, brand_id, name FROM Model WHERE id IN ({models}) ORDER BY id", (), None),
+        (f"SELECT id, name FROM Brand WHERE id IN (SELECT brand_id FROM Model WHERE id IN ({models})) ORDER BY id", (), None),
+        (f"SELECT id, name FROM OperatingSystem WHERE id IN (SELECT os_id FROM PC WHERE id IN ({pcs})) ORDER BY id", (), None),
+        (f"SELECT id, name FROM ProcessorModel WHERE id IN (SELECT model_id FROM Processor WHERE id IN ({processors})) ORDER BY id", (), None),
+        (f"SELECT id, code, model_id FROM Processor WHERE id IN ({processors}) ORDER BY id", (), None),
+    )
+    return [(name, headers, query(*q)) for (name, headers), q in zip(_SHEET_HEADERS, queries)]
+
+
+def WriteDatabaseWorkbook(db_path, output_file, d=None, date_from=None, date_to=None,
+                          progress=None, cancel=None):
+    """WriteWorkbook for one period, with the selection and referenced ids done in SQL.
+
+    Opens its own connection, so several processes can export from one database at
+    once (WAL readers don't block each other). Returns a dict of sheet name -> rows written.
+    """
+    conn = OpenDatabase(db_path)
+    try:
+        return _write_sheets(output_file, _db_sheet_rows(conn, *_db_period_filter(d, date_from, date_to)),
+                             progress, cancel)
+    finally:
+        conn.close()
+
+
+def ExportDatabase(db_path, d, output_dir=None, date_from=None, date_to=None, progress=None, cancel=None):
+    """ExportData from the SQLite store at db_path instead of the in-memory tables."""
+    output_file = os.path.join(output_dir or os.getcwd(), f"hw_relational_{_period_name(d, date_from, date_to)}.xlsx")
+    return output_file, WriteDatabaseWorkbook(db_path, output_file, d, date_from, date_to, progress, cancel)
+
+#endregion
+
+#region Search Index
+
+# Keystrokes closer together than this are coalesced into one search
+SEARCH_DEBOUNCE_MS = 40
+# Up to this many rows the index is rebuilt inline; beyond it, in a worker thread
+SEARCH_SYNC_ROWS = 10000
+# The main window applies background-load progress at most once per this many ms
+LOAD_FRAME_MS = 50
+
+
+class RowView:
+    """Read-only sequence rows[order[i]] for lo <= i < hi, without copying the rows."""
+    __slots__ = ('rows', 'order', 'lo', 'hi')
+
+    def __init__(self, rows, order, lo, hi):
+        self.rows, self.order, self.lo, self.hi = rows, order, lo, hi
+
+    def __len__(self):
+        return self.hi - self.lo
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.rows[self.order[self.lo + i]]
+
+
+class SearchIndex:
+    """Prefix index over the GUI's (date, user, pc_name) rows.
+
+    For every field the row positions are kept sorted by that field's key (the ISO
+    date as shown, user and PC names lower-cased). A prefix query is two bisects in
+    one of those orders and its result is a RowView of the matching slice, so a search
+    costs O(log n) however many rows match; matches come out sorted by the searched
+    field. A query that extends the previous one on the same field only bisects
+    inside the previous slice. Building the index is the expensive part (one sort per
+    field); the GUI does it in a worker thread.
+    """
+    FIELDS = ('date', 'user', 'pc')
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._orders = {}
+        self._keys = {}
+        for col, field in enumerate(self.FIELDS):
+            if field == 'date':
+                keys = ['' if row[col] is None else str(row[col]) for row in rows]
+            else:
+                keys = [('' if row[col] is None else str(row[col])).lower() for row in rows]
+            order = sorted(range(len(rows)), key=keys.__getitem__)
+            self._orders[field] = array('q', order)
+            self._keys[field] = [keys[i] for i in order]
+        self._last = None  # (field, key, lo, hi) of the previous query
+
+    def search(self, field, query):
+        """Rows whose field starts with query (case-insensitive for user and pc)."""
+        key = query if field == 'date' else query.lower()
+        keys = self._keys[field]
+        lo, hi = 0, len(keys)
+        last = self._last
+        if last is not None and last[0] == field and key.startswith(last[1]):
+            lo, hi = last[2], last[3]  # narrowing the previous result
+        lo = bisect.bisect_left(keys, key, lo, hi)
+        hi = bisect.bisect_left(keys, key + '\U0010ffff', lo, hi)
+        self._last = (field, key, lo, hi)
+        return RowView(self.rows, self._orders[field], lo, hi)
 
 #endregion
 
+
 #region Tkinter GUI Functions
 
-def TkinterMain():
-    # --- Enable mouse wheel scrolling for the ticket list ---
-    def _on_mousewheel(event):
-        try:
-            if hasattr(event, 'delta') and event.delta:
-                canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-            elif hasattr(event, 'num') and event.num == 4:
-                canvas.yview_scroll(-1, "units")
-            elif hasattr(event, 'num') and event.num == 5:
-                canvas.yview_scroll(1, "units")
-        except tk.TclError:
+class VirtualList:
+    """Scrollable multi-column list that only draws the rows in view.
+
+    One canvas holds a fixed pool of row slots (a background rectangle plus one text
+    item per column); scrolling and new data only re-configure those items, so the
+    cost of a redraw depends on the window height, not on the number of rows. Rows
+    are tuples of strings. on_click(index, row) is called when a row is clicked.
+    """
+    ROW_HEIGHT = 26
+    PAD_X = 8
+
+    def __init__(self, parent, headers, widths, on_click=None, font=("Arial", 11)):
+        import tkinter as tk
+        import tkinter.font as tkfont
+
+        self.rows = []
+        self.top = 0  # index of the first row in view
+        self.selected = None
+        self.on_click = on_click
+        self.font = tkfont.Font(family=font[0], size=font[1])
+        # column widths are given in characters, like the Label widths they replace
+        char = self.font.measure('0')
+        self.widths = [w * char for w in widths]
+        self._slots = []  # (rectangle id, [text id per column])
+        self._shown = []  # what each slot currently displays, to skip unchanged items
+
+        self.frame = tk.Frame(parent, bg="#cccccc")
+        header = tk.Frame(self.frame, bg="#dddddd")
+        header.pack(fill="x", padx=4, pady=(2, 2))
+        for col, (text, width) in enumerate(zip(headers, widths)):
+            tk.Label(header, text=text, font=(font[0], font[1], "bold"), bg="#dddddd",
+                     anchor="w", width=width).grid(row=0, column=col, sticky="w", padx=self.PAD_X, pady=4)
+        self.canvas = tk.Canvas(self.frame, bg="#cccccc", highlightthickness=0, height=260)
+        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda e: self._layout(e.width, e.height))
+        self.canvas.bind("<Button-1>", self._on_click)
+        # wheel events only while the pointer is over the list
+        self.canvas.bind("<Enter>", lambda e: self._bind_wheel(True))
+        self.canvas.bind("<Leave>", lambda e: self._bind_wheel(False))
+        for key, delta in (("<Up>", -1), ("<Down>", 1)):
+            self.canvas.bind(key, lambda e, d=delta: self.scroll(d))
+        for key, pages in (("<Prior>", -1), ("<Next>", 1)):
+            self.canvas.bind(key, lambda e, p=pages: self.scroll(p * self.visible))
+
+    # --- geometry ---
+    @property
+    def visible(self):
+        """Rows that fit in the canvas (at least 1)."""
+        return max(1, len(self._slots) - 1)
+
+    def _layout(self, width, height):
+        """Create or drop row slots to fill the canvas height, then redraw."""
+        needed = height // self.ROW_HEIGHT + 1
+        while len(self._slots) < needed:
+            y = len(self._slots) * self.ROW_HEIGHT
+            rect = self.canvas.create_rectangle(4, y + 1, width - 4, y + self.ROW_HEIGHT - 1,
+                                                fill="#ffffff", outline="#bbbbbb")
+            texts = []
+            x = 4 + self.PAD_X
+            for w in self.widths:
+                texts.append(self.canvas.create_text(x, y + self.ROW_HEIGHT // 2, anchor="w",
+                                                     font=self.font, text=""))
+                x += w + 2 * self.PAD_X
+            self._slots.append((rect, texts))
+            self._shown.append(None)
+        while len(self._slots) > needed:
+            rect, texts = self._slots.pop()
+            self._shown.pop()
+            self.canvas.delete(rect, *texts)
+        for i, (rect, _texts) in enumerate(self._slots):
+            y = i * self.ROW_HEIGHT
+            self.canvas.coords(rect, 4, y + 1, width - 4, y + self.ROW_HEIGHT - 1)
+        self.scroll_to(self.top)
+
+    # --- data ---
+    def set_rows(self, rows, keep_position=False):
+        """Show a new list of rows; keep_position stays at the same index (e.g. after a refresh)."""
+        self.rows = rows
+        self.selected = None
+        self.scroll_to(self.top if keep_position else 0)
+
+    # --- scrolling ---
+    def scroll_to(self, top):
+        self.top = max(0, min(top, len(self.rows) - self.visible))
+        self._redraw()
+        n = len(self.rows)
+        if n <= self.visible:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / n, (self.top + self.visible) / n)
+
+    def scroll(self, delta):
+        self.scroll_to(self.top + delta)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, 'num', None) == 4:
+            self.scroll(-3)
+        elif getattr(event, 'num', None) == 5:
+            self.scroll(3)
+        elif getattr(event, 'delta', 0):
+            self.scroll(-3 if event.delta > 0 else 3)
+
+    def _bind_wheel(self, on):
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            if on:
+                self.canvas.bind_all(seq, self._on_wheel)
+            else:
+                self.canvas.unbind_all(seq)
+        if on:
+            self.canvas.focus_set()
+
+    # --- drawing ---
+    def _clip(self, text, width):
+        """text cut to fit width pixels, as a fixed-width Label would show it."""
+        if self.font.measure(text) <= width:
+            return text
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.font.measure(text[:mid]) <= width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return text[:lo]
+
+    def _redraw(self):
+        canvas = self.canvas
+        for i, (rect, texts) in enumerate(self._slots):
+            index = self.top + i
+            if index < len(self.rows):
+                row = self.rows[index]
+                shown = (row, index == self.selected)
+            else:
+                shown = None
+            if shown == self._shown[i]:
+                continue
+            self._shown[i] = shown
+            if shown is None:
+                canvas.itemconfigure(rect, state="hidden")
+                for t in texts:
+                    canvas.itemconfigure(t, state="hidden")
+                continue
+            selected = shown[1]
+            canvas.itemconfigure(rect, state="normal", fill="#3399ff" if selected else "#ffffff")
+            for t, value, width in zip(texts, row, self.widths):
+                canvas.itemconfigure(t, state="normal", fill="#ffffff" if selected else "#000000",
+                                     text=self._clip('' if value is None else str(value), width))
+
+    def _on_click(self, event):
+        index = self.top + int(event.y) // self.ROW_HEIGHT
+        if index >= len(self.rows):
             return
+        self.selected = index
+        self._redraw()
+        if self.on_click is not None:
+            self.on_click(index, self.rows[index])
 
-    def _bind_canvas_wheel(_ev=None):
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        canvas.bind_all("<Button-4>", _on_mousewheel)
-        canvas.bind_all("<Button-5>", _on_mousewheel)
 
-    def _unbind_canvas_wheel(_ev=None):
-        try:
-            canvas.unbind_all("<MouseWheel>")
-            canvas.unbind_all("<Button-4>")
-            canvas.unbind_all("<Button-5>")
-        except Exception:
-            pass
+def TkinterMain(follower=None, poll_ms=2000, db_path=None, loader=None):
+    """Main window. loader, a BackgroundLoad that is not started yet, fills the list while
+    the window is already open; once it is done the input file is followed (TailIngest)."""
+    import tkinter as tk
+    from tkinter import messagebox, ttk
 
-    # canvas is defined below, so bind after its creation
     root = tk.Tk()
     root.title("HW Filter")
     # Make the window narrower as requested
@@ -751,139 +3462,239 @@ def TkinterMain():
     search_var = tk.StringVar()
     search_entry = tk.Entry(search_frame, textvariable=search_var, font=("Arial", 11), width=40)
     search_entry.pack(side="left", padx=4)
+    search_fields = {"Date": "date", "User": "user", "PC": "pc"}
+    search_field = tk.StringVar(value="Date")
+    tk.OptionMenu(search_frame, search_field, *search_fields).pack(side="left", padx=4)
+    match_label = tk.Label(search_frame, text="", bg="#dddddd", font=("Arial", 10))
+    match_label.pack(side="left", padx=4)
 
-    # --- Ticket list (scrollable) ---
-    list_outer = tk.Frame(root, bg="#cccccc")
-    list_outer.pack(fill="both", expand=True, padx=10, pady=(0, 0))
-    canvas = tk.Canvas(list_outer, bg="#cccccc", highlightthickness=0, height=260)
-    scrollbar = tk.Scrollbar(list_outer, orient="vertical", command=canvas.yview)
-    scrollable_frame = tk.Frame(canvas, bg="#cccccc")
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    # Bind mouse wheel events after canvas is defined
-    canvas.bind('<Enter>', _bind_canvas_wheel)
-    canvas.bind('<Leave>', _unbind_canvas_wheel)
-
-
-
-    # --- Prepare ticket data ---
-    filtered = Filter.objectsArray
-
-    # Prepare rows for display: (login_date, user, pc_name)
-    filter_rows = [(t.login_date.isoformat(), t.user, t.pc_name) for t in filtered]
-
-    item_frames = []
-    selected_index = [None]
-    PAGE_SIZE = 50
-    current_page = [0]  # mutable for closure
-    filtered_rows = list(filter_rows)  # always up-to-date filtered list
-
-    def on_select(idx):
-        for i, fr in enumerate(item_frames):
-            fr.config(bg="#ffffff")
-            for w in fr.winfo_children():
-                w.config(bg="#ffffff", fg="#000000")
-        item_frames[idx].config(bg="#3399ff")
-        for w in item_frames[idx].winfo_children():
-            w.config(bg="#3399ff", fg="#ffffff")
-        selected_index[0] = idx
-        # idx 0 is header, so only for idx > 0
-        if idx > 0:
-            # Find the correct row in the current page
-            page = current_page[0]
-            start = page * PAGE_SIZE
-            # Use filtered_rows for current search/page
-            if start + (idx-1) < len(filtered_rows):
-                date_val = filtered_rows[start + (idx-1)][0]
-                # Extract only year and month (YYYY-MM) from the date
-                year_month = date_val[:7] if date_val and len(date_val) >= 7 else date_val
-                try:
-                    dateselector.delete(0, tk.END)
-                    dateselector.insert(0, year_month)
-                except Exception:
-                    pass
-
-    def fill_listbox(rows, page=0):
-        for fr in item_frames:
-            fr.destroy()
-        item_frames.clear()
-        selected_index[0] = None
-        # Header row: three columns (Login Date, User, PC Name) with reduced widths
-        header = tk.Frame(scrollable_frame, bg="#dddddd", bd=2, relief="flat")
-        tk.Label(header, text="Login Date", font=("Arial", 11, "bold"), bg="#dddddd", anchor="w", width=12).grid(row=0, column=0, sticky="w", padx=8, pady=4)
-        tk.Label(header, text="User", font=("Arial", 11, "bold"), bg="#dddddd", anchor="w", width=20).grid(row=0, column=1, sticky="w", padx=8, pady=4)
-        tk.Label(header, text="PC Name", font=("Arial", 11, "bold"), bg="#dddddd", anchor="w", width=20).grid(row=0, column=2, sticky="w", padx=8, pady=4)
-        header.pack(fill="x", padx=4, pady=(2,2))
-        item_frames.append(header)
-        # Data rows (paginated)
-        start = page * PAGE_SIZE
-        end = start + PAGE_SIZE
-        page_rows = rows[start:end]
-        for idx, (login_date, user, pc_name) in enumerate(page_rows):
-            fr = tk.Frame(scrollable_frame, bg="#ffffff", bd=2, relief="groove")
-            lbl_date = tk.Label(fr, text=login_date, font=("Arial", 11), bg="#ffffff", anchor="w", width=12)
-            lbl_date.grid(row=0, column=0, sticky="w", padx=8, pady=4)
-            lbl_user = tk.Label(fr, text=user, font=("Arial", 11), bg="#ffffff", anchor="w", width=20, justify="left")
-            lbl_user.grid(row=0, column=1, sticky="w", padx=8, pady=4)
-            lbl_pc = tk.Label(fr, text=pc_name, font=("Arial", 11), bg="#ffffff", anchor="w", width=20)
-            lbl_pc.grid(row=0, column=2, sticky="w", padx=8, pady=4)
-            fr.pack(fill="x", padx=4, pady=2)
-            fr.bind("<Button-1>", lambda e, i=idx+1: on_select(i))
-            lbl_date.bind("<Button-1>", lambda e, i=idx+1: on_select(i))
-            lbl_user.bind("<Button-1>", lambda e, i=idx+1: on_select(i))
-            lbl_pc.bind("<Button-1>", lambda e, i=idx+1: on_select(i))
-            item_frames.append(fr)
-        # Pagination controls
-        total_pages = max(1, (len(rows) + PAGE_SIZE - 1) // PAGE_SIZE)
-        pag_frame = tk.Frame(scrollable_frame, bg="#eeeeee")
-        pag_frame.pack(fill="x", pady=(6, 2))
-        prev_btn = tk.Button(pag_frame, text="< Previous", state=("normal" if page > 0 else "disabled"), command=lambda p=page: goto_page(p-1))
-        prev_btn.pack(side="left", padx=8)
-        page_label = tk.Label(pag_frame, text=f"Page {page+1} / {total_pages}", font=("Arial", 10), bg="#eeeeee")
-        page_label.pack(side="left", padx=8)
-        next_btn = tk.Button(pag_frame, text="Next >", state=("normal" if page < total_pages-1 else "disabled"), command=lambda p=page: goto_page(p+1))
-        next_btn.pack(side="left", padx=8)
-        item_frames.append(pag_frame)
-
-    def goto_page(page):
-        current_page[0] = page
-        fill_listbox(filtered_rows, page)
-        # Scroll to top of canvas after page change
-        canvas.yview_moveto(0)
-
-    fill_listbox(filter_rows, 0)
+    # --- Login list: virtualized, only the rows in view are drawn ---
+    def on_row_click(index, row):
+        date_val = row[0]
+        # Extract only year and month (YYYY-MM) from the date
+        year_month = date_val[:7] if date_val and len(date_val) >= 7 else date_val
+        try:
+            dateselector.delete(0, tk.END)
+            dateselector.insert(0, year_month)
+        except Exception:
+            pass
 
-    def on_search(*args):
+    login_list = VirtualList(root, ["Login Date", "User", "PC Name"], [12, 20, 20], on_click=on_row_click)
+    login_list.frame.pack(fill="both", expand=True, padx=10, pady=(0, 0))
+
+    # --- Prepare ticket data: (login_date, user, pc_name); the loader fills it in later ---
+    filter_rows = [] if loader is not None else DisplayRows()
+    login_list.set_rows(filter_rows)
+
+    # --- Search: prefix index over date / user / PC, debounced keystrokes ---
+    index = [None]  # SearchIndex over filter_rows once built
+    index_gen = [0]  # bumped whenever filter_rows changes; stale builds are dropped
+    search_job = [None]  # pending debounced search
+    shown_query = [None]  # (field, query) currently in the list
+
+    building = [False]  # a worker thread is sorting
+
+    def build_index():
+        index_gen[0] += 1
+        if len(filter_rows) <= SEARCH_SYNC_ROWS:
+            index[0] = SearchIndex(filter_rows)
+        elif not building[0]:
+            start_build()
+
+    def start_build():
+        # large data: sort in a worker thread, hand the result back on the Tk thread
+        gen, rows = index_gen[0], filter_rows
+        built = []
+        building[0] = True
+        threading.Thread(target=lambda: built.append(SearchIndex(rows)), daemon=True).start()
+
+        def check():
+            if not built:
+                root.after(50, check)
+                return
+            building[0] = False
+            if gen == index_gen[0] or index[0] is None or len(index[0].rows) > SEARCH_SYNC_ROWS:
+                index[0] = built[0]  # an older index still matches its own rows
+            if gen != index_gen[0] and len(filter_rows) > SEARCH_SYNC_ROWS:
+                start_build()  # the rows changed while sorting
+            run_search(keep_position=True)
+
+        root.after(50, check)
+
+    def run_search(keep_position=False):
+        search_job[0] = None
         q = search_var.get().strip()
-        nonlocal filtered_rows
+        field = search_fields[search_field.get()]
         if not q:
-            filtered_rows = [row for row in filter_rows]
+            rows = filter_rows
+        elif index[0] is None:
+            match_label.config(text="indexing...")
+            return  # run again when the index is ready
         else:
-            # Match year-month only (YYYY-MM)
-            import re
-            ym_pattern = r"^\d{4}-\d{2}$"
-            if re.match(ym_pattern, q):
-                filtered_rows = [row for row in filter_rows if (row[0] and row[0][:7]) == q]
-            else:
-                # if user types partial, try to match start of YYYY-MM
-                filtered_rows = [row for row in filter_rows if row[0] and row[0].startswith(q)]
-        current_page[0] = 0
-        fill_listbox(filtered_rows, current_page[0])
+            rows = index[0].search(field, q)
+        # a refresh of the same query stays where the user was scrolled to
+        login_list.set_rows(rows, keep_position=keep_position and shown_query[0] == (field, q))
+        shown_query[0] = (field, q)
+        match_label.config(text=f"{len(rows)} matches" if q else "")
+
+    def on_search(*args):
+        if search_job[0] is not None:
+            root.after_cancel(search_job[0])
+        search_job[0] = root.after(SEARCH_DEBOUNCE_MS, run_search)
 
     search_var.trace_add('write', on_search)
+    search_field.trace_add('write', on_search)
+    build_index()
+
+    # --- Follow appends to the input file (TailIngest) ---
+    def refresh_rows(rows=None):
+        nonlocal filter_rows
+        filter_rows = DisplayRows() if rows is None else rows
+        build_index()
+        run_search(keep_position=True)
+
+    db_stale = [False]  # the SQLite copy misses rows ingested since it was written
+
+    job = [None]  # the running BackgroundJob (load or export); it owns the tables until done
+
+    def poll_input():
+        if job[0] is not None:
+            root.after(poll_ms, poll_input)  # an export or reload is using the tables
+            return
+        # no status bar: a poll usually finds nothing, and the window stays responsive
+        job[0] = BackgroundFollow(follower).start()
+        root.after(LOAD_FRAME_MS, drain_follow)
+
+    if follower is not None and loader is None:
+        root.after(poll_ms, poll_input)
+
+    def reload_input(event=None):
+        # F5: reload through the changed blocks, whatever the stat and the sampled digest say
+        if follower is None or job[0] is not None:
+            return
+        run_job(BackgroundFollow(follower, reload=True), "Reloading...", drain_follow)
+        cancel_btn.config(state="disabled")
+
+    root.bind('<F5>', reload_input)
+
+    def drain_follow():
+        reload = job[0].reload
+        _progress, rows, end = drain_job()
+        if rows is not None:
+            refresh_rows(rows[1])
+            db_stale[0] = True
+        if end is None:
+            root.after(LOAD_FRAME_MS, drain_follow)
+            return
+        if reload:
+            if end[0] == 'error':
+                messagebox.showerror("Error", f"Could not reload the input file:\n{end[1]}")
+            return  # the poll loop is still scheduled
+        if end[0] == 'error' and not isinstance(end[1], (OSError, UnicodeDecodeError)):
+            messagebox.showerror("Error", f"An error occurred while reading the file:\n{end[1]}")
+        # OSError / UnicodeDecodeError: file mid-rotation or mid-write; try again next tick
+        root.after(poll_ms, poll_input)
+
+    # --- Background jobs: a status bar fed by draining the job's queue at a fixed frame rate ---
+    job_frame = tk.Frame(root, bg="#eeeeee")
+    job_label = tk.Label(job_frame, text="", bg="#eeeeee", font=("Arial", 10), width=28, anchor="w")
+    job_label.pack(side="left", padx=(8, 4))
+    job_bar = ttk.Progressbar(job_frame, orient="horizontal", length=300, mode="determinate")
+    job_bar.pack(side="left", padx=4)
+
+    def on_cancel_job():
+        job[0].cancel()
+        cancel_btn.config(state="disabled", text="Cancelling...")
+
+    cancel_btn = tk.Button(job_frame, text="Cancel", command=on_cancel_job)
+    cancel_btn.pack(side="left", padx=4)
+
+    def run_job(new_job, text, drain):
+        # one job at a time: Generate Excel stays disabled until it ends
+        job[0] = new_job
+        button.config(state="disabled")
+        job_label.config(text=text)
+        job_bar['value'] = 0
+        cancel_btn.config(state="normal", text="Cancel")
+        job_frame.pack(fill="x", padx=10, pady=(0, 8), before=btn_frame)
+        new_job.start()
+        root.after(LOAD_FRAME_MS, drain)
+
+    def drain_job():
+        """(newest progress message, rows message, end message) queued since the last frame."""
+        progress = rows = end = None
+        try:
+            while end is None:
+                msg = job[0].queue.get_nowait()
+                if msg[0] == 'progress':
+                    progress = msg
+                elif msg[0] == 'rows':
+                    rows = msg
+                else:
+                    end = msg
+        except queue.Empty:
+            pass
+        if end is not None:
+            job[0] = None
+            job_frame.pack_forget()
+            button.config(state="normal")
+        return progress, rows, end
+
+    def drain_load():
+        nonlocal follower
+        progress, rows, end = drain_job()
+        if progress is not None:
+            job_bar['maximum'] = max(1, progress[2])
+            job_bar['value'] = progress[1]
+        if rows is not None:
+            refresh_rows(rows[1])
+        if end is None:
+            root.after(LOAD_FRAME_MS, drain_load)
+            return
+        if end[0] == 'error':
+            if isinstance(end[1], FileNotFoundError):
+                messagebox.showerror("Error", f"Input file not found: {end[1].filename or end[1]}")
+            else:
+                messagebox.showerror("Error", f"An error occurred while reading the file:\n{end[1]}")
+            return
+        stats = end[1]
+        if stats.get('cancelled'):
+            # keep what was read; the SQLite copy (if any) is written at the next export
+            db_stale[0] = bool(db_path)
+            messagebox.showinfo("Load cancelled", f"Loading stopped after {stats['lines']} lines.")
+            return
+        # pick up lines appended while the window is open
+        if loader.tail_path is not None:
+            follower = TailIngest(loader.tail_path)
+            follower.attach(stats['bytes'])
+            root.after(poll_ms, poll_input)
+
+    def drain_export():
+        progress, _rows, end = drain_job()
+        if progress is not None:
+            _tag, index, count, name, written = progress
+            job_bar['maximum'] = count + 1  # the last step is saving the file
+            job_bar['value'] = index
+            job_label.config(text=f"Sheet {index + 1}/{count} {name}: {written} rows" if name
+                             else "Saving workbook...")
+        if end is None:
+            root.after(LOAD_FRAME_MS, drain_export)
+            return
+        if end[0] == 'done':
+            db_stale[0] = False
+            messagebox.showinfo('Success', f'Excel exported: {end[1]}')
+            # Clear the date input field after successful export
+            dateselector.delete(0, tk.END)
+        elif end[0] == 'cancelled':
+            messagebox.showinfo('Export cancelled', 'No file was written.')
+        else:
+            messagebox.showerror("Error", f"An error occurred:\n{end[1]}")
 
     # --- Controls at the bottom: only two buttons as requested ---
     btn_frame = tk.Frame(root, bg="#eeeeee")
     btn_frame.pack(pady=(8, 16))
 
-    tk.Label(btn_frame, text="Enter date (YYYY-MM):").grid(row=0, column=0, padx=8, pady=4)
+    tk.Label(btn_frame, text="Enter date (YYYY-MM or FROM..TO):").grid(row=0, column=0, padx=8, pady=4)
     dateselector = tk.Entry(btn_frame)
     dateselector.grid(row=0, column=1, padx=8, pady=4)
 
@@ -891,6 +3702,9 @@ def TkinterMain():
         s = s.strip()
         if not s:
             return None
+        # Date range 'FROM..TO' (YYYY-MM or full dates) -> (date_from, date_to)
+        if '..' in s:
+            return parse_date_range(s)
         # Accept year-month like '2024-02' and return as string for extractor
         import re
         if re.match(r"^\d{4}-\d{2}$", s):
@@ -907,15 +3721,20 @@ def TkinterMain():
             return None
 
     def on_generate():
+        if job[0] is not None:
+            return
         s = dateselector.get()
-        d = parse_date_input(s)
-        # Call Extractor if it exists; otherwise inform the user
         try:
-            Extractor(d)
-            # Clear the date input field after successful export
-            dateselector.delete(0, tk.END)
+            d = parse_date_input(s)
         except Exception as e:
             messagebox.showerror('Error', str(e))
+            return
+        if isinstance(d, tuple):
+            export = BackgroundExport(None, d[0], d[1], db_path=db_path, save_db=db_stale[0])
+        else:
+            export = BackgroundExport(d, db_path=db_path, save_db=db_stale[0])
+        # a stale SQLite copy is brought up to date by the worker before exporting from it
+        run_job(export, "Exporting...", drain_export)
 
     button = tk.Button(btn_frame, text="Generate Excel", command=on_generate)
     button.grid(row=1, column=0, padx=8, pady=4)
@@ -923,16 +3742,565 @@ def TkinterMain():
     close_btn = tk.Button(btn_frame, text="Close", command=root.destroy, width=16, bg="#888888", fg="#fff")
     close_btn.grid(row=1, column=1, padx=8, pady=4)
 
+    if loader is not None:
+        run_job(loader, "Loading...", drain_load)
+
     root.mainloop()
+    if job[0] is not None:
+        # closing mid-job: stop the worker (an export removes its partial file) before exiting
+        job[0].cancel()
+        job[0].join()
+
+
+def DataReader(file_path="hw.txt"):
+    """Old entry point: LoadData with errors shown in a message box instead of raised.
+
+    Kept for callers of the pre-LoadData API; new code should call LoadData (or
+    BackgroundLoad in the GUI). Returns the LoadData stats, or None on error.
+    """
+    from tkinter import messagebox
+
+    try:
+        return LoadData(file_path)
+    except FileNotFoundError:
+        messagebox.showerror("Error", f"Input file not found: {file_path}")
+    except Exception as e:
+        messagebox.showerror("Error", f"An error occurred while reading the file:\n{e}")
+    return None
+
+
+def Extractor(d):
+    """Old entry point: ExportData for period d into the working directory, with the
+    result shown in a message box instead of returned or raised.
+
+    Kept for callers of the pre-ExportData API; new code should call ExportData (or
+    BackgroundExport in the GUI). Returns the output file, or None on error.
+    """
+    from tkinter import messagebox
+
+    try:
+        output_file, _ = ExportData(d)
+    except Exception as e:
+        messagebox.showerror("Error", f"An error occurred:\n{e}")
+        return None
+    messagebox.showinfo('Success', f'Excel exported: {output_file}')
+    return output_file
+
+#endregion
+
+#endregion
+
+#region Instrumentation
+
+# Stages timed by Instrumentation: (stage, owner, attribute). owner is a module-level name
+# (None = a function of this module), or a class / object whose attribute is wrapped.
+_TIMED_STAGES = (
+    ('load', None, 'LoadData'),
+    ('load', None, 'LoadFiles'),
+    ('load_db', None, 'LoadDatabase'),
+    ('snapshot_load', None, 'LoadSnapshot'),
+    ('snapshot_save', None, 'SaveSnapshot'),
+    ('parse_line', None, '_parse_line'),
+    ('parse_line', None, '_record_columns'),
+    ('ingest_record', None, 'IngestRecord'),
+    ('ingest_columns', None, 'IngestColumns'),
+    ('merge_chunk', None, '_merge_chunk'),
+    ('filter_init', 'Filter', '__init__'),
+    ('field_parsers', '_LOGIN_DATE', 'parse'),
+    ('field_parsers', '_INSTALL_DATE', 'parse'),
+    ('field_parsers', None, 'parse_time'),
+    ('field_parsers', None, 'parse_ram'),
+    ('lookup', 'LookupTable', 'get_or_create'),
+    ('register', 'Filter', 'register'),
+    ('tail_poll', 'TailIngest', 'poll'),
+    ('db_save', None, 'SaveDatabase'),
+    ('export_select', None, 'SelectLoginPositions'),
+    ('export_write', None, '_write_sheets'),
+)
+
+# Text report order; the indent shows which stages include which
+_STAGE_TREE = (
+    ('load', 0), ('snapshot_load', 1), ('parse_line', 1), ('ingest_record', 1), ('ingest_columns', 1),
+    ('filter_init', 2), ('field_parsers', 3), ('lookup', 3), ('register', 3),
+    ('(tables)', 2), ('merge_chunk', 1), ('progress', 1), ('(read, decode)', 1),
+    ('snapshot_save', 1), ('load_db', 0), ('tail_poll', 0), ('db_save', 0),
+    ('export_select', 0), ('export_write', 0),
+)
+
+
+class Instrumentation:
+    """Opt-in stage timers and counters for one run (--stats or HWFILTER_STATS).
+
+    enable() swaps timing wrappers in for the pipeline functions of _TIMED_STAGES and
+    disable() puts the originals back, so when it is off the code runs unchanged.
+    Counters: lines, records, blank and malformed lines, snapshot and --db cache hits,
+    dedup replacements, new ids per lookup table, workbooks, rows per sheet and
+    bytes written; the report also holds each lookup table's footprint (LookupMemory).
+    Work done in worker processes (-j > 1) is only seen as its merge and wall time,
+    and the columnar engine only counts the dedup replacements between blocks.
+    Timings include the wrappers of nested stages, so they overstate cheap, frequent
+    stages a little.
+    """
+    def __init__(self):
+        self.timers = {}  # stage -> [calls, seconds]
+        self.counters = {}
+        self.new_ids = {}  # lookup table name -> ids assigned
+        self._originals = []  # (owner, attribute, original value)
+        self._started = None
+        self._wall = 0.0
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, stage, fn):
+        """fn wrapped to add its calls and time to stage."""
+        entry = self.timers.setdefault(stage, [0, 0.0])
+        perf_counter = time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                entry[0] += 1
+                entry[1] += perf_counter() - t0
+        return wrapper
+
+    def _wrap(self, owner, attr, make):
+        """Replace owner.attr by make(original), remembering the original."""
+        if isinstance(owner, type):
+            original = owner.__dict__[attr]
+            if isinstance(original, classmethod):
+                setattr(owner, attr, classmethod(make(original.__func__)))
+            else:
+                setattr(owner, attr, make(original))
+        else:
+            original = getattr(owner, attr)
+            setattr(owner, attr, make(original))
+        self._originals.append((owner, attr, original))
+
+    def enable(self):
+        global STATS
+        module = sys.modules[__name__]
+        for stage, owner, attr in _TIMED_STAGES:
+            target = module if owner is None else getattr(module, owner)
+            self._wrap(target, attr, lambda fn, stage=stage: self.timed(stage, fn))
+        self._wrap(module, 'LoadData', self._count_load)
+        self._wrap(module, 'LoadFiles', self._count_load)
+        self._wrap(module, 'LoadDatabase', lambda fn: self._count_load(fn, 'db_cache_hits'))
+        self._wrap(module, '_parse_line', self._count_skipped)
+        self._wrap(module, '_record_columns', self._count_skipped_columns)
+        self._wrap(LatestStore, 'put', self._count_dedup)
+        self._wrap(LookupTable, 'get_or_create_key', self._count_new_ids)
+        self._wrap(module, '_write_sheets', self._count_export)
+        self._started = time.perf_counter()
+        STATS = self
+        return self
+
+    def disable(self):
+        global STATS
+        for owner, attr, original in reversed(self._originals):
+            setattr(owner, attr, original)
+        self._originals.clear()
+        if self._started is not None:
+            self._wall += time.perf_counter() - self._started
+            self._started = None
+        STATS = None
+
+    # --- counting wrappers ---
+    def _count_load(self, fn, hit='snapshot_hits'):
+        """Counts a load's stats; hit is counted when it came from a cache (snapshot or --db)."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stats = fn(*args, **kwargs)
+            for key in ('lines', 'records', 'skipped', 'bytes'):
+                self.count(key, stats.get(key, 0))
+            if stats.get('cached'):
+                self.count(hit)
+            return stats
+        return wrapper
+
+    def _count_skipped(self, fn):
+        @functools.wraps(fn)
+        def wrapper(line):
+            record = fn(line)
+            if record is None:
+                self.count('blank_lines' if not line.strip() else 'malformed_lines')
+            return record
+        return wrapper
+
+    def _count_skipped_columns(self, fn):
+        @functools.wraps(fn)
+        def wrapper(lines, dates):
+            columns = fn(lines, dates)
+            skipped = len(lines) - (0 if columns is None else len(columns[0]))
+            if skipped:
+                blank = sum(1 for line in lines if not line.strip())
+                if blank:
+                    self.count('blank_lines', blank)
+                if skipped > blank:
+                    self.count('malformed_lines', skipped - blank)
+            return columns
+        return wrapper
+
+    def _count_dedup(self, fn):
+        @functools.wraps(fn)
+        def wrapper(store, instance):
+            dropped = fn(store, instance)
+            if dropped is not None:
+                self.count('dedup_replaced')
+            return dropped
+        return wrapper
+
+    def _count_new_ids(self, fn):
+        names = {id(lookup): name for name, lookup in LOOKUP_TABLES.items()}
+        new_ids = self.new_ids
+
+        @functools.wraps(fn)
+        def wrapper(lookup, nkey, *args):
+            before = lookup._next
+            nid = fn(lookup, nkey, *args)
+            if lookup._next != before:
+                name = names.get(id(lookup), 'other')
+                new_ids[name] = new_ids.get(name, 0) + 1
+            return nid
+        return wrapper
+
+    def _count_export(self, fn):
+        @functools.wraps(fn)
+        def wrapper(output_file, *args, **kwargs):
+            row_counts = fn(output_file, *args, **kwargs)
+            self.count('workbooks')
+            for sheet, rows in row_counts.items():
+                self.count(f'rows.{sheet}', rows)
+            try:
+                self.count('bytes_written', os.path.getsize(output_file))
+            except OSError:
+                pass
+            return row_counts
+        return wrapper
+
+    # --- reporting ---
+    def report(self):
+        """The collected timings and counters as a JSON-ready dict."""
+        wall = self._wall + (time.perf_counter() - self._started if self._started is not None else 0.0)
+        stages = {stage: {'calls': calls, 'seconds': round(seconds, 6)}
+                  for stage, (calls, seconds) in self.timers.items() if calls}
+
+        def seconds(stage):
+            return self.timers.get(stage, (0, 0.0))[1]
+
+        # time not covered by a timed stage, for the stages that include others
+        derived = {}
+        if seconds('ingest_record'):
+            derived['(tables)'] = seconds('ingest_record') - seconds('filter_init')
+        if seconds('parse_line') and seconds('load'):
+            derived['(read, decode)'] = seconds('load') - sum(
+                seconds(s) for s in ('snapshot_load', 'parse_line', 'ingest_record', 'ingest_columns',
+                                     'merge_chunk', 'progress', 'snapshot_save'))
+        for stage, value in derived.items():
+            stages[stage] = {'calls': None, 'seconds': round(max(0.0, value), 6)}
+        return {'wall_seconds': round(wall, 6), 'stages': stages, 'counters': dict(self.counters),
+                'new_ids': dict(self.new_ids),
+                'lookups': LookupMemory(self.counters.get('records') or None)}
+
+    def format_text(self, report=None):
+        report = report or self.report()
+        stages = report['stages']
+        lines = [f"HWFilter stats: {report['wall_seconds']:.3f}s wall",
+                 f"{'stage':<28}{'calls':>10}{'seconds':>12}"]
+        order = [name for name, _depth in _STAGE_TREE]
+        depth = dict(_STAGE_TREE)
+        for stage in order + sorted(set(stages) - set(order)):
+            if stage in stages:
+                entry = stages[stage]
+                calls = '' if entry['calls'] is None else entry['calls']
+                lines.append(f"{'  ' * depth.get(stage, 0) + stage:<28}{calls:>10}{entry['seconds']:>12.3f}")
+        if report['counters']:
+            lines.append("counters")
+            lines += [f"  {name:<26}{value:>10}" for name, value in sorted(report['counters'].items())]
+        if report['new_ids']:
+            lines.append("new ids per lookup table")
+            lines += [f"  {name:<26}{value:>10}" for name, value in sorted(report['new_ids'].items())]
+        lines.append("lookup tables")
+        lines += FormatLookupMemory(report['lookups'])
+        return '\n'.join(lines)
+
+    def emit(self, dest='text'):
+        """Write the report: dest 'text' / '1' (stderr), 'json' (stderr), or a file path
+        (JSON when it ends in .json, text otherwise)."""
+        report = self.report()
+        as_json = dest == 'json' or str(dest).lower().endswith('.json')
+        text = json.dumps(report, indent=2) if as_json else self.format_text(report)
+        if dest in ('text', '1', 'json'):
+            print(text, file=sys.stderr)
+        else:
+            with open(dest, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+
+
+# The enabled Instrumentation, if any (see Instrumentation.enable)
+STATS = None
 
 #endregion
 
+#region Command Line Functions
+
+# Exit codes for the headless batch mode
+EXIT_OK = 0
+EXIT_INPUT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_EXPORT_ERROR = 3
+
+_PERIOD_RE = re.compile(r"^(all|\d{4}-\d{2}|\d{4}-\d{2}-\d{2})$")
+
+
+def parse_lookup_policy(s):
+    """Convert a CLI 'NAME=POLICY' (e.g. 'time=eager') to a SetLookupPolicy (name, policy) pair."""
+    name, sep, policy = s.partition('=')
+    policy = policy.strip().lower()
+    if not sep or policy not in LOOKUP_POLICIES:
+        raise argparse.ArgumentTypeError(
+            f"invalid lookup policy {s!r} (expected NAME={'|'.join(LOOKUP_POLICIES)}, e.g. time=eager)")
+    try:
+        return _policy_lookup_name(name), policy
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_period(s):
+    """Convert a CLI period ('all', 'YYYY-MM', 'YYYY-MM-DD' or 'FROM..TO') to an ExportData argument.
+
+    Ranges are returned as a (date_from, date_to) tuple.
+    """
+    s = s.strip()
+    if '..' in s:
+        try:
+            return parse_date_range(s)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    if not _PERIOD_RE.match(s):
+        raise argparse.ArgumentTypeError(f"invalid period {s!r} (expected YYYY-MM, YYYY-MM-DD, FROM..TO or all)")
+    if s == 'all':
+        return None
+    try:
+        if len(s) == 7:
+            datetime.date(int(s[:4]), int(s[5:]), 1)  # the month must be 01-12
+            return s
+        return datetime.date.fromisoformat(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {s!r}")
+
+
+def parse_month_range(s):
+    """Expand 'YYYY-MM..YYYY-MM' into the list of 'YYYY-MM' periods it covers."""
+    m = re.match(r"^(\d{4})-(\d{2})\.\.(\d{4})-(\d{2})$", s.strip())
+    if not m:
+        raise argparse.ArgumentTypeError(f"invalid month range {s!r} (expected YYYY-MM..YYYY-MM)")
+    y, mo, y2, mo2 = map(int, m.groups())
+    if not (1 <= mo <= 12 and 1 <= mo2 <= 12) or (y, mo) > (y2, mo2):
+        raise argparse.ArgumentTypeError(f"invalid month range {s!r}")
+    months = []
+    while (y, mo) <= (y2, mo2):
+        months.append(f"{y:04d}-{mo:02d}")
+        y, mo = (y + 1, 1) if mo == 12 else (y, mo + 1)
+    return months
+
+
+def CliMain(argv=None):
+    """Headless batch mode: parse hw.txt and export one workbook per period.
+
+    Never imports tkinter, so it runs on display-less hosts and from cron.
+    Returns a process exit code (see EXIT_*).
+    """
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description='Export hw.txt login data to relational Excel workbooks without the GUI.')
+    parser.add_argument('-i', '--input', dest='inputs', action='append', default=[], metavar='INPUT',
+                        help='input file, glob pattern or directory, plain or gzip/bz2/xz compressed '
+                             '(default: hw.txt); may be repeated')
+    parser.add_argument('-o', '--output-dir', default='.', help='directory for the xlsx files (default: .)')
+    parser.add_argument('-p', '--period', dest='periods', action='append', type=parse_period, default=[],
+                        metavar='PERIOD', help='YYYY-MM, YYYY-MM-DD, FROM..TO or all; may be repeated')
+    parser.add_argument('-m', '--months', action='append', type=parse_month_range, default=[],
+                        metavar='FROM..TO', help='one workbook per month, e.g. 2023-01..2024-12; may be repeated')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help='parse and export in N worker processes (0 = one per CPU, parsing in one process '
+                             f'below {PARALLEL_MIN_WORKERS} CPUs; default: 1)')
+    parser.add_argument('--follow', type=float, metavar='SECONDS',
+                        help='keep running: poll the input every SECONDS and re-export when lines are appended '
+                             '(or the file was edited); SIGHUP forces a reload of the changed blocks')
+    parser.add_argument('--engine', choices=READER_ENGINES, default='lines',
+                        help='input reader for single-process loads: lines (default) or columnar '
+                             '(memory-mapped, ingests blocks of records column by column)')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help="don't read or write the <input>.snapshot cache of parsed tables")
+    parser.add_argument('--db', metavar='PATH',
+                        help='store the tables in a SQLite database at PATH and export from it; '
+                             'the input is only parsed again when it changed')
+    parser.add_argument('--stats', nargs='?', const='text', default=os.environ.get('HWFILTER_STATS') or None,
+                        metavar='DEST',
+                        help='report stage timings and counters at the end: text (default) or json on '
+                             'stderr, or a file (JSON if it ends in .json); also HWFILTER_STATS=DEST')
+    parser.add_argument('--ids', dest='lookup_policies', action='append', type=parse_lookup_policy, default=[],
+                        metavar='NAME=POLICY',
+                        help='when the date, time, free_total and notes lookups assign ids: lazy (default, '
+                             'only when read) or eager (while parsing); may be repeated')
+    args = parser.parse_args(argv)
+    periods = args.periods + [m for months in args.months for m in months]
+    if not periods:
+        parser.error('at least one --period or --months is required')
+    if args.db and args.follow:
+        parser.error('--follow cannot be combined with --db')
+    for name, policy in args.lookup_policies:
+        SetLookupPolicy(name, policy)
+
+    if not args.stats:
+        return _cli_run(args, periods)
+    instrumentation = Instrumentation().enable()
+    try:
+        return _cli_run(args, periods)
+    finally:
+        instrumentation.disable()
+        instrumentation.emit(args.stats)
+
+
+def _cli_run(args, periods):
+    """CliMain after argument parsing: load, export, and follow if asked."""
+    if not os.path.isdir(args.output_dir):
+        print(f"error: output directory not found: {args.output_dir}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        files = InputFiles(args.inputs or ['hw.txt'])
+    except FileNotFoundError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+    source_name = files[0] if len(files) == 1 else f"{len(files)} input files"
+    if len(files) > 1 and (args.db or args.follow):
+        print(f"error: {'--db' if args.db else '--follow'} needs a single input file", file=sys.stderr)
+        return EXIT_USAGE
+    if args.follow and os.path.isfile(files[0]) and _is_compressed(files[0]):
+        print("error: --follow needs an uncompressed input file", file=sys.stderr)
+        return EXIT_USAGE
+
+    t0 = time.perf_counter()
+    try:
+        if args.db:
+            stats = LoadDatabase(files[0], args.db)
+        elif len(files) > 1:
+            stats = LoadFiles(files, workers=args.workers, engine=args.engine)
+        else:
+            stats = LoadData(files[0], workers=args.workers, cache=args.cache,
+                             complete_lines=bool(args.follow), engine=args.engine)
+    except FileNotFoundError as e:
+        print(f"error: input file not found: {e.filename or source_name}", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+    except sqlite3.Error as e:
+        print(f"error: database {args.db}: {e}", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+    except Exception as e:
+        print(f"error: failed to read {source_name}: {e}", file=sys.stderr)
+        return EXIT_INPUT_ERROR
+    elapsed = time.perf_counter() - t0
+    source = 'read'
+    if stats.get('cached'):
+        source = f'{args.db} already holds' if args.db else 'loaded snapshot of'
+    print(f"{source} "
+          f"{stats['lines']} lines ({stats['records']} records, {stats['skipped']} skipped) "
+          f"in {elapsed:.2f}s ({stats['lines'] / max(elapsed, 1e-9):.0f} lines/s, "
+          f"{stats['bytes'] / 1048576 / max(elapsed, 1e-9):.1f} MB/s)")
+    for f in stats.get('files', ()):
+        print(f"  {f['path']}: {f['lines']} lines ({f['records']} records, {f['skipped']} skipped) "
+              f"in {f['seconds']:.2f}s")
+
+    status = EXIT_OK
+    t0 = time.perf_counter()
+    last = [t0]
+    written = [0]
+
+    def on_done(period, output_file, rows):
+        nonlocal status
+        now = time.perf_counter()
+        elapsed, last[0] = now - last[0], now
+        if isinstance(rows, Exception):
+            print(f"error: export of {period or 'all'} failed: {rows}", file=sys.stderr)
+            status = EXIT_EXPORT_ERROR
+            return
+        total = sum(rows.values())
+        written[0] += total
+        if args.workers == 1:
+            print(f"wrote {output_file}: {total} rows ({rows.get('Login', 0)} logins) "
+                  f"in {elapsed:.2f}s ({total / max(elapsed, 1e-9):.0f} rows/s)")
+        else:
+            # workbooks finish concurrently, so only the batch total is timed
+            print(f"wrote {output_file}: {total} rows ({rows.get('Login', 0)} logins)")
+
+    def export():
+        nonlocal t0
+        t0 = last[0] = time.perf_counter()
+        written[0] = 0
+        results = ExportPeriods(periods, args.output_dir, workers=args.workers, progress=on_done,
+                                db_path=args.db)
+        if len(results) > 1:
+            elapsed = time.perf_counter() - t0
+            print(f"exported {len(results)} workbooks, {written[0]} rows in {elapsed:.2f}s "
+                  f"({written[0] / max(elapsed, 1e-9):.0f} rows/s)")
+
+    export()
+
+    if args.follow:
+        follower = TailIngest(files[0])
+        follower.attach(stats['bytes'])
+        # SIGHUP (where there is one) asks for a reload through the changed blocks
+        reload_requested = [False]
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, lambda _signum, _frame: reload_requested.__setitem__(0, True))
+        try:
+            while True:
+                time.sleep(args.follow)
+                try:
+                    if reload_requested[0]:
+                        reload_requested[0] = False
+                        reloaded = follower.reload()
+                        print(f"reloaded {files[0]}: {reloaded['records']} records, "
+                              f"{reloaded['reparsed']} of {reloaded['blocks']} blocks parsed")
+                        export()
+                        continue
+                    result = follower.poll()
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"warning: could not read {files[0]}: {e}", file=sys.stderr)
+                    continue
+                if result['reloaded']:
+                    print(f"{files[0]} was truncated, replaced or edited: reloaded {result['records']} records")
+                elif result['records']:
+                    print(f"ingested {result['records']} appended records ({result['skipped']} skipped)")
+                else:
+                    continue
+                export()
+        except KeyboardInterrupt:
+            pass
+    return status
+
 #endregion
 
 def Main():
-    DataReader()
-    TkinterMain()
+    # HWFILTER_DB=path/to/hw.db makes "Generate Excel" export from a SQLite copy of the tables
+    db_path = os.environ.get('HWFILTER_DB') or None
+    # HWFILTER_INPUT=files, globs or directories (os.pathsep-separated) to read instead of hw.txt
+    inputs = (os.environ.get('HWFILTER_INPUT') or 'hw.txt').split(os.pathsep)
+    # HWFILTER_STATS=text|json|path reports stage timings and counters when the window closes
+    stats_dest = os.environ.get('HWFILTER_STATS') or None
+    instrumentation = Instrumentation().enable() if stats_dest else None
+    try:
+        TkinterMain(db_path=db_path, loader=BackgroundLoad(inputs, db_path=db_path))
+    finally:
+        if instrumentation is not None:
+            instrumentation.disable()
+            instrumentation.emit(stats_dest)
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(CliMain())
     Main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bench  # noqa: E402
+import main  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def hw_file(tmp_path_factory):
+    """A small seeded hw.txt: 3000 lines over three months, some of them blank or malformed."""
+    path = tmp_path_factory.mktemp('input') / 'hw.txt'
+    bench.generate(str(path), 3000, seed=1, users=40, pcs=60, start=datetime.date(2023, 4, 1), days=90,
+                   malformed=0.05)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """Every test starts from empty tables and the default lookup policies."""
+    policies = main.LookupPolicies()
+    main.ResetData()
+    yield
+    main.ResetData()
+    main._set_lookup_policies(policies)
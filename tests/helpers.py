@@ -0,0 +1,61 @@
+"""Helpers shared by the tests."""
+import os
+import time
+
+from openpyxl import load_workbook
+
+import main
+
+
+def write(path, lines, mode='wb'):
+    with open(path, mode) as f:
+        f.writelines(lines)
+
+
+def age(path, seconds=3600):
+    """Backdate path's mtime, as for a file last written a while ago."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def full_load(path):
+    main.ResetData()
+    main.LoadData(path, complete_lines=True)
+    return main._state()
+
+
+def same_length_edit(line):
+    """line with one character of its user name changed, same length."""
+    fields = line.split(b';')
+    fields[4] = fields[4][:-1] + (b'x' if fields[4][-1:] != b'x' else b'y')
+    return b';'.join(fields)
+
+
+def workbook_values(path):
+    """{sheet title: rows of cell values} of an exported workbook."""
+    wb = load_workbook(path, read_only=True)
+    try:
+        return {ws.title: [tuple(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+def tables():
+    """main._state() with every mapping as a list of items, so the comparison also covers id order."""
+    state = main._state()
+    return {
+        'lookups': {name: (list(mapping.items()), list(values))
+                    for name, (mapping, values) in state['lookups'].items()},
+        'tables': {name: list(rows.items()) for name, rows in state['tables'].items()},
+        'login': {key: list(value.items()) if isinstance(value, dict) else value
+                  for key, value in state['login'].items()},
+        'login_next': state['login_next'],
+        'latest': state['latest'],
+    }
+
+
+def reference(path):
+    """LoadData's stats and tables() for path, loaded on its own."""
+    main.ResetData()
+    stats = main.LoadData(path)
+    return stats, tables()
@@ -0,0 +1,43 @@
+import argparse
+import datetime
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("all", None),
+    ("2023-05", "2023-05"),
+    ("2023-12", "2023-12"),
+    ("2023-05-06", datetime.date(2023, 5, 6)),
+    ("2024-01..2024-03", (datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))),
+    ("2024-02..2024-02", (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29))),
+    ("2023-12-30..", (datetime.date(2023, 12, 30), None)),
+    ("..2023-12", (None, datetime.date(2023, 12, 31))),
+])
+def test_parse_period(text, expected):
+    assert main.parse_period(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "2023-13", "2023-00", "2023-5", "2023-02-30", "2023-13-01", "23-05", "may",
+    "2023-13..2024-01", "2023-01..2023-13", "2023-00..", "2023-03..2023-01", "2023-02-30..2023-03",
+])
+def test_parse_period_rejects(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        main.parse_period(text)
+
+
+@pytest.mark.parametrize("text", ["2023-13..2024-01", "2023-00..2023-02", "2023-05..2023-01", "2023-05"])
+def test_parse_month_range_rejects(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        main.parse_month_range(text)
+
+
+def test_cli_rejects_invalid_month(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main.CliMain(['-i', str(tmp_path / 'hw.txt'), '-o', str(tmp_path), '-p', '2023-13'])
+    assert exc.value.code == main.EXIT_USAGE
+    assert "invalid date '2023-13'" in capsys.readouterr().err
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,73 @@
+import datetime
+import shutil
+
+import pytest
+
+import main
+from helpers import workbook_values
+
+PERIODS = {
+    'month': ('2023-05', None, None),
+    'quarter': (None, datetime.date(2023, 4, 1), datetime.date(2023, 6, 30)),
+    'year': (None, datetime.date(2023, 1, 1), datetime.date(2023, 12, 31)),
+}
+
+
+@pytest.fixture
+def input_file(hw_file, tmp_path):
+    path = tmp_path / 'hw.txt'
+    shutil.copy(hw_file, path)
+    return str(path)
+
+
+def test_cli_db_load_then_cache_hit(input_file, tmp_path, capsys):
+    db_path, out = str(tmp_path / 'hw.db'), tmp_path / 'out'
+    out.mkdir()
+    argv = ['-i', input_file, '--db', db_path, '-o', str(out), '-p', '2023-05']
+    assert main.CliMain(argv) == main.EXIT_OK
+    first = capsys.readouterr().out
+    assert first.startswith('read ')
+    exported = workbook_values(out / 'hw_relational_2023-05.xlsx')
+
+    main.ResetData()
+    assert main.CliMain(argv) == main.EXIT_OK
+    second = capsys.readouterr().out
+    assert second.startswith(f'{db_path} already holds ')
+    assert first.split(' lines')[0].split()[-1] == second.split(' lines')[0].split()[-1]
+    assert workbook_values(out / 'hw_relational_2023-05.xlsx') == exported
+
+
+def test_load_database_cache_hit(input_file, tmp_path):
+    db_path = str(tmp_path / 'hw.db')
+    stats = main.LoadDatabase(input_file, db_path)
+    assert not stats.get('cached')
+    assert len(main.LOGIN_TABLE) == 0  # the logins live in the database
+    assert main.LoadDatabase(input_file, db_path) == dict(stats, cached=True)
+    with open(input_file, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert not main.LoadDatabase(input_file, db_path).get('cached')
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_export_database_matches_export_data(input_file, tmp_path, period):
+    d, date_from, date_to = PERIODS[period]
+    db_dir, memory_dir = tmp_path / 'db', tmp_path / 'memory'
+    db_dir.mkdir()
+    memory_dir.mkdir()
+    db_path = str(tmp_path / 'hw.db')
+    main.LoadDatabase(input_file, db_path, flush_rows=500)
+    db_file, db_rows = main.ExportDatabase(db_path, d, str(db_dir), date_from, date_to)
+
+    main.ResetData()
+    main.LoadData(input_file)
+    memory_file, memory_rows = main.ExportData(d, str(memory_dir), date_from, date_to)
+    assert db_rows == memory_rows
+    assert db_rows['Login'] > 0
+    assert workbook_values(db_file) == workbook_values(memory_file)
+
+
+def test_period_filter_of_last_month_there_is():
+    last = datetime.date(9999, 12, 31).toordinal()
+    _cond, params = main._db_period_filter('9999-12')
+    assert params[:2] == (datetime.date(9999, 12, 1).toordinal(), last)
+    assert main._db_period_filter(None, datetime.date(9999, 12, 1)) == ("date BETWEEN ? AND ?", params[:2])
@@ -0,0 +1,70 @@
+import pytest
+
+import main
+from helpers import reference, tables
+
+
+@pytest.fixture(params=['lazy', 'eager'])
+def policy(request):
+    for name in main.LookupPolicies():
+        main.SetLookupPolicy(name, request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('engine', main.READER_ENGINES)
+def test_engines_build_the_same_tables(hw_file, policy, engine):
+    expected_stats, expected = reference(hw_file)
+    main.ResetData()
+    stats = main.LoadData(hw_file, engine=engine)
+    assert stats == expected_stats
+    assert tables() == expected
+
+
+def test_small_blocks_build_the_same_tables(hw_file):
+    _stats, expected = reference(hw_file)
+    main.ResetData()
+    for columns in main.ColumnReader(hw_file, block_size=4096):
+        main.IngestColumns(columns)
+    assert tables() == expected
+
+
+@pytest.mark.parametrize('engine', main.READER_ENGINES)
+def test_line_endings(hw_file, tmp_path, engine):
+    """CRLF reads like LF; a bare CR is not a line break, so such a file is one line."""
+    expected_stats, expected = reference(hw_file)
+    with open(hw_file, 'rb') as f:
+        data = f.read()
+    crlf = tmp_path / 'crlf.txt'
+    crlf.write_bytes(data.replace(b'\n', b'\r\n'))
+    main.ResetData()
+    stats = main.LoadData(str(crlf), engine=engine)
+    assert {k: stats[k] for k in ('lines', 'records', 'skipped')} == \
+        {k: expected_stats[k] for k in ('lines', 'records', 'skipped')}
+    assert tables() == expected
+
+    cr = tmp_path / 'cr.txt'
+    cr.write_bytes(data.replace(b'\n', b'\r'))
+    main.ResetData()
+    assert main.LoadData(str(cr), engine=engine)['lines'] == 1
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_workers_build_the_same_tables(hw_file, policy, workers):
+    expected_stats, expected = reference(hw_file)
+    main.ResetData()
+    stats = main.LoadData(hw_file, workers=workers)
+    assert {k: stats[k] for k in expected_stats} == expected_stats
+    assert tables() == expected
+
+
+@pytest.mark.parametrize('cpus, pool', [(main.PARALLEL_MIN_WORKERS - 1, False), (main.PARALLEL_MIN_WORKERS, True)])
+def test_one_worker_per_cpu_stays_serial_below_break_even(hw_file, monkeypatch, cpus, pool):
+    _, expected = reference(hw_file)
+    calls = []
+    parallel = main.ParallelLoadData
+    monkeypatch.setattr(main.os, 'cpu_count', lambda: cpus)
+    monkeypatch.setattr(main, 'ParallelLoadData', lambda *a, **kw: calls.append(kw['workers']) or parallel(*a, **kw))
+    main.ResetData()
+    main.LoadData(hw_file, workers=0)
+    assert calls == ([cpus] if pool else [])
+    assert tables() == expected
@@ -0,0 +1,68 @@
+import datetime
+
+import pytest
+
+import main
+from helpers import workbook_values
+
+PERIODS = [None, '2023-05', datetime.date(2023, 5, 6), (datetime.date(2023, 4, 15), datetime.date(2023, 5, 20)),
+           (None, datetime.date(2023, 4, 30)), '2024-01']
+
+
+def test_split_matches_select(hw_file):
+    main.LoadData(hw_file)
+    periods = [main._period_args(p) for p in PERIODS]
+    for args, (positions, user_ids, pc_ids) in zip(periods, main.SplitLoginPositions(periods)):
+        expected = main.SelectLoginPositions(*args)
+        assert (positions is None and expected is None) or list(positions) == list(expected)
+        assert user_ids == main.LOGIN_TABLE.id_set('user_id', expected)
+        assert pc_ids == main.LOGIN_TABLE.id_set('pc_id', expected)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_periods_match_export_data(hw_file, tmp_path, workers):
+    main.LoadData(hw_file)
+    single_dir = tmp_path / 'single'
+    single_dir.mkdir()
+    expected = {}
+    for period in PERIODS:
+        d, date_from, date_to = main._period_args(period)
+        output_file, _rows = main.ExportData(d, str(single_dir), date_from, date_to)
+        expected[period] = workbook_values(output_file)
+    batch_dir = tmp_path / 'batch'
+    batch_dir.mkdir()
+    results = main.ExportPeriods(PERIODS, str(batch_dir), workers=workers)
+    assert [period for period, _file, _rows in results] == PERIODS
+    for period, output_file, rows in results:
+        assert not isinstance(rows, Exception)
+        values = workbook_values(output_file)
+        assert values == expected[period]
+        assert rows['Login'] == len(values['Login']) - 1
+
+
+def test_split_last_month_there_is():
+    rows = [(1, datetime.date(9999, 11, 30), None, 1, 1, None), (2, datetime.date(9999, 12, 31), None, 2, 1, None)]
+    for row in rows:
+        main.LOGIN_TABLE.append(*row)
+    periods = [('9999-12', None, None), ('9999-11', None, None)]
+    assert [(list(p), u, c) for p, u, c in main.SplitLoginPositions(periods)] == [([1], {1}, {2}), ([0], {1}, {1})]
+
+
+def test_old_entry_points_wrap_load_and_export(hw_file, tmp_path, monkeypatch):
+    from tkinter import messagebox
+    shown = []
+    monkeypatch.setattr(messagebox, 'showinfo', lambda *args: shown.append(('info',) + args))
+    monkeypatch.setattr(messagebox, 'showerror', lambda *args: shown.append(('error',) + args))
+    monkeypatch.chdir(tmp_path)
+
+    assert main.DataReader(str(tmp_path / 'missing.txt')) is None
+    assert shown.pop()[0] == 'error'
+    stats = main.DataReader(hw_file)
+    assert stats['records'] == len(main.LOGIN_TABLE)
+
+    output_file = main.Extractor('2023-05')
+    assert output_file == str(tmp_path / 'hw_relational_2023-05.xlsx')
+    assert shown.pop() == ('info', 'Success', f'Excel exported: {output_file}')
+    (tmp_path / 'new').mkdir()
+    expected, _rows = main.ExportData('2023-05', str(tmp_path / 'new'))
+    assert workbook_values(output_file) == workbook_values(expected)
@@ -0,0 +1,80 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+import main
+from helpers import reference, tables
+
+COMPRESSORS = {'gz': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+
+def split(hw_file, directory, suffixes=('txt', 'txt', 'txt')):
+    """hw_file cut into len(suffixes) consecutive parts hw0.<suffix>, hw1.<suffix>, ... in directory."""
+    with open(hw_file, 'rb') as f:
+        lines = f.readlines()
+    size = -(-len(lines) // len(suffixes))
+    parts = []
+    for n, suffix in enumerate(suffixes):
+        data = b''.join(lines[n * size:(n + 1) * size])
+        part = directory / f'hw{n}.{suffix}'
+        part.write_bytes(COMPRESSORS[suffix](data) if suffix in COMPRESSORS else data)
+        parts.append(str(part))
+    return parts, lines
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('engine', main.READER_ENGINES)
+def test_split_input_builds_the_same_tables(hw_file, tmp_path, workers, engine):
+    _stats, expected = reference(hw_file)
+    parts, lines = split(hw_file, tmp_path)
+    main.ResetData()
+    stats = main.LoadFiles(parts, workers=workers, engine=engine)
+    assert stats['lines'] == len(lines)
+    assert tables() == expected
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('engine', main.READER_ENGINES)
+@pytest.mark.parametrize('codec', COMPRESSORS)
+def test_compressed_input_builds_the_same_tables(hw_file, tmp_path, codec, engine, workers):
+    expected_stats, expected = reference(hw_file)
+    path = tmp_path / f'hw.txt.{codec}'
+    with open(hw_file, 'rb') as f:
+        path.write_bytes(COMPRESSORS[codec](f.read()))
+    main.ResetData()
+    stats = main.LoadData(str(path), engine=engine, workers=workers)  # decompressed in this process
+    assert stats == expected_stats
+    assert tables() == expected
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('engine', main.READER_ENGINES)
+def test_directory_and_glob_inputs(hw_file, tmp_path, engine, workers):
+    _stats, expected = reference(hw_file)
+    dumps = tmp_path / 'dumps'
+    dumps.mkdir()
+    parts, lines = split(hw_file, dumps, ('gz', 'txt', 'bz2', 'xz'))
+    (dumps / 'readme.md').write_text('not an input\n')
+    (dumps / 'old.txt').mkdir()  # not a file
+
+    assert main.InputFiles(str(dumps)) == parts
+    main.ResetData()
+    stats = main.LoadFiles([str(dumps)], workers=workers, engine=engine)
+    assert [f['path'] for f in stats['files']] == parts
+    assert stats['lines'] == len(lines)
+    assert tables() == expected
+
+    # a glob, with a file also named on its own: still read once, in the order first given
+    main.ResetData()
+    stats = main.LoadFiles([parts[0], str(dumps / 'hw*')], workers=workers, engine=engine)
+    assert [f['path'] for f in stats['files']] == parts
+    assert tables() == expected
+
+
+def test_inputs_that_match_nothing(tmp_path):
+    (tmp_path / 'empty').mkdir()
+    for pattern in (str(tmp_path / 'empty'), str(tmp_path / '*.gz')):
+        with pytest.raises(FileNotFoundError):
+            main.InputFiles(pattern)
@@ -0,0 +1,116 @@
+import datetime
+import pickle
+
+import main
+
+D = datetime.date
+T = datetime.time
+
+ROWS = [
+    (1, D(2023, 5, 1), T(8, 0, 0), 3, 4, '120GB'),
+    (2, D(2023, 5, 2), T(23, 59, 59), 3, 5, '120GB'),
+    (3, None, None, None, None, None),
+    # values that don't fit the typed columns go to the overflow dict
+    (4, '2023.13.01', T(8, 0, 0, 500), 'PC-7', 2**31, 512),
+    (5, datetime.datetime(2023, 5, 3, 9, 0), '9:00', -1, 0, ''),
+]
+
+
+def table_of(rows):
+    table = main.LoginTable()
+    for row in rows:
+        table.append(*row)
+    return table
+
+
+def test_rows_round_trip():
+    table = table_of(ROWS)
+    assert list(table.rows()) == ROWS
+    assert table[2] == dict(zip(main.LoginTable.FIELDS, ROWS[1]))
+    assert table.get(6) is None and 6 not in table and 4 in table
+    assert len(table) == 5 and list(table) == [1, 2, 3, 4, 5]
+
+
+def test_typed_columns_and_overflow():
+    table = table_of(ROWS)
+    assert table._date.typecode == 'i' and table._ids.typecode == 'q'
+    assert list(table._date[:3]) == [D(2023, 5, 1).toordinal(), D(2023, 5, 2).toordinal(), main.LoginTable._NONE]
+    assert list(table._time[:2]) == [8 * 3600, 23 * 3600 + 59 * 60 + 59]
+    assert list(table._pc[:3]) == [3, 3, 0]  # 0 = None
+    assert table._free_pool == ['120GB', '']  # one pooled copy per distinct string
+    assert set(table._extra) == {4, 5}
+    assert table._extra[4] == {'date': '2023.13.01', 'time': T(8, 0, 0, 500), 'pc_id': 'PC-7',
+                               'user_id': 2**31, 'free_disk_space': 512}
+    assert table._extra[5] == {'date': datetime.datetime(2023, 5, 3, 9, 0), 'time': '9:00', 'pc_id': -1,
+                               'user_id': 0}
+
+
+def test_extend_matches_append():
+    expected = table_of(ROWS).__getstate__()
+    table = main.LoginTable()
+    table.extend(1, [row[1:] for row in ROWS])
+    assert table.__getstate__() == expected
+    table = main.LoginTable()
+    table.extend_columns(1, *zip(*[row[1:] for row in ROWS]))
+    assert table.__getstate__() == expected
+
+
+def test_overwrite_insert_delete_and_pickle():
+    table = table_of(ROWS[:2] + ROWS[3:])
+    table[3] = dict(zip(main.LoginTable.FIELDS, ROWS[2]))  # inserted in id order
+    table[4] = {'date': D(2023, 6, 1), 'time': T(7, 0), 'pc_id': 1, 'user_id': 1, 'free_disk_space': '1GB'}
+    assert list(table) == [1, 2, 3, 4, 5]
+    assert 4 not in table._extra and table[4]['date'] == D(2023, 6, 1)
+    table.append(2, *ROWS[0][1:])  # an id that isn't new overwrites its row
+    assert table[2]['date'] == D(2023, 5, 1) and len(table) == 5
+    del table[5]
+    table.discard_many([1, 99])
+    assert list(table) == [2, 3, 4] and table._extra == {}
+    copy = pickle.loads(pickle.dumps(table))
+    assert list(copy.rows()) == list(table.rows())
+
+
+DAYS = [D(2023, 12, 31), D(2024, 1, 1), D(2024, 1, 31), D(2024, 2, 1), D(2024, 2, 29), D(2024, 3, 1),
+        D(1, 1, 1), D(9999, 12, 1), D(9999, 12, 31)]
+
+
+def dated(days, first=1):
+    return [(lid, day, T(12, 0), 1, 1, '1GB') for lid, day in enumerate(days, first)]
+
+
+def test_date_index_across_period_boundaries():
+    table = table_of(dated(DAYS[::-1]))  # newest first: positions and date order differ
+    position = {day: pos for pos, day in enumerate(DAYS[::-1])}
+
+    def at(*days):
+        return sorted(position[day] for day in days)
+    assert table.select_month(2024, 1) == at(D(2024, 1, 1), D(2024, 1, 31))
+    assert table.select_month(2024, 2) == at(D(2024, 2, 1), D(2024, 2, 29))
+    assert table.select_month(2023, 12) == at(D(2023, 12, 31))
+    assert table.select_month(9999, 12) == at(D(9999, 12, 1), D(9999, 12, 31))
+    assert table.select_month(1, 1) == at(D(1, 1, 1))
+    assert table.select_month(2024, 4) == []
+    assert table.select_range(D(2024, 1, 31), D(2024, 2, 29)) == at(D(2024, 1, 31), D(2024, 2, 1), D(2024, 2, 29))
+    assert table.select_range(None, D(2023, 12, 31)) == at(D(1, 1, 1), D(2023, 12, 31))
+    assert table.select_range(D(2024, 3, 1), None) == at(D(2024, 3, 1), D(9999, 12, 1), D(9999, 12, 31))
+    assert table.select_day(D(2024, 2, 29)) == at(D(2024, 2, 29))
+
+
+def test_date_index_follows_appends_and_edits():
+    table = table_of(dated(DAYS[:3]) + [(4, '2024.01.15', None, 1, 1, None)])
+    assert table.select_month(2024, 1) == [1, 2]
+    table.extend(5, [row[1:] for row in dated([D(2024, 1, 20), D(2023, 12, 30)])])
+    assert table.select_month(2024, 1) == [1, 2, 4]
+    assert table.select_month(2023, 12) == [0, 5]
+    table[2] = {'date': D(2024, 2, 1)}
+    assert table.select_month(2024, 1) == [2, 4]
+    # rows without a datetime.date are outside the index
+    assert table.other_dates() == [(3, '2024.01.15')]
+
+
+def test_select_logins_of_last_month():
+    for row in dated(DAYS):
+        main.LOGIN_TABLE.append(*row)
+    assert [row[0] for row in main.SelectLogins('9999-12')] == [8, 9]
+    assert [row[0] for row in main.SelectLogins(None, D(9999, 12, 1), None)] == [8, 9]
+    assert main.parse_period('9999-11..9999-12') == (D(9999, 11, 1), D(9999, 12, 31))
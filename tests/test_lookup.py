@@ -0,0 +1,127 @@
+import datetime
+
+import pytest
+
+import main
+
+
+def test_reverse_index_keeps_first_value_given():
+    lookup = main.LookupTable()
+    assert lookup.get_or_create('Dell ') == 1
+    assert lookup.get_or_create('HP') == 2
+    assert lookup.get_or_create('dell') == 1
+    assert lookup.get_or_create(' DELL') == 1
+    assert (lookup.value(1), lookup.value(2)) == ('Dell ', 'HP')
+    assert lookup.values() == ['Dell ', 'HP']
+    assert lookup.keys() == ['dell', 'hp']
+    assert len(lookup) == 2 and lookup._next == 3
+    for nid in (0, 3, -1):
+        with pytest.raises(KeyError):
+            lookup.value(nid)
+
+
+def test_empty_values_and_dates():
+    lookup = main.LookupTable()
+    assert lookup.get_or_create(None) is None
+    assert lookup.get_or_create('') is None
+    assert lookup.get_or_create('   ') is None
+    nid = lookup.get_or_create(datetime.date(2023, 5, 1))
+    assert lookup.get_or_create('2023-05-01') == nid
+    assert lookup.value(nid) == datetime.date(2023, 5, 1)
+    # only str, date and time values are cached as given: 1 would also match 1.0 and True
+    assert lookup.get_or_create(1) != lookup.get_or_create(1.0)
+    assert 1 not in lookup._raw
+
+
+VALUES = ['b', 'a', 'B ', None, 'c', '', 'a', datetime.time(8, 0), 'A', '08:00:00', 3, 'c']
+
+
+def test_batch_creation_assigns_first_seen_order():
+    one_by_one = main.LookupTable()
+    expected = [one_by_one.get_or_create(v) for v in VALUES]
+    assert expected == [1, 2, 1, None, 3, None, 2, 4, 2, 4, 5, 3]
+    for method in ('get_or_create_many', 'get_or_create_column'):
+        lookup = main.LookupTable()
+        assert getattr(lookup, method)(VALUES) == expected
+        assert lookup.values() == one_by_one.values()
+    # the reverse index feeds back to the same ids
+    assert main.LookupTable().get_or_create_many(one_by_one.values()) == list(range(1, len(one_by_one) + 1))
+
+
+def test_raw_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(main, '_RAW_CACHE_SIZE', 4)
+    lookup = main.LookupTable()
+    values = [f'note {i}' for i in range(10)]
+    assert lookup.get_or_create_many(values) == list(range(1, 11))
+    assert len(lookup._raw) <= 4
+    assert lookup.get_or_create_many(values) == list(range(1, 11))
+    assert len(lookup) == 10
+
+
+def test_lookup_view_follows_its_lookup():
+    lookup = main.LookupTable()
+    view = main.LookupView(lookup, 'type')
+    assert len(view) == 0 and list(view) == [] and 1 not in view
+    lookup.get_or_create_many(['Laptop', 'Desktop', 'laptop'])
+    assert len(view) == 2
+    assert list(view) == list(view.keys()) == [1, 2]
+    assert view[2] == {'id': 2, 'type': 'Desktop'}
+    assert list(view.values()) == [{'id': 1, 'type': 'Laptop'}, {'id': 2, 'type': 'Desktop'}]
+    assert dict(view.items()) == {1: view[1], 2: view[2]}
+    assert 0 not in view and 3 not in view and '1' not in view
+    assert view.get(3) is None and view.get(3, 'none') == 'none'
+    with pytest.raises(KeyError):
+        view[3]
+
+
+def test_name_tables_are_views_of_the_loaded_lookups(hw_file):
+    main.LoadData(hw_file)
+    assert main.USER_TABLE.lookup is main.USER_LOOKUP
+    assert [row['name'] for row in main.USER_TABLE.values()] == main.USER_LOOKUP.values()
+    assert [row['type'] for row in main.DEVICE_TABLE.values()] == main.DEVICE_LOOKUP.values()
+
+
+def test_lazy_ids_are_assigned_on_read(hw_file):
+    assert main.LookupPolicies() == dict.fromkeys(
+        ('DATE_LOOKUP', 'TIME_LOOKUP', 'FREE_TOTAL_LOOKUP', 'NOTES_LOOKUP'), 'lazy')
+    main.LoadData(hw_file)
+    assert len(main.DATE_LOOKUP) == len(main.TIME_LOOKUP) == 0
+    latest = list(main.Filter.objectsArray)
+    first = latest[0]
+    assert first.login_date_id == 1 and first.login_time_id == 1
+    assert main.DATE_LOOKUP.value(1) == first.login_date
+    assert len(main.DATE_LOOKUP) == 1 and len(main.FREE_TOTAL_LOOKUP) == 0
+
+
+def test_eager_ids_are_assigned_while_loading(hw_file):
+    main.SetLookupPolicy('date', 'eager')
+    main.SetLookupPolicy('TIME_LOOKUP', 'eager')
+    assert main.LookupPolicies()['DATE_LOOKUP'] == 'eager'
+    main.LoadData(hw_file)
+    dates = [row[1] for row in main.LOGIN_TABLE.rows()]  # (id, date, time, ...)
+    assert main.DATE_LOOKUP.values() == list(dict.fromkeys(dates))
+    assert len(main.TIME_LOOKUP) > 0 and len(main.NOTES_LOOKUP) == 0
+    for obj in main.Filter.objectsArray:
+        assert main.DATE_LOOKUP.value(obj.login_date_id) == obj.login_date
+
+
+@pytest.mark.parametrize('name, policy', [('user', 'lazy'), ('date', 'sometimes'), ('nope', 'eager')])
+def test_set_lookup_policy_rejects(name, policy):
+    with pytest.raises(ValueError):
+        main.SetLookupPolicy(name, policy)
+
+
+def test_lookup_memory(hw_file):
+    main.SetLookupPolicy('free_total', 'eager')
+    main.LoadData(hw_file)
+    report = main.LookupMemory()
+    assert set(report) == set(main.LOOKUP_TABLES)
+    for name, entry in report.items():
+        assert entry['ids'] == len(main.LOOKUP_TABLES[name])
+        assert entry['policy'] == main.LOOKUP_TABLES[name].policy
+        assert entry['bytes'] > 0
+    assert report['FREE_TOTAL_LOOKUP']['high_cardinality']
+    assert not report['USER_LOOKUP']['high_cardinality']
+    assert report['NOTES_LOOKUP']['ids'] == 0 and not report['NOTES_LOOKUP']['high_cardinality']
+    text = main.FormatLookupMemory(report)
+    assert any(line.startswith('  FREE_TOTAL_LOOKUP') and line.endswith(' !') for line in text)
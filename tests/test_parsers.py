@@ -0,0 +1,58 @@
+import datetime
+
+import pytest
+
+import bench
+import main
+
+PARSERS = [
+    ('date', bench.DATE_EDGE_CASES, main.Filter._parse_date, lambda: main.DateColumn().parse),
+    ('time', bench.TIME_EDGE_CASES, main.Filter._parse_time, lambda: main.parse_time),
+    ('ram', bench.RAM_EDGE_CASES, main.Filter._parse_ram, lambda: main.parse_ram),
+]
+
+
+@pytest.mark.parametrize('name, cases, reference, make', PARSERS, ids=[p[0] for p in PARSERS])
+def test_edge_cases_match_reference(name, cases, reference, make):
+    # one parser per value, so each value can also be the first a DateColumn sees
+    for value in cases + cases[::-1]:
+        got, expected = make()(value), reference(value)
+        assert (got, type(got)) == (expected, type(expected)), value
+    shared = make()
+    for value in cases + cases[::-1]:
+        assert shared(value) == reference(value), value
+
+
+@pytest.mark.parametrize('fmt', ['%Y-%m-%d', '%Y.%m.%d', '%Y/%m/%d', '%d/%m/%Y', '%d-%m-%Y'])
+def test_date_column_layouts(fmt):
+    column = main.DateColumn()
+    days = [datetime.date(2023, 1, 1) + datetime.timedelta(days=n) for n in range(0, 800, 7)]
+    assert [column.parse(d.strftime(fmt)) for d in days] == days
+    # a value in another layout still parses as Filter._parse_date would
+    assert column.parse('2023-02-30') is None
+    assert column.parse(' 2023-05-06 ') == main.Filter._parse_date(' 2023-05-06 ')
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('07:08:09', datetime.time(7, 8, 9)),
+    ('7:8:9', datetime.time(7, 8, 9)),
+    (' 23:59:59 ', datetime.time(23, 59, 59)),
+    ('12:34', datetime.time(12, 34)),
+    ('12:34:56:78', datetime.time(12, 34, 56)),
+    ('24:00:00', None),
+    ('12:3x:00', None),
+    ('', None),
+    (None, None),
+    (datetime.time(1, 2, 3), datetime.time(1, 2, 3)),
+    (datetime.datetime(2023, 5, 6, 1, 2, 3), datetime.time(1, 2, 3)),
+])
+def test_parse_time(value, expected):
+    assert main.parse_time(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('8GB', 8), ('16gb', 16), (' 32GB ', 32), ('016GB', 16), ('8 GB', 8), ('8.5GB', 8),
+    ('GB', None), ('', None), (None, None),
+])
+def test_parse_ram(value, expected):
+    assert main.parse_ram(value) == main.Filter._parse_ram(value) == expected
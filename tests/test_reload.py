@@ -0,0 +1,60 @@
+import os
+
+import main
+from helpers import full_load, same_length_edit, write
+
+
+def test_reload_matches_full_load(tmp_path, hw_file):
+    with open(hw_file, 'rb') as f:
+        lines = f.readlines()
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines)
+    blocks = main.BlockReload(avg_lines=128)
+    first = blocks.load(path)
+    assert first['reparsed'] == first['blocks']
+    assert main._state() == full_load(path)
+
+    edited = list(lines)
+    edited[10] = same_length_edit(edited[10])
+    del edited[1500:1510]
+    edited[2500:2500] = lines[:3]
+    write(path, edited)
+    stats = blocks.load(path)
+    assert 0 < stats['reparsed'] < stats['blocks'] // 2
+    assert main._state() == full_load(path)
+
+
+def test_appends_keep_block_cache_current(tmp_path, hw_file):
+    with open(hw_file, 'rb') as f:
+        lines = f.readlines()
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:1000])
+    tail = main.TailIngest(path)
+    tail.blocks = main.BlockReload(avg_lines=128)
+    tail.attach(tail.reload()['bytes'])
+    for start, end in ((1000, 1001), (1001, 1400), (1400, 3000)):
+        write(path, lines[start:end], 'ab')
+        assert not tail.poll()['reloaded']
+    state = main._state()
+
+    stats = tail.reload()
+    assert stats['reparsed'] == 0
+    assert main._state() == state == full_load(path)
+
+
+def test_explicit_reload_of_same_size_edit(tmp_path, hw_file):
+    with open(hw_file, 'rb') as f:
+        lines = f.readlines()
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines)
+    tail = main.TailIngest(path)
+    tail.blocks = main.BlockReload(avg_lines=128)
+    tail.attach(tail.reload()['bytes'])
+    edited = list(lines)
+    edited[2000] = same_length_edit(edited[2000])
+    with open(path, 'r+b') as f:
+        f.writelines(edited)
+    assert os.path.getsize(path) == tail.offset
+    stats = tail.reload()
+    assert stats['reparsed'] == 1
+    assert main._state() == full_load(path)
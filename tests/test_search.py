@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import main
+
+
+def make_rows(n=2000, seed=3):
+    rnd = random.Random(seed)
+    rows = [(f"{rnd.randint(2022, 2024)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+             rnd.choice(['user', 'User', 'USER', 'admin', 'Ärzte']) + str(rnd.randrange(300)),
+             f"PC-{rnd.randrange(500):04d}") for _ in range(n)]
+    rows[5] = (None, None, None)
+    rows[6] = ('2023-01-01', '', 'pc-0001')
+    return rows
+
+
+def brute_force(rows, field, query):
+    col = main.SearchIndex.FIELDS.index(field)
+
+    def key(row):
+        value = '' if row[col] is None else str(row[col])
+        return value if field == 'date' else value.lower()
+    query = query if field == 'date' else query.lower()
+    # sorted by the searched field, rows with equal keys in their original order
+    return sorted((row for row in rows if key(row).startswith(query)), key=key)
+
+
+QUERIES = [
+    ('date', ''), ('date', '2023'), ('date', '2023-05'), ('date', '2023-05-1'), ('date', '2023-13'),
+    ('user', 'u'), ('user', 'US'), ('user', 'user1'), ('user', 'USER12'), ('user', 'är'), ('user', 'zzz'),
+    ('pc', 'pc-'), ('pc', 'PC-000'), ('pc', 'pc-0001'), ('pc', 'pc-00011'),
+]
+
+
+@pytest.mark.parametrize('field, query', QUERIES)
+def test_prefix_search_matches_a_scan(field, query):
+    rows = make_rows()
+    assert list(main.SearchIndex(rows).search(field, query)) == brute_force(rows, field, query)
+
+
+def test_narrowing_widening_and_switching_fields():
+    rows = make_rows()
+    index = main.SearchIndex(rows)
+    # typed a character at a time, then backspaced, then another field
+    for field, query in [('user', q) for q in ('u', 'us', 'use', 'user', 'user2', 'user', 'ad', 'a', '')] + \
+            [('pc', 'pc-01'), ('pc', 'pc-012'), ('date', '2024-02'), ('user', 'user2'), ('user', 'user2')]:
+        assert list(index.search(field, query)) == brute_force(rows, field, query), (field, query)
+
+
+def test_row_view():
+    rows = make_rows(50)
+    view = main.SearchIndex(rows).search('pc', 'PC-')
+    expected = brute_force(rows, 'pc', 'PC-')
+    assert len(view) == len(expected) > 10
+    assert view[0] == expected[0] and view[-1] == expected[-1]
+    assert view[2:7] == expected[2:7] and view[::-3] == expected[::-3]
+    with pytest.raises(IndexError):
+        view[len(view)]
+    assert list(main.SearchIndex([]).search('user', 'a')) == []
@@ -0,0 +1,67 @@
+import os
+import pickle
+import shutil
+
+import main
+
+
+class _Planted:
+    """Unpickling this would create `path`, as any callable a planted pickle names would run."""
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return open, (self.path, 'w')
+
+
+def copy_input(hw_file, tmp_path):
+    path = str(tmp_path / 'hw.txt')
+    shutil.copyfile(hw_file, path)
+    return path
+
+
+def test_snapshot_round_trip(hw_file, tmp_path):
+    path = copy_input(hw_file, tmp_path)
+    stats = main.LoadData(path, cache=True)
+    assert os.path.exists(main.SnapshotPath(path))
+    state = main._state()
+    main.ResetData()
+    cached = main.LoadData(path, cache=True)
+    assert cached == dict(stats, cached=True)
+    assert main._state() == state
+
+
+def test_snapshot_invalidated_by_change(hw_file, tmp_path):
+    path = copy_input(hw_file, tmp_path)
+    main.LoadData(path, cache=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    main.ResetData()
+    assert not main.LoadData(path, cache=True).get('cached')
+
+
+def test_planted_snapshot_runs_no_code(hw_file, tmp_path):
+    path = copy_input(hw_file, tmp_path)
+    marker = str(tmp_path / 'marker')
+    for payload in ([_Planted(marker)], {'version': main.SNAPSHOT_VERSION, 'fingerprint': _Planted(marker)}):
+        with open(main.SnapshotPath(path), 'wb') as f:
+            pickle.dump(payload, f)
+        main.ResetData()
+        stats = main.LoadData(path, cache=True)
+        assert not stats.get('cached')
+        assert not os.path.exists(marker)
+        assert len(main.LOGIN_TABLE) == stats['records']
+
+
+def test_snapshot_with_foreign_state_is_ignored(hw_file, tmp_path):
+    path = copy_input(hw_file, tmp_path)
+    main.LoadData(path, cache=True)
+    with open(main.SnapshotPath(path), 'rb') as f:
+        header = pickle.load(f)
+    with open(main.SnapshotPath(path), 'wb') as f:
+        pickle.dump(header, f)
+        pickle.dump({'lookups': {'USER_LOOKUP': 5}}, f)
+    main.ResetData()
+    stats = main.LoadData(path, cache=True)
+    assert not stats.get('cached')
+    assert len(main.LOGIN_TABLE) == stats['records']
@@ -0,0 +1,41 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def instrumentation():
+    stats = main.Instrumentation().enable()
+    yield stats
+    stats.disable()
+
+
+@pytest.fixture
+def sample_file(hw_file, tmp_path):
+    """Two good lines, a blank one and a malformed one."""
+    with open(hw_file, 'rb') as f:
+        good = [line for line in f if main._parse_line(line.decode('utf-8')) is not None][:2]
+    path = tmp_path / 'sample.txt'
+    with open(path, 'wb') as f:
+        f.writelines([good[0], b'\n', '\xa0not;a;record\n'.encode('utf-8'), good[1]])
+    return str(path)
+
+
+@pytest.mark.parametrize('engine', main.READER_ENGINES)
+def test_skipped_lines_counted_once(sample_file, instrumentation, engine):
+    main.LoadData(sample_file, engine=engine)
+    counters = instrumentation.counters
+    assert counters['blank_lines'] == 1
+    assert counters['malformed_lines'] == 1
+    assert counters['skipped'] == 2
+    # lines parses line by line, columnar a block at a time
+    assert instrumentation.timers['parse_line'][0] == (4 if engine == 'lines' else 1)
+
+
+def test_db_cache_hit_is_not_a_snapshot_hit(hw_file, tmp_path, instrumentation):
+    db_path = str(tmp_path / 'hw.db')
+    main.LoadDatabase(hw_file, db_path)
+    assert 'db_cache_hits' not in instrumentation.counters
+    main.LoadDatabase(hw_file, db_path)
+    assert instrumentation.counters['db_cache_hits'] == 1
+    assert 'snapshot_hits' not in instrumentation.counters
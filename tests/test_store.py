@@ -0,0 +1,75 @@
+import datetime
+from types import SimpleNamespace
+
+import main
+
+D = datetime.date
+
+
+def login(day, time=None, user_id=1, pc_name_id=1, user='u', pc_name='pc'):
+    return SimpleNamespace(login_date=day, login_time=time, user_id=user_id, pc_name_id=pc_name_id,
+                           user=user, pc_name=pc_name)
+
+
+def test_newer_date_replaces_and_older_is_dropped():
+    store = main.LatestStore()
+    first, newer, older = login(D(2023, 5, 1)), login(D(2023, 5, 2)), login(D(2023, 4, 30))
+    assert store.put(first) is None
+    assert store.put(newer) is first
+    assert store.put(older) is older
+    assert list(store) == [newer]
+
+
+def test_tie_on_date_keeps_the_existing_entry_whatever_the_time():
+    # Filter.register compares login dates only, as max() did: the first of equals wins
+    store = main.LatestStore()
+    first = login(D(2023, 5, 1), datetime.time(8, 0))
+    store.put(first)
+    for later in (login(D(2023, 5, 1), datetime.time(8, 0)), login(D(2023, 5, 1), datetime.time(23, 0)),
+                  login(D(2023, 5, 1), 'garbage'), login(D(2023, 5, 1), None)):
+        assert store.put(later) is later
+    assert list(store) == [first] and store[0] is first
+
+
+def test_incomparable_dates_keep_the_new_entry():
+    store = main.LatestStore()
+    for day in (D(2023, 5, 1), '2023.13.01', None, D(2020, 1, 1), 'x'):
+        entry = login(day)
+        store.put(entry)
+        assert list(store) == [entry]
+    # once both dates compare again, the later one wins
+    store.put(login(D(2021, 1, 1)))
+    store.put(login(D(2020, 1, 1)))
+    assert store[0].login_date == D(2021, 1, 1)
+
+
+def test_keys_and_order():
+    store = main.LatestStore()
+    a = login(D(2023, 5, 1), user_id=1, pc_name_id=1)
+    b = login(D(2023, 5, 1), user_id=1, pc_name_id=2)
+    # without ids the key is the case-insensitive user and PC name
+    c = login(D(2023, 5, 1), user_id=None, user=' Ann ', pc_name='PC-1')
+    d = login(D(2023, 5, 2), user_id=None, user='ann', pc_name='pc-1 ')
+    for entry in (a, b, c):
+        store.put(entry)
+    assert store[2] is c
+    assert store.put(d) is c
+    assert store.put(login(D(2023, 5, 3), user_id=1, pc_name_id=1)) is a
+    # a replaced key moves to the end, as the old list-based register's remove + append
+    assert [(e.user_id, e.pc_name_id) for e in store] == [(1, 2), (None, 1), (1, 1)]
+    assert len(store) == 3 and store[-1].login_date == D(2023, 5, 3)
+    assert b in store and a not in store
+    store.clear()
+    assert len(store) == 0 and list(store) == []
+
+
+MACHINE = ('Laptop', 'PC-0130', 'User30', 'Lenovo', 'Lenovo M0', '16GB', 'Intel Core i5', 'i5-1030',
+           'Windows 10 Pro', '2022.11.19', 'C:', '241.6/476.9 GB', '')
+
+
+def test_register_keeps_first_login_of_the_latest_day():
+    for day, time in (('2023.05.02', '08:00:00'), ('2023.05.02', '17:30:00'), ('2023.05.01', '23:59:59'),
+                      ('2023.05.02', '8:00')):
+        main.Filter(day, time, *MACHINE)
+    (latest,) = main.Filter.objectsArray
+    assert (latest.login_date, latest.login_time) == (D(2023, 5, 2), datetime.time(8, 0))
@@ -0,0 +1,194 @@
+import os
+
+import pytest
+
+import main
+from helpers import age, full_load, same_length_edit, write
+
+
+@pytest.fixture
+def lines(hw_file):
+    with open(hw_file, 'rb') as f:
+        return f.readlines()
+
+
+def follow(path):
+    stats = main.LoadData(path, complete_lines=True)
+    tail = main.TailIngest(path)
+    tail.attach(stats['bytes'])
+    return tail
+
+
+def test_append(tmp_path, lines):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:2000])
+    tail = follow(path)
+    write(path, lines[2000:], 'ab')
+    result = tail.poll()
+    assert not result['reloaded']
+    assert result['lines'] == len(lines) - 2000
+    assert result['offset'] == os.path.getsize(path)
+    state = main._state()
+    assert state == full_load(path)
+
+
+def test_partial_line_waits(tmp_path, lines):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:100])
+    tail = follow(path)
+    write(path, [lines[100][:20]], 'ab')
+    assert tail.poll()['lines'] == 0
+    write(path, [lines[100][20:]], 'ab')
+    result = tail.poll()
+    assert (result['lines'], result['reloaded']) == (1, False)
+    assert main._state() == full_load(path)
+
+
+@pytest.mark.parametrize('restore_mtime', [False, True])
+def test_same_length_rewrite_reloads(tmp_path, lines, restore_mtime):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:2000])
+    age(path)
+    tail = follow(path)
+    st = os.stat(path)
+    edited = list(lines[:2000])
+    edited[500] = same_length_edit(edited[500])
+    with open(path, 'r+b') as f:  # in place: same inode, same size, same last line
+        f.writelines(edited)
+    if restore_mtime:
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.path.getsize(path) == st.st_size
+    result = tail.poll()
+    assert result['reloaded']
+    assert main._state() == full_load(path)
+
+
+def test_truncate_and_rotate_reload(tmp_path, lines):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:2000])
+    tail = follow(path)
+    write(path, lines[:1000])
+    assert tail.poll()['reloaded']
+    assert main._state() == full_load(path)
+
+    main.ResetData()
+    tail = follow(path)
+    write(str(tmp_path / 'new.txt'), lines[1000:2500])
+    os.replace(str(tmp_path / 'new.txt'), path)
+    assert tail.poll()['reloaded']
+    assert main._state() == full_load(path)
+
+
+def test_idle_poll_reads_nothing(tmp_path, lines, monkeypatch):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:500])
+    age(path)
+    tail = follow(path)
+
+    def fail():
+        raise AssertionError('prefix read back although the file is untouched')
+    monkeypatch.setattr(tail, '_sample_digest', fail)
+    result = tail.poll()
+    assert (result['lines'], result['reloaded']) == (0, False)
+
+
+def small_samples(tail):
+    tail.SAMPLE_BYTES, tail.SAMPLES = 512, 2
+    tail.attach(tail.offset)
+    return tail
+
+
+def test_append_reads_only_samples(tmp_path, lines, monkeypatch):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:2000])
+    tail = small_samples(follow(path))
+    appended = b''.join(lines[2000:2010])
+    write(path, lines[2000:2010], 'ab')
+    read = []
+    real_open = open
+
+    class Counting:
+        def __init__(self, f):
+            self.f = f
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+        def __iter__(self):
+            for line in self.f:
+                read.append(len(line))
+                yield line
+
+        def read(self, n=-1):
+            data = self.f.read(n)
+            read.append(len(data))
+            return data
+
+    monkeypatch.setattr(main, 'open', lambda *a, **k: Counting(real_open(*a, **k)), raising=False)
+    monkeypatch.setattr(tail.blocks, 'extend', lambda *args: None)
+    result = tail.poll()
+    assert (result['lines'], result['reloaded']) == (10, False)
+    # the new lines, plus two sample digests (before and after them) of 4 windows each
+    assert sum(read) <= len(appended) + 2 * 4 * 512
+
+
+def test_same_length_edit_of_last_line_reloads(tmp_path, lines):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:2000])
+    age(path)
+    tail = small_samples(follow(path))
+    edited = list(lines[:2000])
+    edited[-1] = same_length_edit(edited[-1])
+    write(path, edited)
+    assert tail.poll()['reloaded']
+    assert main._state() == full_load(path)
+
+
+def test_reload_catches_edit_between_samples(tmp_path, lines):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:2000])
+    age(path)
+    tail = small_samples(follow(path))
+    edited = list(lines[:2000])
+    edited[1000] = same_length_edit(edited[1000])
+    write(path, edited)
+    age(path, 60)
+    tail.poll()
+    tail.reload()
+    assert main._state() == full_load(path)
+
+
+def run(job):
+    job.start().join(10)
+    messages = []
+    while not job.queue.empty():
+        messages.append(job.queue.get_nowait())
+    return messages
+
+
+def test_background_follow(tmp_path, lines):
+    path = str(tmp_path / 'hw.txt')
+    write(path, lines[:1000])
+    age(path)
+    tail = follow(path)
+    assert [tag for tag, *_ in run(main.BackgroundFollow(tail))] == ['done']
+
+    write(path, lines[1000:1200], 'ab')
+    messages = run(main.BackgroundFollow(tail))
+    assert [tag for tag, *_ in messages] == ['rows', 'done']
+    assert messages[0][1] == main.DisplayRows()
+    assert messages[1][1]['lines'] == 200
+
+    messages = run(main.BackgroundFollow(tail, reload=True))
+    assert [tag for tag, *_ in messages] == ['rows', 'done']
+    assert main._state() == full_load(path)
+
+    os.remove(path)
+    (tag, error), = run(main.BackgroundFollow(tail))
+    assert tag == 'error' and isinstance(error, FileNotFoundError)